@@ -2,10 +2,14 @@ import streamlit as st
 import pandas as pd
 import io
 import json
+import os
+import time
 
-from first_main import process_excel_to_csv_and_dict
-from second_assign import solve_exam_schedule
-from third_convert_to_csv import convert_to_csv
+from app_pipeline import run_pipeline
+from exam_core.background_jobs import CANCELLED, DONE, FAILED, JobRunner
+from first_main import build_csv_zip
+from pipeline_cache import PipelineCache, content_hash
+from third_convert_to_csv import iter_csv_chunks, write_parquet
 
 # --- Streamlit Page Configuration ---
 st.set_page_config(
@@ -15,6 +19,68 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_resource
+def get_pipeline_cache():
+    """
+    One cache shared by all sessions, bounded to PIPELINE_CACHE_MB megabytes (default 256).
+
+    Set PIPELINE_CACHE_DIR to also keep it on disk (only writable by the app), and
+    optionally PIPELINE_CACHE_SECRET as the key for the cache files' digests.
+    """
+    secret = os.environ.get("PIPELINE_CACHE_SECRET")
+    return PipelineCache(
+        max_bytes=int(os.environ.get("PIPELINE_CACHE_MB", "256")) * 1024 * 1024,
+        disk_dir=os.environ.get("PIPELINE_CACHE_DIR") or None,
+        secret=secret.encode("utf-8") if secret else None,
+    )
+
+
+pipeline_cache = get_pipeline_cache()
+
+
+# Set SCENARIO_STORE_DIR to keep parsed plans as snapshots, shared with `batch_run.py --store`.
+# The pipeline jobs open the store themselves.
+SCENARIO_STORE_DIR = os.environ.get("SCENARIO_STORE_DIR") or None
+SCENARIO_STORE_BYTES = int(os.environ.get("SCENARIO_STORE_MB", "256")) * 1024 * 1024
+
+# Seconds between page refreshes while a job is running
+JOB_POLL_SECONDS = 1.0
+
+
+@st.cache_resource
+def get_job_runner():
+    """One pool of pipeline jobs shared by all sessions; set PIPELINE_JOB_WORKERS to size it."""
+    return JobRunner(max_workers=int(os.environ.get("PIPELINE_JOB_WORKERS", "4")))
+
+
+def store_results(excel_key, run_key):
+    """
+    Returns a job callback that caches a finished run's results.
+
+    The jobs run in other processes, so the cache is filled here, in the page's
+    process: the parsed plan and its examiner intervals for later runs on the
+    same workbook, and the whole result for reruns of the same inputs.
+    """
+    def store(job):
+        if job.status != DONE:
+            return
+        pipeline_cache.put(f"parsed-{excel_key}", job.result["first_step"])
+        if job.result["people"] is not None:
+            pipeline_cache.put(f"people-{excel_key}", job.result["people"])
+        pipeline_cache.put(f"result-{run_key}", job.result)
+
+    return store
+
+
+def show_partial_result(job):
+    """Shows the exams a (running or cancelled) job has placed so far."""
+    placed = job.placed_exams()
+    if not placed:
+        return
+    st.write(f"Exams placed so far: {len(placed)}")
+    st.dataframe(pd.DataFrame(placed[:200], columns=["Date", "Room", "Slot", "Vorname", "Nachname", "Fach"]))
+
+
 st.title("📊 Student Allocation Algorithm Emmi Bonhoeffer Schule")
 st.write("Upload your Excel file and an optional JSON file, process them, and download the results as a CSV.")
 
@@ -23,6 +89,9 @@ st.header("Upload Files")
 
 uploaded_excel_file = st.file_uploader("Choose an Excel file", type=["xlsx", "xls"])
 uploaded_json_file = st.file_uploader("Choose a JSON file (Optional)", type=["json"])
+uploaded_unavailability_file = st.file_uploader(
+    "Choose an examiner unavailability JSON file (Optional)", type=["json"]
+)
 
 # Variables to store loaded data
 df = None
@@ -31,7 +100,11 @@ json_data = None
 if uploaded_excel_file is not None:
     try:
         # Read the uploaded Excel file into a Pandas DataFrame
-        df = pd.read_excel(uploaded_excel_file)
+        excel_bytes = uploaded_excel_file.getvalue()
+        excel_key = content_hash(excel_bytes)
+        df = pipeline_cache.get_or_compute(
+            f"preview-{excel_key}", lambda: pd.read_excel(io.BytesIO(excel_bytes))
+        )
         st.success("Excel file uploaded successfully!")
         st.write("First 5 rows of the uploaded Excel data:")
         #st.dataframe(df.head())
@@ -47,7 +120,7 @@ if uploaded_excel_file is not None:
 if df is not None and uploaded_json_file is not None:
     try:
         # Read the uploaded JSON file
-        json_bytes = uploaded_json_file.read()
+        json_bytes = uploaded_json_file.getvalue()
         json_string = json_bytes.decode('utf-8') # Decode bytes to string
         json_data = json.loads(json_string)
         st.success("JSON file uploaded successfully!")
@@ -68,13 +141,108 @@ if df is not None and uploaded_json_file is not None:
     # Assuming your processing logic takes the DataFrame 'df' and 'json_data' as inputs
     # and returns a processed DataFrame 'processed_df'
 
-    processed_df = df.copy() # Start with a copy of the original DataFrame
+    # Results are cached on the uploads' contents, so reruns triggered by widget
+    # interactions (preview, download) do not parse and solve again.
+    check_people = st.sidebar.checkbox("Avoid double-booking examiners and supervisors", value=False)
+    unavailability_bytes = uploaded_unavailability_file.getvalue() if uploaded_unavailability_file else b""
+    unavailability = None
+    if unavailability_bytes:
+        try:
+            unavailability = json.loads(unavailability_bytes.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            st.error(f"Error decoding unavailability file: {e}")
+            st.info("Please ensure the unavailability file is valid UTF-8 JSON.")
+            # Solving without it would silently book people when they cannot work
+            st.stop()
+    # The parallel solver has no examiner check, so it is only offered without one
+    parallel = st.sidebar.checkbox("Solve independent subjects in parallel", value=False,
+                                   disabled=check_people or bool(unavailability_bytes))
+    parallel = parallel and not (check_people or unavailability_bytes)
+    run_key = content_hash(excel_bytes, json_bytes, unavailability_bytes, str(check_people).encode(),
+                           str(parallel).encode())
+    profile_run = st.sidebar.checkbox("Profile pipeline stages", value=False)
+
+    # The pipeline runs as a background job in a worker process, so this page stays
+    # responsive and other sessions are not held up. A new input (or profiling) starts
+    # a new job and cancels the session's previous one. Runs of inputs that were
+    # processed before are served from the cache without a job; profiled runs always
+    # recompute, so every stage shows up in the profile.
+    job_key = (run_key, profile_run)
+    job = st.session_state.get("job")
+    if job is not None and st.session_state.get("job_key") != job_key:
+        if not job.done():
+            job.cancel()
+        job = None
+        del st.session_state["job"]
+
+    results = None if profile_run else pipeline_cache.get(f"result-{run_key}")
+    if results is None and job is None:
+        job = get_job_runner().submit(
+            run_pipeline, excel_bytes, excel_key, json_data, check_people, unavailability, profile_run,
+            plan=None if profile_run else pipeline_cache.get(f"parsed-{excel_key}"),
+            people=None if profile_run else pipeline_cache.get(f"people-{excel_key}"),
+            store_dir=SCENARIO_STORE_DIR, store_bytes=SCENARIO_STORE_BYTES, parallel=parallel,
+        )
+        if not profile_run:
+            job.add_done_callback(store_results(excel_key, run_key))
+        st.session_state["job"] = job
+        st.session_state["job_key"] = job_key
 
-    first_step = process_excel_to_csv_and_dict(uploaded_excel_file)
+    if results is None:
+        if not job.done():
+            progress = job.progress()
+            sheets_done, sheets_total = progress.get("parse", (0, None))
+            st.progress(
+                1.0 if "solve" in progress else (sheets_done / sheets_total if sheets_total else 0.0),
+                text=f"Sheets parsed: {sheets_done}" + (f" of {sheets_total}" if sheets_total else ""),
+            )
+            subjects_done, subjects_total = progress.get("solve", (0, None))
+            st.progress(
+                subjects_done / subjects_total if subjects_total else 0.0,
+                text=f"Subjects placed: {subjects_done}" + (f" of {subjects_total}" if subjects_total else ""),
+            )
+            st.caption(f"Running for {job.elapsed():.0f} s")
+            if st.button("Cancel"):
+                job.cancel()
+            show_partial_result(job)
+            time.sleep(JOB_POLL_SECONDS)
+            st.rerun()
 
-    second_step = solve_exam_schedule(json_data,first_step)
+        if job.status == CANCELLED:
+            st.warning("Processing was cancelled. The exams placed until then are shown below.")
+            show_partial_result(job)
+            if st.button("Start again"):
+                del st.session_state["job"]
+                st.rerun()
+            st.stop()
 
-    processed_df = convert_to_csv(second_step)
+        if job.status == FAILED:
+            st.error("Processing failed.")
+            st.code(job.error)
+            st.stop()
+        results = job.result
+
+    first_step = results["first_step"]
+    second_step = results["second_step"]
+    processed_df = results["processed_df"]
+    verification = results["verification"]
+    run_stats = results["run_stats"]
+
+    if verification["ok"]:
+        st.success(f"All checks passed: {verification['scheduled_exams']} of {verification['total_exams']} exams scheduled.")
+    else:
+        st.warning(
+            f"{verification['scheduled_exams']} of {verification['total_exams']} exams scheduled; "
+            "the schedule breaks some rules."
+        )
+    with st.expander("Verification report"):
+        st.json(verification["violations"])
+
+    # Statistics of the run that computed these results (cached reruns record nothing new)
+    with st.expander("Run statistics"):
+        st.json({key: value for key, value in run_stats.items() if key != "profiles"})
+        for stage, report in run_stats.get("profiles", {}).items():
+            st.text(f"Profile of stage '{stage}':\n{report}")
 
 
     st.success("Data processing completed!")
@@ -84,10 +252,10 @@ if df is not None and uploaded_json_file is not None:
     # --- Download Section ---
     st.subheader("Download Processed Data")
 
-    # Convert the processed DataFrame to CSV
-    csv_buffer = io.StringIO()
-    processed_df.to_csv(csv_buffer, index=False)
-    csv_data = csv_buffer.getvalue()
+    # Write the schedule as CSV straight from the nested dicts, chunk by chunk
+    csv_data = pipeline_cache.get_or_compute(
+        f"csv-{run_key}", lambda: "".join(iter_csv_chunks(second_step))
+    )
 
     st.download_button(
         label="Download Processed CSV",
@@ -95,6 +263,35 @@ if df is not None and uploaded_json_file is not None:
         file_name="processed_data.csv",
         mime="text/csv"
     )
+
+    # Parquet is much smaller than CSV for archiving; it needs the optional pyarrow package
+    def render_parquet():
+        parquet_buffer = io.BytesIO()
+        write_parquet(processed_df, parquet_buffer)
+        return parquet_buffer.getvalue()
+
+    try:
+        parquet_data = pipeline_cache.get_or_compute(f"parquet-{run_key}", render_parquet)
+    except ImportError:
+        parquet_data = None
+
+    if parquet_data is not None:
+        st.download_button(
+            label="Download Processed Parquet",
+            data=parquet_data,
+            file_name="processed_data.parquet",
+            mime="application/octet-stream"
+        )
+
+    # Per-room CSV files of the uploaded plan, built in memory instead of on the server's disk
+    room_zip = pipeline_cache.get_or_compute(f"room-zip-{excel_key}", lambda: build_csv_zip(first_step))
+
+    st.download_button(
+        label="Download Room CSVs (ZIP)",
+        data=room_zip,
+        file_name="room_csvs.zip",
+        mime="application/zip"
+    )
 else:
     st.info("Please upload an Excel file to get started.")
 
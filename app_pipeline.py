@@ -0,0 +1,84 @@
+"""
+The app's pipeline run: parse, solve, flatten and verify one upload.
+
+It runs in a `exam_core.background_jobs.JobRunner` worker process, so it lives outside
+app.py (which starts the Streamlit page when imported) and exchanges only
+picklable values with the page.
+"""
+import copy
+import io
+
+from exam_core.instrumentation import Instrumentation
+from exam_core.solver import solve_exam_schedule, solve_exam_schedule_parallel
+from first_main import process_excel_to_csv_and_dict
+from scenario_store import ScenarioStore
+from third_convert_to_csv import convert_to_csv
+from verify_schedule import PeopleIntervals, verify_schedule
+
+
+def run_pipeline(job, excel_bytes, excel_key, json_data, check_people, unavailability, profile_run,
+                 plan=None, people=None, store_dir=None, store_bytes=256 * 1024 * 1024, parallel=False):
+    """
+    Parses, solves, flattens and verifies one upload; runs as a background job.
+
+    Args:
+        job (JobReporter): Progress reporter of the job.
+        excel_bytes (bytes): The uploaded workbook.
+        excel_key (str): Content hash of the workbook.
+        json_data (dict): The uploaded students.
+        check_people (bool): Keep examiners and supervisors out of overlapping exams.
+        unavailability (dict, optional): Times people cannot work.
+        profile_run (bool): Profile every stage.
+        plan (dict, optional): The workbook's parsed plan from an earlier run, to skip parsing.
+        people (PeopleIntervals, optional): The plan's examiner intervals from an earlier run.
+        store_dir (str, optional): Scenario store that keeps parsed plans across restarts.
+        store_bytes (int): Disk budget of the scenario store.
+        parallel (bool): Solve independent groups of subjects in a process pool. Not
+            combined with the examiner check; the page then shows no partial schedule.
+
+    Returns:
+        dict: The results of every stage ("first_step", "second_step", "processed_df",
+        "verification"), the plan's "people" intervals (None without the examiner check)
+        and the "run_stats".
+    """
+    stats = Instrumentation(profile=profile_run)
+
+    def parse_excel():
+        return process_excel_to_csv_and_dict(io.BytesIO(excel_bytes), export_csv=False, stats=stats, progress=job)
+
+    first_step = plan
+    if first_step is None:
+        if store_dir:
+            store = ScenarioStore(store_dir, max_bytes=store_bytes)
+            first_step = store.get_or_compute(excel_key, parse_excel, kind="plan")
+        else:
+            first_step = parse_excel()
+
+    # The solver fills the schedule in place, so it works on a copy of the plan,
+    # which the page shows while the solver is still running.
+    second_step = copy.deepcopy(first_step)
+    job.watch(second_step)
+    if parallel and not (check_people or unavailability):
+        solve_exam_schedule_parallel(json_data, second_step, stats=stats)
+    else:
+        solve_exam_schedule(json_data, second_step, stats=stats, check_people=check_people,
+                            unavailability=unavailability, progress=job)
+
+    processed_df = convert_to_csv(second_step, stats=stats, columnar=True)
+
+    with stats.stage("verify"):
+        if check_people or unavailability:
+            # The plan's examiner intervals are shared by every run on the same workbook
+            people = people if people is not None else PeopleIntervals(first_step)
+            verification = verify_schedule(json_data, second_step, people=people)
+        else:
+            verification = verify_schedule(json_data, second_step, check_people=False)
+
+    return {
+        "first_step": first_step,
+        "second_step": second_step,
+        "processed_df": processed_df,
+        "verification": verification,
+        "people": people,
+        "run_stats": stats.to_dict(),
+    }
@@ -0,0 +1,278 @@
+"""
+Run the full pipeline for many (workbook, students JSON) scenarios in parallel.
+
+Scenarios come from a directory or a manifest:
+
+- Directory: every `<name>.xlsx` is paired with `<name>.json` (or `<name>_students.json`);
+  workbooks without their own JSON use `student.json` from the same directory.
+- Manifest: a JSON list of {"name": ..., "workbook": ..., "students": ...} objects,
+  with paths relative to the manifest.
+
+Each scenario gets its own output folder with the solved schedule, the result
+CSV, the per-room CSVs, its verification report and its run statistics. A summary of placement rates and
+stage timings is printed and written to summary.csv.
+
+With `--store DIR`, parsed plans and solved schedules are kept in a scenario
+store (see scenario_store.py): a workbook that was parsed before is loaded from
+its snapshot instead of the Excel file, and deterministic solvers reuse the
+schedule solved for the same workbook, students and solver.
+
+Example:
+    python batch_run.py scenarios/ --output batch_output --workers 4
+"""
+import argparse
+import contextlib
+import copy
+import csv
+import io
+import json
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from exact_solver import solve_exam_schedule_exact
+from exam_core.instrumentation import Instrumentation
+from exam_core.solver import score_schedule, solve_exam_schedule, solve_exam_schedule_parallel
+from first_main import export_csv_files, process_excel_to_csv_and_dict
+from multi_start import solve_exam_schedule_multistart
+from packing_solver import STRATEGIES, solve_exam_schedule_packed
+from pipeline_cache import content_hash
+from scenario_store import ScenarioStore
+from third_convert_to_csv import write_csv_chunks
+from verify_schedule import verify_schedule
+
+SOLVERS = ('greedy', 'parallel', 'exact', 'multistart') + STRATEGIES
+# Solvers whose result depends only on their inputs, so a stored schedule can be reused
+DETERMINISTIC_SOLVERS = ('greedy', 'parallel') + STRATEGIES
+SUMMARY_FIELDS = ['scenario', 'status', 'total_exams', 'scheduled_exams', 'placement_rate', 'days_used',
+                  'spread', 'violations', 'parse_seconds', 'solve_seconds', 'export_seconds', 'error']
+
+
+def find_scenarios(source):
+    """
+    Lists the scenarios in a directory or manifest file.
+
+    Args:
+        source (str): Directory of workbooks, or path to a JSON manifest.
+
+    Returns:
+        list: Scenario dicts with "name", "workbook" and "students" keys.
+
+    Raises:
+        ValueError: If two scenarios have the same name (see `check_unique_names`).
+    """
+    if os.path.isfile(source):
+        base_dir = os.path.dirname(os.path.abspath(source))
+        with open(source, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        scenarios = [
+            {
+                'name': entry.get('name') or os.path.splitext(os.path.basename(entry['workbook']))[0],
+                'workbook': os.path.join(base_dir, entry['workbook']),
+                'students': os.path.join(base_dir, entry['students']),
+            }
+            for entry in entries
+        ]
+        check_unique_names(scenarios)
+        return scenarios
+
+    scenarios = []
+    for file_name in sorted(os.listdir(source)):
+        name, extension = os.path.splitext(file_name)
+        if extension.lower() not in ('.xlsx', '.xls') or file_name.startswith('~$'):
+            continue
+        candidates = [f"{name}.json", f"{name}_students.json", 'student.json']
+        students = next((os.path.join(source, c) for c in candidates if os.path.exists(os.path.join(source, c))), None)
+        if students is None:
+            print(f"!!! Skipping {file_name}: no {name}.json, {name}_students.json or student.json next to it")
+            continue
+        scenarios.append({'name': name, 'workbook': os.path.join(source, file_name), 'students': students})
+    check_unique_names(scenarios)
+    return scenarios
+
+
+def check_unique_names(scenarios):
+    """
+    Makes sure no two scenarios would write to the same output folder.
+
+    Raises:
+        ValueError: If a scenario name is used more than once.
+    """
+    seen = set()
+    duplicates = []
+    for scenario in scenarios:
+        if scenario['name'] in seen and scenario['name'] not in duplicates:
+            duplicates.append(scenario['name'])
+        seen.add(scenario['name'])
+    if duplicates:
+        raise ValueError(f"Scenario names must be unique, found duplicates: {', '.join(duplicates)}")
+
+
+def solve_plan(students, plan, solver, time_budget, stats):
+    """Solves a copy of the parsed plan with the chosen solver."""
+    if solver == 'exact':
+        with stats.stage('solve'):
+            return solve_exam_schedule_exact(students, copy.deepcopy(plan), time_budget=time_budget)
+    if solver == 'multistart':
+        with stats.stage('solve'):
+            return solve_exam_schedule_multistart(students, copy.deepcopy(plan), time_limit=time_budget, max_workers=1)
+    if solver == 'parallel':
+        # One process per scenario already, so the components are solved in this one
+        return solve_exam_schedule_parallel(students, copy.deepcopy(plan), max_workers=1, stats=stats)
+    if solver in STRATEGIES:
+        return solve_exam_schedule_packed(students, copy.deepcopy(plan), strategy=solver, stats=stats)
+    return solve_exam_schedule(students, copy.deepcopy(plan), stats=stats)
+
+
+def run_scenario(scenario, output_dir, solver='greedy', time_budget=10.0, store_dir=None,
+                 store_bytes=256 * 1024 * 1024):
+    """
+    Runs parse -> solve -> export for one scenario and writes its outputs.
+
+    Runs in a worker process; errors are reported in the returned row instead of raised.
+    With `store_dir`, the plan and the solved schedule are loaded from (or saved to)
+    a ScenarioStore bounded to `store_bytes`.
+
+    Returns:
+        dict: One summary row (see SUMMARY_FIELDS).
+    """
+    row = {'scenario': scenario['name'], 'status': 'ok'}
+    scenario_dir = os.path.join(output_dir, scenario['name'])
+    stats = Instrumentation()
+    # Created up front so error.txt and log.txt can always be written.
+    os.makedirs(scenario_dir, exist_ok=True)
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            with open(scenario['students'], 'rb') as f:
+                students_bytes = f.read()
+            students = json.loads(students_bytes)
+
+            store = ScenarioStore(store_dir, max_bytes=store_bytes) if store_dir else None
+            schedule = None
+            if store is not None:
+                with open(scenario['workbook'], 'rb') as f:
+                    workbook_bytes = f.read()
+                plan_key = content_hash(workbook_bytes)
+                schedule_key = content_hash(workbook_bytes, students_bytes, solver.encode('utf-8'))
+                with stats.stage('snapshot_read'):
+                    plan = store.get(plan_key)
+                    if solver in DETERMINISTIC_SOLVERS:
+                        schedule = store.get(schedule_key)
+                stats.count('snapshot_hits', (plan is not None) + (schedule is not None))
+                if plan is None:
+                    plan = process_excel_to_csv_and_dict(io.BytesIO(workbook_bytes), export_csv=False, stats=stats)
+                    with stats.stage('snapshot_write'):
+                        store.put(plan_key, plan, kind='plan')
+            else:
+                plan = process_excel_to_csv_and_dict(scenario['workbook'], export_csv=False, stats=stats)
+
+            if schedule is None:
+                schedule = solve_plan(students, plan, solver, time_budget, stats)
+                if store is not None and solver in DETERMINISTIC_SOLVERS:
+                    # Solved schedules differ from their plan in the booked slots only
+                    with stats.stage('snapshot_write'):
+                        store.put(schedule_key, schedule, kind='schedule', base=plan_key)
+
+            with stats.stage('export'):
+                with open(os.path.join(scenario_dir, 'final_schedule.json'), 'w', encoding='utf-8') as f:
+                    json.dump(schedule, f, ensure_ascii=False, indent=4)
+                write_csv_chunks(schedule, os.path.join(scenario_dir, 'schedule.csv'))
+                export_csv_files(schedule, os.path.join(scenario_dir, 'csv_output'))
+
+            with stats.stage('verify'):
+                report = verify_schedule(students, schedule)
+            with open(os.path.join(scenario_dir, 'verification.json'), 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=4)
+
+        stats.to_json(os.path.join(scenario_dir, 'run_stats.json'))
+
+        unplaced, days_used, spread = score_schedule(students, schedule)
+        total_exams = sum(len(group) for groups in students.values() for group in groups)
+        row.update({
+            'total_exams': total_exams,
+            'scheduled_exams': total_exams - unplaced,
+            'placement_rate': round((total_exams - unplaced) / total_exams, 4) if total_exams else 1.0,
+            'days_used': days_used,
+            'spread': spread,
+            'violations': sum(len(records) for records in report['violations'].values()),
+        })
+    except Exception as e:
+        row.update({'status': 'failed', 'error': f"{type(e).__name__}: {e}"})
+        with open(os.path.join(scenario_dir, 'error.txt'), 'w', encoding='utf-8') as f:
+            f.write(traceback.format_exc())
+    finally:
+        with open(os.path.join(scenario_dir, 'log.txt'), 'w', encoding='utf-8') as f:
+            f.write(log.getvalue())
+
+    stages = stats.to_dict()['stages']
+    row['parse_seconds'] = round(
+        sum(stages.get(name, {}).get('seconds', 0) for name in ('excel_read', 'sheet_parse', 'snapshot_read')), 4
+    )
+    row['solve_seconds'] = round(stages.get('solve', {}).get('seconds', 0), 4)
+    row['export_seconds'] = round(stages.get('export', {}).get('seconds', 0), 4)
+    return row
+
+
+def run_batch(scenarios, output_dir, workers=None, solver='greedy', time_budget=10.0, store_dir=None,
+              store_bytes=256 * 1024 * 1024):
+    """
+    Runs every scenario in a process pool and writes summary.csv.
+
+    The workers share the scenario store in `store_dir`, if given.
+
+    Returns:
+        list: Summary rows in scenario order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(run_scenario, scenario, output_dir, solver, time_budget, store_dir, store_bytes)
+            for scenario in scenarios
+        ]
+        rows = [future.result() for future in futures]
+
+    with open(os.path.join(output_dir, 'summary.csv'), 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+def print_summary(rows):
+    """Prints the summary rows as a table."""
+    columns = ['scenario', 'status', 'scheduled_exams', 'total_exams', 'placement_rate', 'violations',
+               'parse_seconds', 'solve_seconds', 'export_seconds']
+    table = [columns] + [[str(row.get(column, '')) for column in columns] for row in rows]
+    widths = [max(len(line[i]) for line in table) for i in range(len(columns))]
+    for line in table:
+        print("  ".join(value.ljust(width) for value, width in zip(line, widths)))
+    for row in rows:
+        if row['status'] != 'ok':
+            print(f"!!! {row['scenario']} failed: {row['error']}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the exam pipeline for many scenarios in parallel.")
+    parser.add_argument('source', help="Directory of workbooks, or a JSON manifest of scenarios")
+    parser.add_argument('--output', default='batch_output', help="Output directory (default batch_output)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--solver', choices=SOLVERS, default='greedy', help="Solver to use (default greedy)")
+    parser.add_argument('--time-budget', type=float, default=10.0,
+                        help="Seconds per scenario for the exact and multistart solvers")
+    parser.add_argument('--store', help="Keep parsed plans and solved schedules in this scenario store directory")
+    parser.add_argument('--store-size', type=int, default=256,
+                        help="Disk budget of the scenario store in MB (default 256)")
+    args = parser.parse_args()
+
+    try:
+        scenarios = find_scenarios(args.source)
+    except ValueError as e:
+        parser.error(str(e))
+    if not scenarios:
+        print("No scenarios found.")
+        exit()
+    rows = run_batch(scenarios, args.output, workers=args.workers, solver=args.solver, time_budget=args.time_budget,
+                     store_dir=args.store, store_bytes=args.store_size * 1024 * 1024)
+    print_summary(rows)
+    print(f"\nSummary has been saved to '{os.path.join(args.output, 'summary.csv')}'")
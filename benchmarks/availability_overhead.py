@@ -0,0 +1,99 @@
+"""
+Measures what the examiner availability check (`--check-people`) adds to a solve.
+
+For every teacher pool size the same synthetic plan and student list are solved
+with and without the check; the median of `--repeat` solves is reported, with
+the ratio between them. Small pools make many slot groups clash, large pools
+make many distinct people to index, so both ends are worth scaling.
+
+Example:
+    python benchmarks/availability_overhead.py --teachers 10,60,2000 --days 5 --students 120
+"""
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_inputs import make_students, write_workbook  # noqa: E402
+from first_main import process_excel_to_csv_and_dict  # noqa: E402
+from exam_core.solver import score_schedule, solve_exam_schedule  # noqa: E402
+
+
+def time_solve(students, plan, repeat, check_people):
+    """
+    Solves copies of `plan` `repeat` times.
+
+    Returns:
+        tuple: (median seconds, last solved schedule)
+    """
+    timings = []
+    solved = None
+    for _ in range(repeat):
+        schedule = copy.deepcopy(plan)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            solved = solve_exam_schedule(students, schedule, check_people=check_people)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), solved
+
+
+def measure_overhead(teachers, days=3, rooms=3, slots=12, subjects=10, students=30, seed=0, repeat=5):
+    """
+    Times the solver with and without the availability check for one teacher pool size.
+
+    Returns:
+        dict: One result record.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        workbook_path = os.path.join(work_dir, 'zeit.xlsx')
+        write_workbook(workbook_path, days=days, rooms=rooms, slots=slots, teachers=teachers, seed=seed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            plan = process_excel_to_csv_and_dict(workbook_path, export_csv=False)
+    student_groups = make_students(subjects=subjects, students=students, seed=seed)
+
+    plain_seconds, plain = time_solve(student_groups, plan, repeat, check_people=False)
+    checked_seconds, checked = time_solve(student_groups, plan, repeat, check_people=True)
+    return {
+        'teachers': teachers,
+        'plain_seconds': round(plain_seconds, 6),
+        'checked_seconds': round(checked_seconds, 6),
+        'ratio': round(checked_seconds / plain_seconds, 2) if plain_seconds else None,
+        'plain_unplaced': score_schedule(student_groups, plain)[0],
+        'checked_unplaced': score_schedule(student_groups, checked)[0],
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure the cost of the examiner availability check.")
+    parser.add_argument('--teachers', default='10,60,2000', help="Comma-separated teacher pool sizes")
+    parser.add_argument('--days', type=int, default=3)
+    parser.add_argument('--rooms', type=int, default=3)
+    parser.add_argument('--slots', type=int, default=12)
+    parser.add_argument('--subjects', type=int, default=10)
+    parser.add_argument('--students', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5, help="Solves per setting; the median is reported")
+    parser.add_argument('--output', help="Write results to this JSON file instead of stdout")
+    args = parser.parse_args()
+
+    results = [
+        measure_overhead(int(teachers), days=args.days, rooms=args.rooms, slots=args.slots, subjects=args.subjects,
+                         students=args.students, seed=args.seed, repeat=args.repeat)
+        for teachers in args.teachers.split(',')
+    ]
+    report = {'python': platform.python_version(), 'platform': platform.platform(), 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
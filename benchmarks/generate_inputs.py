@@ -0,0 +1,132 @@
+"""
+Seeded generator for synthetic exam plans.
+
+Writes a workbook in the layout `first_main.py` parses (one sheet per day,
+"DD.MM.YYYY: Raum X" headers and slot IDs such as DiA11) and a matching
+subject -> student groups JSON file. Days, rooms, slots per room, subjects and
+students can be scaled independently.
+"""
+import argparse
+import datetime
+import json
+import random
+
+from openpyxl import Workbook
+
+WEEKDAYS = ['Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So']
+HEADERS = ['Nr.', 'Nachname', 'Vorname', 'Fach', 'Gäste', 'Prüfer*in', 'Protokoll', 'Vorsitz',
+           'Ankunft in Warteraum 1', 'Beginn d. Vorbereitung', 'Ende der Vorbereitung',
+           'Beginn Prüfung', 'Ende Prüfung', 'Beratung von', 'Beratung bis',
+           'Aufsicht Warteraum 1', 'Aufsicht Warteraum 2', 'Aufsicht Vorbereitungsraum',
+           'Fluraufsicht', 'Reserve']
+# Start of the first exam and length of one exam slot, in minutes.
+DAY_START = 8 * 60
+SLOT_LENGTH = 30
+# The first subjects take the names of the solver's fixed subjects.
+SUBJECT_NAMES = ['Informatik', 'Philosophie', 'Mathematik', 'Deutsch', 'Englisch', 'Biologie',
+                 'Chemie', 'Physik', 'Geschichte', 'Erdkunde', 'Politik', 'Kunst', 'Musik',
+                 'Sport', 'Religion', 'Französisch', 'Spanisch', 'Latein']
+
+
+def exam_days(days, start=datetime.date(2025, 6, 23)):
+    """Returns `days` consecutive working days from `start`."""
+    result = []
+    current = start
+    while len(result) < days:
+        if current.weekday() < 5:
+            result.append(current)
+        current += datetime.timedelta(days=1)
+    return result
+
+
+def _time(minutes):
+    return datetime.time(minutes // 60, minutes % 60)
+
+
+def write_workbook(path, days=3, rooms=3, slots=12, teachers=20, seed=0):
+    """
+    Writes a synthetic time plan workbook.
+
+    Args:
+        path (str): Output .xlsx path.
+        days (int): Number of exam days (one sheet each).
+        rooms (int): Rooms per day (at most 26).
+        slots (int): Slots per room (at most 31, so every time falls within the day).
+        teachers (int): Size of the pool of examiners and supervisors.
+        seed (int): Random seed.
+    """
+    if DAY_START + slots * SLOT_LENGTH >= 24 * 60:
+        raise ValueError(f"At most {(24 * 60 - 1 - DAY_START) // SLOT_LENGTH} slots per room fit into a day")
+    rng = random.Random(seed)
+    staff = [f"Lehrkraft {i:03d}" for i in range(teachers)]
+    workbook = Workbook(write_only=True)
+    for day in exam_days(days):
+        date = day.strftime('%d.%m.%Y')
+        worksheet = workbook.create_sheet(date)
+        for room in range(rooms):
+            letter = chr(ord('A') + room)
+            worksheet.append([f"{date}: Raum {letter}"])
+            worksheet.append(HEADERS)
+            for slot in range(slots):
+                begin = DAY_START + slot * SLOT_LENGTH
+                examiner, protocol, chair, *supervisors = rng.sample(staff, 7)
+                worksheet.append([
+                    f"{WEEKDAYS[day.weekday()]}{letter}{10 + slot}",
+                    None, None, None, None,
+                    examiner, protocol, chair,
+                    _time(begin - 40), _time(begin - 30), _time(begin - 10),
+                    _time(begin), _time(begin + 20), _time(begin + 20), _time(begin + 30),
+                    *supervisors,
+                    'Reserve',
+                ])
+            worksheet.append([])
+    workbook.save(path)
+
+
+def make_students(subjects=10, students=30, exams_per_student=3, seed=0):
+    """
+    Builds a subject -> student groups mapping with groups of up to 3 students.
+
+    Args:
+        subjects (int): Number of subjects.
+        students (int): Number of students.
+        exams_per_student (int): Oral exams per student.
+        seed (int): Random seed.
+
+    Returns:
+        dict: Subject -> list of student groups.
+    """
+    rng = random.Random(seed)
+    names = [SUBJECT_NAMES[i] if i < len(SUBJECT_NAMES) else f"Fach {i}" for i in range(subjects)]
+    takers = {name: [] for name in names}
+    for student in range(students):
+        for name in rng.sample(names, min(exams_per_student, subjects)):
+            takers[name].append(f"Vorname{student} Nachname{student}")
+    return {
+        name: [members[i:i + 3] for i in range(0, len(members), 3)]
+        for name, members in takers.items()
+        if members
+    }
+
+
+def write_students(path, **kwargs):
+    """Writes `make_students(**kwargs)` as JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(make_students(**kwargs), f, ensure_ascii=False, indent=4)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate a synthetic exam plan and student list.")
+    parser.add_argument('--days', type=int, default=3)
+    parser.add_argument('--rooms', type=int, default=3)
+    parser.add_argument('--slots', type=int, default=12)
+    parser.add_argument('--subjects', type=int, default=10)
+    parser.add_argument('--students', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workbook', default='zeit.xlsx')
+    parser.add_argument('--students-json', default='student.json')
+    args = parser.parse_args()
+
+    write_workbook(args.workbook, days=args.days, rooms=args.rooms, slots=args.slots, seed=args.seed)
+    write_students(args.students_json, subjects=args.subjects, students=args.students, seed=args.seed)
+    print(f"Wrote {args.workbook} and {args.students_json}")
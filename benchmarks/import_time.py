@@ -0,0 +1,91 @@
+"""
+Measures how long the pipeline modules take to import in a fresh interpreter.
+
+Each module is imported `--repeat` times in a new `python -X importtime`
+process; the median cumulative import time is reported, together with the
+heavy third-party packages the import pulled in. The headless core
+(`exam_core`) should import in milliseconds and load none of them.
+
+Example:
+    python benchmarks/import_time.py --repeat 7 --output imports.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ['exam_core', 'second_assign', 'reschedule', 'exact_solver', 'first_main',
+           'third_convert_to_csv', 'verify_schedule']
+
+# Packages that are expensive to import and only needed for Excel, DataFrame or UI work.
+HEAVY_PACKAGES = ['pandas', 'numpy', 'openpyxl', 'pyarrow', 'streamlit']
+
+
+def import_once(module):
+    """
+    Imports `module` in a new interpreter.
+
+    Returns:
+        tuple: (cumulative import time in ms, sorted list of heavy packages it loaded)
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True,
+    )
+    total_us = None
+    loaded = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        if name.split('.')[0] in HEAVY_PACKAGES:
+            loaded.add(name.split('.')[0])
+        if name == module:
+            total_us = int(cumulative)
+    return total_us / 1000, sorted(loaded)
+
+
+def measure_imports(modules, repeat=5):
+    """Returns one result dict per module with the median, min and max import time in ms."""
+    results = []
+    for module in modules:
+        times = []
+        loaded = []
+        for _ in range(repeat):
+            milliseconds, loaded = import_once(module)
+            times.append(milliseconds)
+        results.append({
+            'module': module,
+            'median_ms': round(statistics.median(times), 2),
+            'min_ms': round(min(times), 2),
+            'max_ms': round(max(times), 2),
+            'heavy_packages': loaded,
+        })
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure the import time of the pipeline modules.")
+    parser.add_argument('modules', nargs='*', default=MODULES, help="Modules to measure (default: all)")
+    parser.add_argument('--repeat', type=int, default=5, help="Fresh imports per module (default 5)")
+    parser.add_argument('--output', help="Write results to this JSON file instead of stdout")
+    args = parser.parse_args()
+
+    results = measure_imports(args.modules, repeat=args.repeat)
+    report = {'python': platform.python_version(), 'repeat': args.repeat, 'results': results}
+
+    width = max(len(result['module']) for result in results)
+    for result in results:
+        heavy = ', '.join(result['heavy_packages']) or '-'
+        print(f"{result['module'].ljust(width)}  {result['median_ms']:8.1f} ms  heavy: {heavy}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+        print(f"Results have been saved to '{args.output}'")
@@ -0,0 +1,130 @@
+"""
+Benchmarks the parse -> solve -> export pipeline on synthetic inputs.
+
+Each run generates a workbook and student list with `generate_inputs.py`,
+then times every stage and, in a separate run, records its peak Python
+memory (tracemalloc).
+One dimension is scaled at a time from the base configuration, and the
+results are written as JSON so runs can be compared for regressions.
+
+Example:
+    python benchmarks/run_benchmarks.py --scale days=2,4,8 --scale students=30,60,120 --output bench.json
+"""
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_inputs import make_students, write_workbook  # noqa: E402
+from first_main import export_csv_files, process_excel_to_csv_and_dict  # noqa: E402
+from exam_core.solver import score_schedule, solve_exam_schedule  # noqa: E402
+from third_convert_to_csv import convert_to_csv  # noqa: E402
+
+BASE_CONFIG = {'days': 3, 'rooms': 3, 'slots': 12, 'subjects': 10, 'students': 30, 'seed': 0}
+
+
+def measure(function, *args, **kwargs):
+    """
+    Runs `function` with its output silenced: once for the wall time, and once more
+    under tracemalloc for the peak memory, so tracing does not slow the timed run.
+    Every run gets its own deep copy of the arguments, since stages may modify them.
+
+    Returns:
+        tuple: (result of the timed run, seconds, peak traced bytes)
+    """
+    run_args, run_kwargs = copy.deepcopy((args, kwargs))
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function(*run_args, **run_kwargs)
+    seconds = time.perf_counter() - start
+
+    run_args, run_kwargs = copy.deepcopy((args, kwargs))
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function(*run_args, **run_kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def run_pipeline(config, work_dir):
+    """
+    Generates inputs for `config` and measures each pipeline stage.
+
+    Returns:
+        list: One result record per stage.
+    """
+    workbook_path = os.path.join(work_dir, 'zeit.xlsx')
+    write_workbook(workbook_path, days=config['days'], rooms=config['rooms'], slots=config['slots'],
+                   seed=config['seed'])
+    students = make_students(subjects=config['subjects'], students=config['students'], seed=config['seed'])
+
+    records = []
+
+    def record(stage, seconds, peak, **extra):
+        records.append({'config': dict(config), 'stage': stage, 'seconds': round(seconds, 6),
+                        'peak_bytes': peak, **extra})
+
+    schedule, seconds, peak = measure(process_excel_to_csv_and_dict, workbook_path, export_csv=False)
+    record('parse', seconds, peak, slots=sum(len(s) for rooms in schedule.values() for s in rooms.values()))
+
+    _, seconds, peak = measure(export_csv_files, schedule, os.path.join(work_dir, 'csv_output'))
+    record('csv_export', seconds, peak)
+
+    solved, seconds, peak = measure(solve_exam_schedule, students, schedule)
+    unplaced, days_used, spread = score_schedule(students, solved)
+    record('solve', seconds, peak, unplaced_exams=unplaced, days_used=days_used, spread=spread)
+
+    _, seconds, peak = measure(convert_to_csv, solved)
+    record('convert', seconds, peak)
+    return records
+
+
+def parse_scale(values):
+    """Parses "--scale days=2,4,8" options into (dimension, [values]) pairs."""
+    scales = []
+    for value in values:
+        dimension, _, sizes = value.partition('=')
+        if dimension not in BASE_CONFIG or not sizes:
+            raise argparse.ArgumentTypeError(f"Invalid --scale {value!r}; use e.g. days=2,4,8")
+        scales.append((dimension, [int(size) for size in sizes.split(',')]))
+    return scales
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the parse -> solve -> export pipeline.")
+    for dimension, default in BASE_CONFIG.items():
+        parser.add_argument(f'--{dimension}', type=int, default=default, help=f"Base {dimension} (default {default})")
+    parser.add_argument('--scale', action='append', default=[],
+                        help="Dimension to scale with comma-separated sizes, e.g. days=2,4,8 (repeatable)")
+    parser.add_argument('--output', help="Write results to this JSON file instead of stdout")
+    args = parser.parse_args()
+
+    base = {dimension: getattr(args, dimension) for dimension in BASE_CONFIG}
+    configs = [base]
+    for dimension, sizes in parse_scale(args.scale):
+        configs.extend({**base, dimension: size} for size in sizes if size != base[dimension])
+
+    results = []
+    for config in configs:
+        with tempfile.TemporaryDirectory() as work_dir:
+            results.extend(run_pipeline(config, work_dir))
+        print(f"Finished {config}", file=sys.stderr)
+
+    report = {'python': platform.python_version(), 'platform': platform.platform(), 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
@@ -0,0 +1,203 @@
+import copy
+import time
+from collections import defaultdict
+
+from exam_core.slot_index import SlotIndex
+from exam_core.solver import (
+    FIXED_SUBJECTS,
+    assign_subject,
+    build_slot_groups,
+    score_schedule,
+    solve_exam_schedule,
+)
+
+
+def solve_exam_schedule_exact(students_data, schedule_data, time_budget=10.0):
+    """
+    Assigns students to exam slots with a branch-and-bound search over exam days.
+
+    Every subject is either given one exam day (all of its groups in that day's
+    earliest free slot groups) or left unplaced. The search minimises, in this
+    order, unplaced exams, days used and the number of extra days students have
+    to come in, and treats `FIXED_SUBJECTS` as hard constraints. It starts from
+    the greedy schedule and keeps the best schedule found so far, so it can stop
+    at any time: when `time_budget` runs out, the best schedule found is returned.
+
+    Args:
+        students_data (dict): A dictionary mapping subjects to lists of student groups.
+        schedule_data (dict): A dictionary representing the available exam schedule.
+        time_budget (float): Wall-clock budget for the search in seconds.
+
+    Returns:
+        dict: The schedule_data dictionary populated with student assignments.
+    """
+    deadline = time.monotonic() + time_budget
+
+    # Incumbent: the greedy schedule, scored on the real output.
+    greedy_schedule = solve_exam_schedule(students_data, copy.deepcopy(schedule_data))
+    greedy_score = score_schedule(students_data, greedy_schedule)
+
+    # 1. --- Model: day capacities in slot groups ---
+    days = sorted(schedule_data.keys())
+    capacity = defaultdict(int)
+    for slot_group in build_slot_groups(schedule_data):
+        capacity[slot_group["day"]] += 1
+
+    subjects = list(students_data.keys())
+    demand = {subject: len(students_data[subject]) for subject in subjects}
+    exams = {subject: sum(len(group) for group in students_data[subject]) for subject in subjects}
+    students_of = {
+        subject: sorted({student for group in students_data[subject] for student in group})
+        for subject in subjects
+    }
+
+    # Fixed subjects first, then the largest subjects, which are the hardest to fit.
+    search_order = sorted(
+        subjects,
+        key=lambda subject: (subject not in FIXED_SUBJECTS, -demand[subject], -exams[subject]),
+    )
+    remaining_demand = [0] * (len(search_order) + 1)
+    for i in range(len(search_order) - 1, -1, -1):
+        remaining_demand[i] = remaining_demand[i + 1] + demand[search_order[i]]
+    smallest_group = min(
+        (len(group) for groups in students_data.values() for group in groups), default=0
+    )
+
+    # 2. --- Search state ---
+    # Days without a full 3-slot group have no capacity but are still listed in `days`.
+    free = {day: capacity.get(day, 0) for day in days}
+    day_load = defaultdict(int)
+    student_days = defaultdict(lambda: defaultdict(int))
+    choice = {}
+    state = {"unplaced": 0, "days_used": 0, "spread": 0}
+    best_cost = None
+    best_choice = None
+    nodes = 0
+    timed_out = False
+
+    def place(subject, day):
+        free[day] -= demand[subject]
+        if day_load[day] == 0:
+            state["days_used"] += 1
+        day_load[day] += 1
+        for student in students_of[subject]:
+            days_of_student = student_days[student]
+            if days_of_student[day] == 0 and any(days_of_student.values()):
+                state["spread"] += 1
+            days_of_student[day] += 1
+
+    def unplace(subject, day):
+        for student in students_of[subject]:
+            days_of_student = student_days[student]
+            days_of_student[day] -= 1
+            if days_of_student[day] == 0 and any(days_of_student.values()):
+                state["spread"] -= 1
+        day_load[day] -= 1
+        if day_load[day] == 0:
+            state["days_used"] -= 1
+        free[day] += demand[subject]
+
+    def candidate_days(subject):
+        """Days that can take the subject, the most promising first."""
+        if subject in FIXED_SUBJECTS:
+            fixed_day = FIXED_SUBJECTS[subject]
+            return [fixed_day] if free.get(fixed_day, 0) >= demand[subject] else []
+
+        students_on_day = defaultdict(int)
+        for student in students_of[subject]:
+            for day, count in student_days[student].items():
+                if count:
+                    students_on_day[day] += 1
+
+        used, unused, seen_capacities = [], [], set()
+        for day in days:
+            if free[day] < demand[subject]:
+                continue
+            if day_load[day]:
+                used.append(day)
+            elif free[day] not in seen_capacities:
+                # Empty days with the same capacity are interchangeable; try the earliest.
+                seen_capacities.add(free[day])
+                unused.append(day)
+        used.sort(key=lambda day: -students_on_day[day])
+        return used + unused
+
+    def search(i):
+        nonlocal best_cost, best_choice, nodes, timed_out
+        nodes += 1
+        if nodes % 1024 == 0 and time.monotonic() > deadline:
+            timed_out = True
+        if timed_out:
+            return
+
+        # Lower bound: groups that cannot fit in the remaining capacity stay unplaced.
+        overflow = max(0, remaining_demand[i] - sum(free.values()))
+        bound = (state["unplaced"] + overflow * smallest_group, state["days_used"], state["spread"])
+        if best_cost is not None and bound >= best_cost:
+            return
+
+        if i == len(search_order):
+            best_cost = (state["unplaced"], state["days_used"], state["spread"])
+            best_choice = dict(choice)
+            return
+
+        subject = search_order[i]
+        for day in candidate_days(subject):
+            place(subject, day)
+            choice[subject] = day
+            search(i + 1)
+            del choice[subject]
+            unplace(subject, day)
+            if timed_out:
+                return
+
+        state["unplaced"] += exams[subject]
+        search(i + 1)
+        state["unplaced"] -= exams[subject]
+
+    search(0)
+
+    # 3. --- Materialise the best day assignment ---
+    exact_schedule = copy.deepcopy(schedule_data)
+    if best_choice is not None:
+        slot_index = SlotIndex(build_slot_groups(exact_schedule))
+        student_day = {}
+        for subject in subjects:
+            if subject in best_choice:
+                day = best_choice[subject]
+                slots_found = slot_index.free_groups(demand[subject], day=day)
+                assign_subject(exact_schedule, subject, students_data[subject], slots_found, slot_index)
+                for student in students_of[subject]:
+                    student_day.setdefault(student, day)
+        # Subjects left without a single day may still fit when split across days.
+        # A fixed subject is only ever placed on its day; as in the greedy solver,
+        # a fixed day missing from the plan leaves the subject unfixed.
+        for subject in subjects:
+            if subject not in best_choice:
+                fixed_day = FIXED_SUBJECTS.get(subject)
+                if fixed_day in exact_schedule:
+                    slots_found = slot_index.free_groups(demand[subject], day=fixed_day)
+                else:
+                    preferred_day = next(
+                        (student_day[student] for student in students_of[subject] if student in student_day), None
+                    )
+                    slots_found = slot_index.next_free_groups(demand[subject], preferred_day)
+                if len(slots_found) == demand[subject]:
+                    assign_subject(exact_schedule, subject, students_data[subject], slots_found, slot_index)
+        exact_score = score_schedule(students_data, exact_schedule)
+    else:
+        exact_score = None
+
+    status = "stopped at the time budget" if timed_out else "finished"
+    if exact_score is not None and exact_score < greedy_score:
+        result, result_score = exact_schedule, exact_score
+    else:
+        result, result_score = greedy_schedule, greedy_score
+    print(
+        f"Exact search {status} after {nodes} nodes: "
+        f"{result_score[0]} unplaced exams, {result_score[1]} days, spread {result_score[2]}"
+    )
+
+    schedule_data.clear()
+    schedule_data.update(result)
+    return schedule_data
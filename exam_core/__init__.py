@@ -0,0 +1,32 @@
+"""
+Headless core of the exam scheduler: the solver and JSON I/O.
+
+Everything here is pure Python over the `date -> room -> slot -> dict` schedule
+and imports neither pandas, openpyxl nor Streamlit, so short-lived jobs can
+solve a schedule without paying for them:
+
+    from exam_core import load_json, save_json, solve_exam_schedule
+
+    schedule = solve_exam_schedule(load_json('student.json'), load_json('zeit.json'))
+    save_json(schedule, 'final_schedule.json')
+
+or from the command line: `python -m exam_core student.json zeit.json`.
+
+Modules:
+    solver: The greedy solver (`second_assign.py` is its command line).
+    slot_index: Index of the free slot groups.
+    availability: Keeps examiners and supervisors out of overlapping exams.
+    schedule_model: Slot field names, time parsing and the compact `Schedule` model.
+    instrumentation: Stage times and solver counters.
+    background_jobs: Progress reporting, cancellation and the app's job runner.
+    json_io: Reading and writing the JSON files.
+
+Reading workbooks (`first_main`), DataFrames (`third_convert_to_csv`) and
+verification (`verify_schedule`) stay outside the package and need pandas.
+"""
+from exam_core.json_io import load_json, save_json, solve_files
+from exam_core.schedule_model import ExamSlot, Schedule
+from exam_core.solver import FIXED_SUBJECTS, score_schedule, solve_exam_schedule
+
+__all__ = ['FIXED_SUBJECTS', 'ExamSlot', 'Schedule', 'load_json', 'save_json', 'score_schedule',
+           'solve_exam_schedule', 'solve_files']
@@ -0,0 +1,17 @@
+import argparse
+
+from exam_core.json_io import solve_files
+
+parser = argparse.ArgumentParser(prog='python -m exam_core', description="Solve an exam schedule from JSON files.")
+parser.add_argument('students', nargs='?', default='student.json', help="Student JSON (default student.json)")
+parser.add_argument('schedule', nargs='?', default='zeit.json', help="Parsed time plan JSON (default zeit.json)")
+parser.add_argument('--output', default='final_schedule.json', help="Solved schedule (default final_schedule.json)")
+parser.add_argument('--stats', help="Also write stage times and solver counters to this JSON file")
+parser.add_argument('--check-people', action='store_true', help="Do not double-book examiners and supervisors")
+parser.add_argument('--unavailability', help="JSON file of times examiners and supervisors cannot work")
+args = parser.parse_args()
+
+summary = solve_files(args.students, args.schedule, args.output, stats_path=args.stats,
+                      check_people=args.check_people, unavailability_path=args.unavailability)
+print(f"Scheduled {summary['scheduled_exams']} of {summary['total_exams']} exams "
+      f"on {summary['days_used']} days; the schedule has been saved to '{args.output}'")
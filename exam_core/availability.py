@@ -0,0 +1,312 @@
+import bisect
+import json
+
+from exam_core.schedule_model import parse_minutes
+
+# When each role is busy in a slot: (start field, end field, end field to use if the first is empty).
+# Hall supervision is shared between rooms, so it is not checked.
+ROLE_SPANS = {
+    'Prüfer*in': ('Beginn_Prüfung', 'Beratung_bis', 'Ende_Prüfung'),
+    'Protokoll': ('Beginn_Prüfung', 'Beratung_bis', 'Ende_Prüfung'),
+    'Vorsitz': ('Beginn_Prüfung', 'Beratung_bis', 'Ende_Prüfung'),
+    'Aufsicht_Warteraum_1': ('Ankunft_in_Warteraum_1', 'Beginn_d_Vorbereitung', None),
+    'Aufsicht_Vorbereitungsraum': ('Beginn_d_Vorbereitung', 'Ende_der_Vorbereitung', None),
+    'Aufsicht_Warteraum_2': ('Ende_der_Vorbereitung', 'Beginn_Prüfung', None),
+}
+
+# Every field ROLE_SPANS reads a time from
+TIME_FIELDS = sorted({field for span in ROLE_SPANS.values() for field in span if field})
+
+# A whole day, in minutes, for unavailability entries without times.
+WHOLE_DAY = (0, 24 * 60)
+
+
+class PersonIntervals:
+    """
+    Busy intervals of one person on one day, kept sorted and merged.
+
+    Intervals are half-open [start, end) in minutes after midnight, so back-to-back
+    slots do not clash. Because the intervals never overlap, "is this person free"
+    only needs to look at the two neighbours found by binary search.
+    """
+
+    __slots__ = ('starts', 'ends')
+
+    def __init__(self, start, end):
+        """Starts with the single busy interval [start, end)."""
+        self.starts = [start]
+        self.ends = [end]
+
+    def is_free(self, start, end):
+        """Returns True if [start, end) does not overlap any busy interval."""
+        i = bisect.bisect_right(self.starts, start) - 1
+        if i >= 0 and self.ends[i] > start:
+            return False
+        return i + 1 >= len(self.starts) or self.starts[i + 1] >= end
+
+    def book(self, start, end):
+        """Marks [start, end) as busy, merging it with overlapping or touching intervals."""
+        if start > self.ends[-1]:
+            # Bookings mostly arrive in time order, so most of them simply go last.
+            self.starts.append(start)
+            self.ends.append(end)
+            return
+        i = bisect.bisect_left(self.starts, start)
+        if i > 0 and self.ends[i - 1] >= start:
+            i -= 1
+            start = self.starts[i]
+        j = i
+        while j < len(self.starts) and self.starts[j] <= end:
+            end = max(end, self.ends[j])
+            j += 1
+        self.starts[i:j] = [start]
+        self.ends[i:j] = [end]
+
+
+class AvailabilityIndex:
+    """
+    Per-person interval index used by the solver to avoid double-booking
+    examiners and supervisors, and to respect their unavailability.
+
+    Bookings are kept per (person, day) and room. Overlaps within one room are
+    part of the plan (consecutive candidates share a waiting room or a
+    deliberation), so only overlaps with another room, or with an
+    unavailability (room None), count as clashes.
+
+    The solver's slot groups are registered with `add_groups`, which works out
+    once per plan which of their slots clash; the solver then checks and books
+    whole slot groups (`group_fits`, `book_group`) without touching intervals.
+    """
+
+    def __init__(self):
+        self._intervals = {}
+        # Slot group key -> smallest exam count the booked people already rule out
+        self._rejected_from = {}
+        # Registered slots are numbered: slot group key -> its slot numbers, and per
+        # slot number its (slot group key, position), the slots it clashes with and
+        # whether it is booked
+        self._group_slots = {}
+        self._slot_owners = []
+        self._conflicts = []
+        self._booked_slots = []
+
+    def is_free(self, person, day, start, end, room=None):
+        """Returns True if `person` is free on `day` for [start, end) outside `room`."""
+        rooms = self._intervals.get((person, day))
+        if rooms is None:
+            return True
+        for booked_room, intervals in rooms.items():
+            if (room is None or booked_room != room) and not intervals.is_free(start, end):
+                return False
+        return True
+
+    def book(self, person, day, start, end, room=None):
+        """Marks `person` as busy on `day` for [start, end) in `room` (None: unavailable)."""
+        rooms = self._intervals.get((person, day))
+        if rooms is None:
+            self._intervals[(person, day)] = {room: PersonIntervals(start, end)}
+        elif room not in rooms:
+            rooms[room] = PersonIntervals(start, end)
+        else:
+            rooms[room].book(start, end)
+
+    def fits(self, requirements):
+        """Returns True if every (person, day, room, start, end) requirement is free."""
+        for person, day, room, start, end in requirements:
+            if not self.is_free(person, day, start, end, room):
+                return False
+        return True
+
+    def add_groups(self, requirements_by_group):
+        """
+        Registers the slot groups the solver will ask about and works out who could clash.
+
+        The people of every slot are fixed by the plan, so which slots of two groups
+        overlap in time for the same person in different rooms is known up front:
+        one sweep per person and day lists, for every slot, the slots it clashes
+        with. Bookings already in this index (exams in the plan, unavailability)
+        are checked here once; later, checking a slot group only looks up whether
+        a clashing group is booked. Groups booked with `book_group` are only
+        visible to `group_fits`, so bookings made with `book` must come first.
+
+        Args:
+            requirements_by_group (dict): Slot group key (see `group_key`) -> one
+                (person, day, room, start, end) list per slot.
+        """
+        intervals = []
+        for key, requirements_per_slot in requirements_by_group.items():
+            slots = self._group_slots[key] = []
+            for i, requirements in enumerate(requirements_per_slot):
+                if self._intervals and key not in self._rejected_from and not self.fits(requirements):
+                    self._rejected_from[key] = i + 1
+                slot = len(self._slot_owners)
+                slots.append(slot)
+                self._slot_owners.append((key, i))
+                self._conflicts.append([])
+                self._booked_slots.append(False)
+                intervals += [(person, day, start, end, room, slot) for person, day, room, start, end in requirements]
+
+        # Sorted by person, day and start, so each interval is only compared with the
+        # following ones of the same person and day that start before it ends.
+        intervals.sort()
+        conflicts = self._conflicts
+        for n, (person, day, start, end, room, slot) in enumerate(intervals, 1):
+            while n < len(intervals):
+                other_person, other_day, other_start, _, other_room, other_slot = intervals[n]
+                if other_start >= end or other_person != person or other_day != day:
+                    break
+                if other_room != room:
+                    conflicts[slot].append(other_slot)
+                    conflicts[other_slot].append(slot)
+                n += 1
+
+    def group_fits(self, key, exam_count, pending=None):
+        """
+        Checks whether the first `exam_count` slots of a registered slot group can be used.
+
+        A clash with a booking in this index is remembered under `key`. Bookings are
+        only ever added, so the slot group stays ruled out for this many exams or more
+        and later subjects skip it without checking its people again.
+
+        Args:
+            key (tuple): Identifies the slot group, as passed to `add_groups`.
+            exam_count (int): Number of slots the subject's group needs.
+            pending (dict, optional): Slot group key -> exam count of the groups already
+                chosen for the same subject but not yet booked here.
+
+        Returns:
+            bool: True if every person is free, in this index and in `pending`.
+        """
+        if exam_count >= self._rejected_from.get(key, exam_count + 1):
+            return False
+        booked = self._booked_slots
+        slots = self._group_slots[key][:exam_count]
+        for i, slot in enumerate(slots):
+            for other_slot in self._conflicts[slot]:
+                if booked[other_slot]:
+                    self._rejected_from[key] = i + 1
+                    return False
+        if pending:
+            for slot in slots:
+                for other_slot in self._conflicts[slot]:
+                    other_key, j = self._slot_owners[other_slot]
+                    if pending.get(other_key, 0) > j:
+                        return False
+        return True
+
+    def ruled_out(self, key):
+        """Returns True if the slot group `key` cannot hold even one exam any more (see `group_fits`)."""
+        return self._rejected_from.get(key) == 1
+
+    def book_all(self, requirements):
+        """Books every (person, day, room, start, end) requirement."""
+        for person, day, room, start, end in requirements:
+            self.book(person, day, start, end, room)
+
+    def book_group(self, key, exam_count):
+        """Books the people of the first `exam_count` slots of a registered slot group."""
+        for slot in self._group_slots[key][:exam_count]:
+            self._booked_slots[slot] = True
+
+
+# Time text -> minutes; plans repeat the same few times in every room.
+_minutes_cache = {}
+
+# Time fields of a slot -> (role, start, end) spans
+_spans_cache = {}
+
+
+def _minutes(value):
+    """Parses a time cell like `parse_minutes`, remembering the result."""
+    text = str(value or "")
+    if text not in _minutes_cache:
+        _minutes_cache[text] = parse_minutes(text)
+    return _minutes_cache[text]
+
+
+def _role_spans(details):
+    """Returns the (role, start, end) spans of a slot's times, remembering them per set of times."""
+    times = tuple(map(details.get, TIME_FIELDS))
+    spans = _spans_cache.get(times)
+    if spans is None:
+        spans = []
+        for role, (start_field, end_field, fallback_end_field) in ROLE_SPANS.items():
+            start = _minutes(details.get(start_field))
+            end = _minutes(details.get(end_field))
+            if end is None and fallback_end_field:
+                end = _minutes(details.get(fallback_end_field))
+            if start is not None and end is not None and end > start:
+                spans.append((role, start, end))
+        _spans_cache[times] = spans
+    return spans
+
+
+def slot_requirements(day, room, details):
+    """
+    Lists who is busy, and when, if an exam takes place in this slot.
+
+    Args:
+        day (str): Date string.
+        room (str): Room name.
+        details (dict): The slot's fields.
+
+    Returns:
+        list: (person, day, room, start, end) tuples; roles with missing times are skipped.
+    """
+    return [(details[role], day, room, start, end) for role, start, end in _role_spans(details) if details.get(role)]
+
+
+def group_key(slot_group):
+    """Identifies a slot group in an AvailabilityIndex: (day, room, first slot ID)."""
+    return slot_group["day"], slot_group["room"], slot_group["slots"][0]
+
+
+def build_availability(schedule_data, unavailability=None, slot_groups=None):
+    """
+    Creates the availability index for a plan.
+
+    Slots that already hold an exam book their people, and unavailability
+    entries book the times a person cannot work. Which free slot groups clash
+    with each other is worked out here, once per plan, for `group_fits`.
+
+    Args:
+        schedule_data (dict): The exam schedule.
+        unavailability (dict, optional): Person -> list of entries such as
+            {"day": "24.06.2025"} (the whole day) or {"day": "24.06.2025", "from": "08:00", "to": "10:30"}.
+        slot_groups (list, optional): Slot groups the solver will ask about (see
+            `solver.build_slot_groups`); they are registered under `group_key`.
+
+    Returns:
+        AvailabilityIndex: The index.
+    """
+    availability = AvailabilityIndex()
+    for day, rooms in schedule_data.items():
+        for room, slots in rooms.items():
+            for details in slots.values():
+                if details.get("Fach"):
+                    availability.book_all(slot_requirements(day, room, details))
+
+    for person, entries in (unavailability or {}).items():
+        for entry in entries:
+            start = parse_minutes(entry.get("from") or "")
+            end = parse_minutes(entry.get("to") or "")
+            if start is None or end is None:
+                start, end = WHOLE_DAY
+            availability.book(person, entry["day"], start, end)
+
+    requirements_by_group = {}
+    for slot_group in slot_groups or []:
+        if not slot_group["used"]:
+            day, room = slot_group["day"], slot_group["room"]
+            slots = schedule_data[day][room]
+            requirements_by_group[group_key(slot_group)] = [
+                slot_requirements(day, room, slots[slot_key]) for slot_key in slot_group["slots"]
+            ]
+    availability.add_groups(requirements_by_group)
+    return availability
+
+
+def load_unavailability(path):
+    """Loads an unavailability JSON file (see `build_availability`)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
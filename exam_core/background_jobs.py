@@ -0,0 +1,273 @@
+import itertools
+import threading
+import time
+import traceback
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# Seconds between progress and partial-result updates sent from a job's process
+PUBLISH_SECONDS = 0.5
+# Seconds between checks whether a job was cancelled
+CANCEL_CHECK_SECONDS = 0.1
+
+
+# --- Progress reporting and cancellation ---
+#
+# Long-running stages accept `progress=`: an object with `update(stage, done, total=None)`,
+# called as work completes, and `cancelled()`, checked between units of work
+# (sheets, subjects). A stage that finds it cancelled raises PipelineCancelled.
+
+
+class PipelineCancelled(Exception):
+    """Raised inside a pipeline stage when its progress reporter says the run was cancelled."""
+
+
+class _NoProgress:
+    """Stand-in used when no progress reporter is passed; reports nothing and never cancels."""
+
+    def update(self, stage, done, total=None):
+        pass
+
+    def cancelled(self):
+        return False
+
+
+NO_PROGRESS = _NoProgress()
+
+
+def placed_rows(schedule_data):
+    """Lists the booked slots of a schedule as flat rows with "Date", "Room" and "Slot"."""
+    return [
+        {"Date": date, "Room": room, "Slot": slot_id, **details}
+        for date, rooms in schedule_data.items()
+        for room, slots in rooms.items()
+        for slot_id, details in slots.items()
+        if details.get("Fach")
+    ]
+
+
+class JobReporter:
+    """
+    Progress reporter of one job, used inside the job's worker process.
+
+    It is what the pipeline gets as `job`: pass it as `progress=` to the pipeline
+    stages. Progress and the exams placed so far are sent to the page's process at
+    most every PUBLISH_SECONDS, and the cancel flag is read at most every
+    CANCEL_CHECK_SECONDS, so reporting stays cheap even though every update
+    crosses process boundaries.
+    """
+
+    def __init__(self, state, cancel_event):
+        """
+        Args:
+            state (dict proxy): Shared dict receiving "started", "progress" and "placed".
+            cancel_event (Event proxy): Set by the page to cancel the job.
+        """
+        self._state = state
+        self._cancel_event = cancel_event
+        self._progress = {}
+        self._watched = None
+        self._published = 0.0
+        self._checked = 0.0
+        self._cancelled = False
+
+    def __getstate__(self):
+        # Only the shared objects travel to the worker; the rest starts fresh there.
+        return self._state, self._cancel_event
+
+    def __setstate__(self, shared):
+        self.__init__(*shared)
+
+    def update(self, stage, done, total=None):
+        """Records that `done` of `total` units of `stage` are finished."""
+        self._progress[stage] = (done, total)
+        self.publish()
+
+    def cancelled(self):
+        """Returns True once the page has cancelled the job."""
+        now = time.monotonic()
+        if not self._cancelled and now - self._checked >= CANCEL_CHECK_SECONDS:
+            self._checked = now
+            self._cancelled = self._cancel_event.is_set()
+        return self._cancelled
+
+    def watch(self, schedule_data):
+        """Names the schedule the solver is filling, so the page can show the exams placed so far."""
+        self._watched = schedule_data
+        self.publish(force=True)
+
+    def publish(self, force=False):
+        """Sends the progress and the placed exams to the page, unless that was done just now."""
+        now = time.monotonic()
+        if not force and now - self._published < PUBLISH_SECONDS:
+            return
+        self._published = now
+        update = {"progress": dict(self._progress)}
+        if self._watched is not None:
+            update["placed"] = placed_rows(self._watched)
+        self._state.update(update)
+
+
+def _run_job(reporter, pipeline, args, kwargs):
+    """
+    Runs `pipeline(reporter, *args, **kwargs)` in a worker process.
+
+    Returns:
+        tuple: (status, result, error), with status DONE, CANCELLED or FAILED.
+    """
+    reporter._state["started"] = time.time()
+    try:
+        if reporter._cancel_event.is_set():
+            raise PipelineCancelled("Cancelled before it started")
+        result = pipeline(reporter, *args, **kwargs)
+        return DONE, result, None
+    except PipelineCancelled as e:
+        return CANCELLED, None, str(e)
+    except Exception:
+        return FAILED, None, traceback.format_exc()
+    finally:
+        reporter.publish(force=True)
+
+
+class Job:
+    """
+    Handle of one pipeline run on a `JobRunner`, used by the page.
+
+    The run itself happens in a worker process and reports through a `JobReporter`;
+    this handle reads what it reported and can cancel it.
+    """
+
+    def __init__(self, job_id, state, cancel_event):
+        self.job_id = job_id
+        self.result = None
+        self.error = None
+        self.finished = None
+        self._status = QUEUED
+        self._state = state
+        self._cancel_event = cancel_event
+        self._future = None
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def status(self):
+        """QUEUED, RUNNING, DONE, FAILED or CANCELLED."""
+        if self._status == QUEUED and "started" in self._state:
+            return RUNNING
+        return self._status
+
+    @property
+    def started(self):
+        """Wall-clock time the run started in its worker, or None while queued."""
+        return self._state.get("started")
+
+    def cancel(self):
+        """Asks the run to stop at the next sheet or subject; a queued run never starts."""
+        self._cancel_event.set()
+        if self._future is not None:
+            self._future.cancel()
+
+    def done(self):
+        """Returns True once the run has finished, failed or been cancelled."""
+        return self._status in (DONE, FAILED, CANCELLED)
+
+    def progress(self):
+        """Returns a copy of the stage -> (done, total) progress; total is None when unknown."""
+        return dict(self._state.get("progress", {}))
+
+    def elapsed(self):
+        """Seconds since the run started (until it finished), or 0 while queued."""
+        started = self.started
+        if started is None:
+            return 0.0
+        return (self.finished or time.time()) - started
+
+    def placed_exams(self):
+        """
+        Lists the exams placed so far, as flat rows with "Date", "Room" and "Slot".
+
+        The worker sends them at most every PUBLISH_SECONDS, so the list can lag
+        slightly behind the solver.
+
+        Returns:
+            list: One dict per booked slot (empty before solving starts).
+        """
+        return list(self._state.get("placed", []))
+
+    def add_done_callback(self, callback):
+        """Calls `callback(job)` in the page's process once the run has ended (right away if it has)."""
+        with self._lock:
+            if not self.done():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def _finish(self, future):
+        if future.cancelled():
+            status, result, error = CANCELLED, None, "Cancelled before it started"
+        else:
+            try:
+                status, result, error = future.result()
+            except Exception as e:
+                # The worker process died or the result could not be sent back
+                status, result, error = FAILED, None, f"{type(e).__name__}: {e}"
+        with self._lock:
+            self.result, self.error, self.finished = result, error, time.time()
+            self._status = status
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+
+class JobRunner:
+    """
+    Runs pipeline jobs on a shared pool of worker processes.
+
+    Submitting returns a `Job` right away, so the page that submitted it stays
+    responsive, and since every job runs in its own process, several sessions
+    can parse and solve at the same time without sharing one interpreter lock.
+    """
+
+    def __init__(self, max_workers=4):
+        """
+        Args:
+            max_workers (int): Number of jobs that run at the same time; later jobs wait in a queue.
+        """
+        # Imported here so modules that only need NO_PROGRESS stay cheap to import.
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Worker processes are spawned rather than forked, as the page's process runs threads.
+        context = multiprocessing.get_context("spawn")
+        self._manager = context.Manager()
+        self._executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+        self._ids = itertools.count(1)
+
+    def submit(self, pipeline, *args, **kwargs):
+        """
+        Starts `pipeline(job, *args, **kwargs)` in a worker process.
+
+        `pipeline` must be a module-level function and its arguments and result
+        must be picklable. Its return value becomes `job.result`. If it raises
+        PipelineCancelled the job ends as cancelled, and any other exception is
+        kept in `job.error` with its traceback.
+
+        Returns:
+            Job: The handle of the new job.
+        """
+        state = self._manager.dict()
+        cancel_event = self._manager.Event()
+        job = Job(next(self._ids), state, cancel_event)
+        job._future = self._executor.submit(_run_job, JobReporter(state, cancel_event), pipeline, args, kwargs)
+        job._future.add_done_callback(job._finish)
+        return job
+
+    def shutdown(self):
+        """Stops the worker processes once the running jobs have finished."""
+        self._executor.shutdown(cancel_futures=True)
+        self._manager.shutdown()
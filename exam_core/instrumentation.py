@@ -0,0 +1,91 @@
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class Instrumentation:
+    """
+    Collects wall time per pipeline stage and solver counters for one run.
+
+    Pass an instance as `stats=` to the pipeline functions; they record into it
+    when given one and skip all bookkeeping otherwise. With `profile=True`, each
+    stage also runs under cProfile and the report includes its hottest functions.
+    """
+
+    def __init__(self, profile=False, profile_limit=15):
+        """
+        Args:
+            profile (bool): Profile every stage with cProfile (opt-in, adds overhead).
+            profile_limit (int): Number of functions listed per profiled stage.
+        """
+        self.stages = defaultdict(float)
+        self.stage_calls = defaultdict(int)
+        self.counters = defaultdict(int)
+        self.profile = profile
+        self.profile_limit = profile_limit
+        self._profilers = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Times a block as stage `name`; repeated stages (e.g. one per sheet) add up."""
+        profiler = None
+        if self.profile:
+            import cProfile
+
+            profiler = self._profilers.setdefault(name, cProfile.Profile())
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] += time.perf_counter() - start
+            self.stage_calls[name] += 1
+            if profiler is not None:
+                profiler.disable()
+
+    def count(self, name, amount=1):
+        """Adds `amount` to counter `name`."""
+        self.counters[name] += amount
+
+    def _profile_report(self, profiler):
+        import io
+        import pstats
+
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(self.profile_limit)
+        return output.getvalue()
+
+    def to_dict(self):
+        """Returns the collected data as plain, JSON-serialisable values."""
+        report = {
+            'stages': {
+                name: {'seconds': round(seconds, 6), 'calls': self.stage_calls[name]}
+                for name, seconds in self.stages.items()
+            },
+            'counters': dict(self.counters),
+        }
+        if self._profilers:
+            report['profiles'] = {
+                name: self._profile_report(profiler) for name, profiler in self._profilers.items()
+            }
+        return report
+
+    def to_json(self, path):
+        """Writes `to_dict()` to a JSON file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=4)
+
+
+class _NoInstrumentation:
+    """Stand-in used when no Instrumentation is passed; records nothing."""
+
+    @contextmanager
+    def stage(self, name):
+        yield
+
+    def count(self, name, amount=1):
+        pass
+
+
+NO_INSTRUMENTATION = _NoInstrumentation()
@@ -0,0 +1,55 @@
+import json
+
+from exam_core.instrumentation import Instrumentation
+from exam_core.solver import score_schedule, solve_exam_schedule
+
+
+def load_json(path):
+    """Loads a student, schedule or unavailability JSON file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_json(data, path, indent=4):
+    """Writes data as UTF-8 JSON, in the same layout as final_schedule.json."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+
+
+def solve_files(students_path, schedule_path, output_path, stats_path=None, check_people=False,
+                unavailability_path=None):
+    """
+    Solves a schedule from JSON files and writes the result.
+
+    Args:
+        students_path (str): Student JSON (subject -> student groups).
+        schedule_path (str): Parsed time plan JSON, such as zeit.json.
+        output_path (str): Where to write the solved schedule.
+        stats_path (str, optional): Where to write stage times and solver counters.
+        check_people (bool): Do not double-book examiners and supervisors.
+        unavailability_path (str, optional): JSON file of times people cannot work.
+
+    Returns:
+        dict: "total_exams", "scheduled_exams", "days_used" and "spread" of the result.
+    """
+    stats = Instrumentation()
+    with stats.stage("json_read"):
+        students = load_json(students_path)
+        schedule = load_json(schedule_path)
+        unavailability = load_json(unavailability_path) if unavailability_path else None
+
+    solve_exam_schedule(students, schedule, stats=stats, check_people=check_people, unavailability=unavailability)
+
+    with stats.stage("json_write"):
+        save_json(schedule, output_path)
+    if stats_path:
+        stats.to_json(stats_path)
+
+    unplaced, days_used, spread = score_schedule(students, schedule)
+    total_exams = sum(len(group) for groups in students.values() for group in groups)
+    return {
+        'total_exams': total_exams,
+        'scheduled_exams': total_exams - unplaced,
+        'days_used': days_used,
+        'spread': spread,
+    }
@@ -0,0 +1,223 @@
+"""
+The slot fields of a plan and a compact model of a schedule.
+
+`Schedule` holds a `date -> room -> slot -> dict` schedule as `ExamSlot`
+records with interned strings and times in minutes; `Schedule.from_dict` and
+`Schedule.to_dict` convert between the two without loss.
+"""
+import json
+import sys
+from operator import attrgetter
+
+# Fields of a slot, in column order after the slot ID (columns 1-19 of a data row).
+ROOM_FIELDS = ['Nachname', 'Vorname', 'Fach', 'Gäste', 'Prüfer*in', 'Protokoll', 'Vorsitz',
+               'Ankunft_in_Warteraum_1', 'Beginn_d_Vorbereitung', 'Ende_der_Vorbereitung',
+               'Beginn_Prüfung', 'Ende_Prüfung', 'Beratung_von', 'Beratung_bis',
+               'Aufsicht_Warteraum_1', 'Aufsicht_Warteraum_2', 'Aufsicht_Vorbereitungsraum',
+               'Fluraufsicht', 'Reserve']
+
+# Slot field -> ExamSlot attribute.
+FIELD_ATTRIBUTES = {
+    'Nachname': 'nachname',
+    'Vorname': 'vorname',
+    'Fach': 'fach',
+    'Gäste': 'gaeste',
+    'Prüfer*in': 'pruefer',
+    'Protokoll': 'protokoll',
+    'Vorsitz': 'vorsitz',
+    'Ankunft_in_Warteraum_1': 'ankunft',
+    'Beginn_d_Vorbereitung': 'beginn_vorbereitung',
+    'Ende_der_Vorbereitung': 'ende_vorbereitung',
+    'Beginn_Prüfung': 'beginn_pruefung',
+    'Ende_Prüfung': 'ende_pruefung',
+    'Beratung_von': 'beratung_von',
+    'Beratung_bis': 'beratung_bis',
+    'Aufsicht_Warteraum_1': 'aufsicht_warteraum_1',
+    'Aufsicht_Warteraum_2': 'aufsicht_warteraum_2',
+    'Aufsicht_Vorbereitungsraum': 'aufsicht_vorbereitungsraum',
+    'Fluraufsicht': 'fluraufsicht',
+    'Reserve': 'reserve',
+}
+
+# Fields holding a time of day, stored as minutes after midnight.
+TIME_FIELDS = {'Ankunft_in_Warteraum_1', 'Beginn_d_Vorbereitung', 'Ende_der_Vorbereitung',
+               'Beginn_Prüfung', 'Ende_Prüfung', 'Beratung_von', 'Beratung_bis'}
+
+
+def parse_minutes(text):
+    """
+    Converts a time such as "08:30:00" or "08:30" to minutes after midnight.
+
+    Args:
+        text (str): Time of day as written in the plan.
+
+    Returns:
+        int: Minutes after midnight, or None if `text` is not a time.
+    """
+    parts = text.strip().split(":")
+    if len(parts) not in (2, 3) or not all(part.isdigit() for part in parts):
+        return None
+    hours, minutes = int(parts[0]), int(parts[1])
+    if hours > 23 or minutes > 59:
+        return None
+    return hours * 60 + minutes
+
+
+def format_minutes(minutes):
+    """Formats minutes after midnight the way the parsed plan writes times ("08:30:00")."""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}:00"
+
+
+# (field, attribute, holds a time) for each standard field, in column order.
+_FIELD_SLOTS = [(field, attribute, field in TIME_FIELDS) for field, attribute in FIELD_ATTRIBUTES.items()]
+
+# Shared objects for repeated values: the stored form of each time text, and each
+# field order seen with the fields beyond the standard columns it has.
+_times = {}
+_layouts = {}
+
+
+def _compact(value):
+    """Interns strings; other values (numbers, None, ...) are kept as they are."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _compact_time(text):
+    """Stores a time as minutes when that round-trips exactly, otherwise keeps the text."""
+    value = _times.get(text)
+    if value is None:
+        minutes = parse_minutes(text)
+        value = minutes if minutes is not None and format_minutes(minutes) == text else sys.intern(text)
+        _times[text] = value
+    return value
+
+
+def _layout(details):
+    """Returns the shared field order of `details` and its fields beyond the standard columns."""
+    fields = tuple(details)
+    layout = _layouts.get(fields)
+    if layout is None:
+        layout = _layouts[fields] = (fields, tuple(field for field in fields if field not in FIELD_ATTRIBUTES))
+    return layout
+
+
+class ExamSlot:
+    """
+    One exam slot of the schedule.
+
+    Strings (names, rooms, days, subjects) are interned so repeated values are
+    stored once, and times are stored as integer minutes. Fields the slot does
+    not have are None; `fields` records which fields it has, in their order.
+    """
+
+    __slots__ = ('day', 'room', 'slot_id', 'fields', 'extra') + tuple(FIELD_ATTRIBUTES.values())
+
+    def __init__(self, day, room, slot_id, details):
+        """
+        Args:
+            day (str): Date string.
+            room (str): Room name such as "Room A".
+            slot_id (str): Slot ID such as "DiA11".
+            details (dict): The slot's fields, as in the parsed plan.
+        """
+        self.day = _compact(day)
+        self.room = _compact(room)
+        self.slot_id = _compact(slot_id)
+        self.fields, extra_fields = _layout(details)
+
+        # Fields beyond the standard columns, and times that are not text, are kept as they are.
+        extra = {field: details[field] for field in extra_fields}
+        get = details.get
+        for field, attribute, is_time in _FIELD_SLOTS:
+            value = get(field)
+            if type(value) is str:
+                value = _compact_time(value) if is_time else sys.intern(value)
+            elif is_time and value is not None:
+                extra[field] = value
+                value = None
+            setattr(self, attribute, value)
+        self.extra = extra or None
+
+    def minutes(self, field):
+        """Returns a time field in minutes after midnight, or None if it is empty or not a time."""
+        value = getattr(self, FIELD_ATTRIBUTES[field])
+        if type(value) is int:
+            return value
+        return parse_minutes(value) if value else None
+
+    def to_dict(self):
+        """Returns the slot's fields in the parsed plan's dict shape."""
+        details = {}
+        extra = self.extra or {}
+        for field in self.fields:
+            if field in extra:
+                details[field] = extra[field]
+                continue
+            value = getattr(self, FIELD_ATTRIBUTES[field])
+            details[field] = format_minutes(value) if type(value) is int and field in TIME_FIELDS else value
+        return details
+
+
+class Schedule:
+    """
+    Compact in-memory schedule: a flat list of `ExamSlot` records in plan order
+    plus a (day, room, slot_id) lookup.
+
+    Adapters convert to and from the `date -> room -> slot -> dict` shape used by
+    the parser, the solver and the JSON files.
+    """
+
+    __slots__ = ('slots', '_by_key')
+
+    def __init__(self, slots=()):
+        self.slots = list(slots)
+        self._by_key = {(slot.day, slot.room, slot.slot_id): slot for slot in self.slots}
+
+    @classmethod
+    def from_dict(cls, schedule_data):
+        """Builds a Schedule from a `date -> room -> slot -> dict` structure."""
+        return cls(
+            ExamSlot(day, room, slot_id, details)
+            for day, rooms in schedule_data.items()
+            for room, slots in rooms.items()
+            for slot_id, details in slots.items()
+        )
+
+    @classmethod
+    def from_json(cls, path):
+        """Loads a schedule JSON file such as zeit.json or final_schedule.json."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self):
+        """Returns the schedule as a `date -> room -> slot -> dict` structure."""
+        schedule_data = {}
+        for slot in self.slots:
+            schedule_data.setdefault(slot.day, {}).setdefault(slot.room, {})[slot.slot_id] = slot.to_dict()
+        return schedule_data
+
+    def to_json(self, path):
+        """Writes the schedule in the same JSON shape as final_schedule.json."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=4)
+
+    def column(self, field):
+        """Returns one field of every slot, in plan order (None where a slot lacks it)."""
+        return list(map(attrgetter(FIELD_ATTRIBUTES[field]), self.slots))
+
+    def times(self, field):
+        """Returns a time field of every slot in minutes after midnight, in plan order (None where there is no time)."""
+        return [
+            value if type(value) is int else slot.minutes(field)
+            for slot, value in zip(self.slots, self.column(field))
+        ]
+
+    def get(self, day, room, slot_id):
+        """Returns the slot, or None."""
+        return self._by_key.get((day, room, slot_id))
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __iter__(self):
+        return iter(self.slots)
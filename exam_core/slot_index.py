@@ -0,0 +1,141 @@
+class SlotIndex:
+    """
+    Index over the ordered slot groups used by the scheduler.
+
+    Slot groups are kept in the solver's "early as possible" order (day, room, time).
+    Because that order is sorted by day first, every day occupies one contiguous
+    range of positions. Used groups are skipped with a path-compressed "next free"
+    pointer, so looking up the next free group never rescans groups that are
+    already taken, and per-day free counters answer "does day D still have k free
+    groups" in constant time.
+    """
+
+    def __init__(self, slot_groups):
+        """
+        Args:
+            slot_groups (list): Ordered slot group dicts with "day", "room", "slots" and "used" keys.
+                Each group gets a "position" key recording its place in the order.
+        """
+        self.slot_groups = slot_groups
+        # _next[i] points at a position >= i that may be free; len(slot_groups) is the end sentinel.
+        self._next = list(range(len(slot_groups) + 1))
+        self.day_ranges = {}
+        self.free_per_day = {}
+        self.free_total = 0
+        # Counters for instrumentation
+        self.groups_scanned = 0
+        self.fallback_searches = 0
+
+        for position, slot_group in enumerate(slot_groups):
+            slot_group["position"] = position
+            day = slot_group["day"]
+            start, _ = self.day_ranges.get(day, (position, position))
+            self.day_ranges[day] = (start, position + 1)
+            self.free_per_day.setdefault(day, 0)
+            if slot_group["used"]:
+                self._next[position] = position + 1
+            else:
+                self.free_per_day[day] += 1
+                self.free_total += 1
+
+    def _find_free(self, position):
+        """Returns the first free position at or after `position` (or the end sentinel)."""
+        root = position
+        while self._next[root] != root:
+            root = self._next[root]
+        # Path compression: point every visited position directly at the result.
+        while self._next[position] != root:
+            self._next[position], position = root, self._next[position]
+        return root
+
+    def free_groups(self, count, day=None, accept=None):
+        """
+        Returns the first `count` free slot groups in schedule order.
+
+        Args:
+            count (int): Number of slot groups needed.
+            day (str, optional): Restrict the search to this day.
+            accept (callable, optional): `accept(slot_group, found)` is asked about each free
+                group, with the groups chosen so far; groups it rejects are skipped.
+
+        Returns:
+            list: The slot groups found, or an empty list if fewer than `count` are free.
+        """
+        if day is None:
+            if self.free_total < count:
+                return []
+            start, end = 0, len(self.slot_groups)
+        else:
+            # Also covers days that are not in the plan (e.g. a missing fixed day)
+            if self.free_per_day.get(day, 0) < count or day not in self.day_ranges:
+                return []
+            start, end = self.day_ranges[day]
+
+        found = []
+        position = self._find_free(start)
+        while len(found) < count and position < end:
+            self.groups_scanned += 1
+            if accept is None or accept(self.slot_groups[position], found):
+                found.append(self.slot_groups[position])
+            position = self._find_free(position + 1)
+        return found if len(found) == count else []
+
+    def next_free_groups(self, count, preferred_day=None, accept=None):
+        """
+        Returns `count` free slot groups, preferring a single day.
+
+        Mirrors the scheduler's placement rule: take the earliest free groups on
+        `preferred_day` if that day has enough room, otherwise the earliest free
+        groups anywhere in the schedule.
+
+        Args:
+            count (int): Number of slot groups needed.
+            preferred_day (str, optional): Day to try first.
+            accept (callable, optional): Filter passed on to `free_groups`.
+
+        Returns:
+            list: The slot groups found, or an empty list if there are not enough free groups.
+        """
+        if preferred_day:
+            found = self.free_groups(count, day=preferred_day, accept=accept)
+            if found:
+                return found
+            self.fallback_searches += 1
+        return self.free_groups(count, accept=accept)
+
+    def mark_used(self, slot_group):
+        """Marks a slot group as used and removes it from the free lists."""
+        if slot_group["used"]:
+            return
+        slot_group["used"] = True
+        position = slot_group["position"]
+        self._next[position] = position + 1
+        self.free_per_day[slot_group["day"]] -= 1
+        self.free_total -= 1
+
+    def exclude(self, slot_group):
+        """
+        Removes a free slot group from the free lists without marking it as used,
+        e.g. because its examiners can no longer take any exam there.
+        """
+        position = slot_group["position"]
+        if slot_group["used"] or self._next[position] != position:
+            return
+        self._next[position] = position + 1
+        self.free_per_day[slot_group["day"]] -= 1
+        self.free_total -= 1
+
+    def mark_free(self, slot_group):
+        """Returns a used slot group to the free lists."""
+        if not slot_group["used"]:
+            return
+        slot_group["used"] = False
+        position = slot_group["position"]
+        self._next[position] = position
+        # Used or excluded groups just before this one may have been compressed to point past it.
+        previous = position - 1
+        while previous >= 0 and self._next[previous] != previous:
+            self._next[previous] = position
+            previous -= 1
+        self.free_per_day[slot_group["day"]] += 1
+        self.free_total += 1
@@ -0,0 +1,476 @@
+import copy
+import heapq
+from collections import defaultdict
+
+from exam_core.availability import build_availability, group_key
+from exam_core.background_jobs import NO_PROGRESS, PipelineCancelled
+from exam_core.instrumentation import NO_INSTRUMENTATION
+from exam_core.slot_index import SlotIndex
+
+# Subjects that must be examined on a given day.
+FIXED_SUBJECTS = {"Informatik": "24.06.2025", "Philosophie": "24.06.2025"}
+
+
+def build_slot_groups(schedule_data):
+    """
+    Creates a comprehensive, ordered list of all available slot groups.
+
+    This respects the "early as possible" rule by sorting by day, room, and time.
+
+    Args:
+        schedule_data (dict): A dictionary representing the available exam schedule.
+
+    Returns:
+        list: Slot group dicts with "day", "room", "slots" and "used" keys.
+    """
+    available_slot_groups = []
+    sorted_days = sorted(schedule_data.keys())
+    for day in sorted_days:
+        sorted_rooms = sorted(schedule_data[day].keys())
+        for room in sorted_rooms:
+            # Sort slots to ensure chronological order (e.g., DiA11, DiA12, ..., DiA21)
+            slots_in_room = sorted(schedule_data[day][room].keys())
+            # A "slot group" is a block of 3 exams.
+            for i in range(0, len(slots_in_room), 3):
+                group_keys = slots_in_room[i:i + 3]
+                if len(group_keys) == 3:
+                    available_slot_groups.append({
+                        "day": day,
+                        "room": room,
+                        "slots": group_keys,
+                        "used": False
+                    })
+    return available_slot_groups
+
+
+def build_conflict_graph(students_data):
+    """
+    Builds the student-subject conflict graph.
+
+    Two subjects are neighbours if at least one student takes both of them.
+
+    Args:
+        students_data (dict): A dictionary mapping subjects to lists of student groups.
+
+    Returns:
+        dict: Subject -> set of neighbouring subjects.
+    """
+    student_to_subjects = defaultdict(list)
+    for subject, groups in students_data.items():
+        for group in groups:
+            for student_name in group:
+                student_to_subjects[student_name].append(subject)
+
+    conflict_graph = {subject: set() for subject in students_data}
+    for subjects in student_to_subjects.values():
+        for subject in subjects:
+            conflict_graph[subject].update(subjects)
+    for subject, neighbours in conflict_graph.items():
+        neighbours.discard(subject)
+    return conflict_graph
+
+
+def find_subject_components(students_data):
+    """
+    Splits the subjects into groups that share no students, using union-find.
+
+    Args:
+        students_data (dict): A dictionary mapping subjects to lists of student groups.
+
+    Returns:
+        list: Lists of subjects, each in the original subject order, ordered by their first subject.
+    """
+    parent = {subject: subject for subject in students_data}
+
+    def find(subject):
+        while parent[subject] != subject:
+            parent[subject] = parent[parent[subject]]
+            subject = parent[subject]
+        return subject
+
+    first_subject_of_student = {}
+    for subject, groups in students_data.items():
+        for group in groups:
+            for student_name in group:
+                other = first_subject_of_student.setdefault(student_name, subject)
+                root_a, root_b = find(subject), find(other)
+                if root_a != root_b:
+                    parent[root_b] = root_a
+
+    components = {}
+    for subject in students_data:
+        components.setdefault(find(subject), []).append(subject)
+    return list(components.values())
+
+
+def assign_subject(schedule_data, subject, groups_to_schedule, slots_found, slot_index, preferred_day=None):
+    """
+    Writes a subject's student groups into the given slot groups.
+
+    Args:
+        schedule_data (dict): The exam schedule that receives the assignments.
+        subject (str): The subject being placed.
+        groups_to_schedule (list): The subject's student groups.
+        slots_found (list): One free slot group per student group.
+        slot_index (SlotIndex): Index that tracks which slot groups are used.
+        preferred_day (str, optional): Returned for a subject without groups, which takes no slots.
+
+    Returns:
+        str: The day of the first slot group.
+    """
+    # Assign the groups to the found slots
+    assigned_day = slots_found[0]["day"] if slots_found else preferred_day
+    for i, group_data in enumerate(groups_to_schedule):
+        current_slot_info = slots_found[i]
+        slot_keys = current_slot_info["slots"]
+        for j, student_name in enumerate(group_data):
+            slot_key = slot_keys[j]
+            vorname, nachname = student_name.split(" ", 1)
+
+            # Update the main schedule dictionary
+            schedule_data[current_slot_info["day"]][current_slot_info["room"]][slot_key].update({
+                "Nachname": nachname,
+                "Vorname": vorname,
+                "Fach": subject
+            })
+        # Mark this slot group as used for the next search
+        slot_index.mark_used(current_slot_info)
+
+    return assigned_day
+
+
+def score_schedule(students_data, schedule_data):
+    """
+    Scores a solved schedule; lower is better.
+
+    Args:
+        students_data (dict): A dictionary mapping subjects to lists of student groups.
+        schedule_data (dict): The solved exam schedule.
+
+    Returns:
+        tuple: (unplaced exams, days used, per-student day spread), where the spread
+        counts every extra day a student has to come in beyond the first.
+    """
+    total_exams = sum(len(group) for groups in students_data.values() for group in groups)
+    scheduled_exams = 0
+    days_used = set()
+    student_days = defaultdict(set)
+    for day, rooms in schedule_data.items():
+        for slots in rooms.values():
+            for details in slots.values():
+                if details.get("Fach") in students_data:
+                    scheduled_exams += 1
+                    days_used.add(day)
+                    student_days[f"{details['Vorname']} {details['Nachname']}"].add(day)
+    spread = sum(len(days) - 1 for days in student_days.values())
+    return total_exams - scheduled_exams, len(days_used), spread
+
+
+def schedule_subjects(students_data, schedule_data, available_slot_groups, student_day_constraints=None,
+                      stats=None, availability=None, progress=None):
+    """
+    Runs the greedy placement over a prepared list of slot groups.
+
+    Args:
+        students_data (dict): A dictionary mapping subjects to lists of student groups.
+        schedule_data (dict): The exam schedule that receives the assignments.
+        available_slot_groups (list): Ordered slot groups, as built by `build_slot_groups`.
+        student_day_constraints (dict, optional): Days already fixed for some students.
+        stats (Instrumentation, optional): Receives the solver counters.
+        availability (AvailabilityIndex, optional): When given, a slot group is only used if
+            its examiners and supervisors are free, and they are booked once it is used. It must
+            be built with `available_slot_groups` (see `availability.build_availability`).
+        progress (optional): Told about every placed subject as stage "solve". Once it is
+            cancelled, placement stops with PipelineCancelled; the subjects placed so far
+            stay in `schedule_data`.
+
+    Returns:
+        list: Subjects that could not be placed.
+    """
+    stats = stats if stats is not None else NO_INSTRUMENTATION
+    progress = progress if progress is not None else NO_PROGRESS
+
+    # Index the slot groups so each lookup jumps straight to the next free group
+    # instead of rescanning the whole list.
+    slot_index = SlotIndex(available_slot_groups)
+    unplaced_subjects = []
+
+    # --- Helper function to find and assign a subject ---
+    def find_and_assign(subject, preferred_day=None):
+        """Finds available slots and assigns a subject's groups to them."""
+        groups_to_schedule = students_data[subject]
+
+        accept = None
+        if availability is not None:
+            # Exam counts of the groups chosen so far in the current search
+            pending = {"found": None, "groups": None, "added": 0}
+
+            def accept(slot_group, found):
+                """Accepts a slot group if its people are free, also given the groups already chosen."""
+                if found is not pending["found"]:
+                    pending.update(found=found, groups={}, added=0)
+                for i in range(pending["added"], len(found)):
+                    pending["groups"][group_key(found[i])] = len(groups_to_schedule[i])
+                pending["added"] = len(found)
+
+                key = group_key(slot_group)
+                exam_count = len(groups_to_schedule[len(found)])
+                if availability.group_fits(key, exam_count, pending["groups"]):
+                    return True
+                stats.count("availability_rejections")
+                if availability.ruled_out(key):
+                    # Its people are booked elsewhere for good, so later searches need not visit it again
+                    slot_index.exclude(slot_group)
+                return False
+
+        # Take the earliest free slot groups on the preferred day, falling back to the
+        # earliest free groups anywhere if that day is full but other days are available.
+        slots_found = slot_index.next_free_groups(len(groups_to_schedule), preferred_day, accept=accept)
+
+        if len(slots_found) < len(groups_to_schedule):
+            print(f"!!! Warning: Could not find enough slots for {subject}")
+            unplaced_subjects.append(subject)
+            return None
+
+        if availability is not None:
+            for i, slot_group in enumerate(slots_found):
+                availability.book_group(group_key(slot_group), len(groups_to_schedule[i]))
+        return assign_subject(schedule_data, subject, groups_to_schedule, slots_found, slot_index, preferred_day)
+
+    # --- Main Scheduling Logic ---
+
+    subjects_to_schedule = list(students_data.keys())
+    subject_order = {subject: i for i, subject in enumerate(subjects_to_schedule)}
+    conflict_graph = build_conflict_graph(students_data)
+    scheduled_subjects = set()
+    if student_day_constraints is None:
+        student_day_constraints = {}
+
+    # Unscheduled subjects that may have a constrained student, keyed by their original order.
+    # A subject's constraints only change when one of its neighbours is scheduled, so the
+    # frontier replaces rescanning every subject after each placement.
+    constrained_frontier = [
+        (subject_order[subject], subject) for subject in subjects_to_schedule
+        if any(student in student_day_constraints for group in students_data[subject] for student in group)
+    ]
+    heapq.heapify(constrained_frontier)
+    in_frontier = {subject for _, subject in constrained_frontier}
+
+    def constrained_day_of(subject):
+        """Returns the day of the first group whose first constrained student has one."""
+        constrained_day = None
+        for group in students_data[subject]:
+            for student in group:
+                if student in student_day_constraints:
+                    constrained_day = student_day_constraints[student]
+                    break
+            if constrained_day:
+                break
+        return constrained_day
+
+    def schedule(subject, preferred_day=None):
+        """Places a subject and propagates its day to its students and neighbours."""
+        if progress.cancelled():
+            raise PipelineCancelled(f"Cancelled after placing {len(scheduled_subjects)} subjects")
+        assigned_day = find_and_assign(subject, preferred_day=preferred_day)
+        scheduled_subjects.add(subject)
+        progress.update("solve", len(scheduled_subjects), len(subjects_to_schedule))
+        for group in students_data[subject]:
+            for student in group:
+                student_day_constraints[student] = assigned_day
+            stats.count("constraint_propagations", len(group))
+        for neighbour in conflict_graph[subject]:
+            if neighbour not in scheduled_subjects and neighbour not in in_frontier:
+                heapq.heappush(constrained_frontier, (subject_order[neighbour], neighbour))
+                in_frontier.add(neighbour)
+
+    # Start with the fixed subjects
+    for subject, day in FIXED_SUBJECTS.items():
+        if subject in subjects_to_schedule:
+            schedule(subject, preferred_day=day)
+
+    # Schedule remaining subjects based on propagating constraints
+    next_unscheduled = 0
+    while len(scheduled_subjects) < len(subjects_to_schedule):
+        stats.count("placement_rounds")
+        # First: the earliest subject (in the original order) that is now constrained
+        while constrained_frontier:
+            _, subject = heapq.heappop(constrained_frontier)
+            in_frontier.discard(subject)
+            if subject in scheduled_subjects:
+                continue
+            constrained_day = constrained_day_of(subject)
+            if constrained_day:
+                schedule(subject, preferred_day=constrained_day)
+                break
+        else:
+            # Otherwise: if no subjects are constrained, schedule the next available one
+            while subjects_to_schedule[next_unscheduled] in scheduled_subjects:
+                next_unscheduled += 1
+            schedule(subjects_to_schedule[next_unscheduled])
+
+    stats.count("slot_groups_scanned", slot_index.groups_scanned)
+    stats.count("fallback_searches", slot_index.fallback_searches)
+    stats.count("unplaced_subjects", len(unplaced_subjects))
+    stats.count("unplaced_exams", sum(len(group) for subject in unplaced_subjects for group in students_data[subject]))
+    return unplaced_subjects
+
+
+def solve_exam_schedule(students_data, schedule_data, stats=None, check_people=False, unavailability=None,
+                        progress=None):
+    """
+    Assigns students to exam slots based on a set of constraints.
+
+    Args:
+        students_data (dict): A dictionary mapping subjects to lists of student groups.
+        schedule_data (dict): A dictionary representing the available exam schedule.
+        stats (Instrumentation, optional): Receives the "solve" stage time and solver counters.
+        check_people (bool): Never book an examiner or supervisor into two overlapping exams.
+        unavailability (dict, optional): Times people cannot work (see `availability.build_availability`);
+            implies `check_people`.
+        progress (optional): Progress reporter and cancellation check (see `schedule_subjects`).
+
+    Returns:
+        dict: The schedule_data dictionary populated with student assignments.
+    """
+    stats = stats if stats is not None else NO_INSTRUMENTATION
+    with stats.stage("solve"):
+        slot_groups = build_slot_groups(schedule_data)
+        availability = None
+        if check_people or unavailability:
+            availability = build_availability(schedule_data, unavailability, slot_groups)
+        schedule_subjects(students_data, schedule_data, slot_groups, stats=stats, availability=availability,
+                          progress=progress)
+    return schedule_data
+
+
+def _solve_component(students_data, sub_schedule):
+    """Solves one component on its share of the schedule (runs in a worker process)."""
+    slot_groups = build_slot_groups(sub_schedule)
+    student_day_constraints = {}
+    unplaced_subjects = schedule_subjects(students_data, sub_schedule, slot_groups, student_day_constraints)
+    used_groups = [(group["day"], group["room"], group["slots"][0]) for group in slot_groups if group["used"]]
+    return sub_schedule, unplaced_subjects, used_groups, student_day_constraints
+
+
+def solve_exam_schedule_parallel(students_data, schedule_data, max_workers=None, stats=None):
+    """
+    Assigns students to exam slots, solving independent groups of subjects concurrently.
+
+    Subjects that share no students are split into components. Each component
+    gets its own contiguous share of the earliest free slot groups (components with
+    a fixed subject start on that subject's day) and is solved in a process pool.
+    The merge step copies the results back in component order and then places any
+    subject that did not fit its share into the slot groups left over, so the
+    result is deterministic for a given input. Placements can differ from
+    `solve_exam_schedule`, which interleaves all subjects in one pass. If some
+    subjects still do not fit, the plan is also solved with `solve_exam_schedule`
+    and the better schedule is kept, so no more exams stay unplaced than there.
+
+    Args:
+        students_data (dict): A dictionary mapping subjects to lists of student groups.
+        schedule_data (dict): A dictionary representing the available exam schedule.
+        max_workers (int, optional): Number of worker processes. Defaults to the CPU count.
+        stats (Instrumentation, optional): Receives the "solve" stage time and the
+            "sequential_fallbacks" counter.
+
+    Returns:
+        dict: The schedule_data dictionary populated with student assignments.
+    """
+    stats = stats if stats is not None else NO_INSTRUMENTATION
+    with stats.stage("solve"):
+        unplaced_subjects, original = _solve_components(students_data, schedule_data, max_workers)
+        if unplaced_subjects:
+            # Splitting the plan into shares can strand subjects that one sequential pass places
+            sequential = solve_exam_schedule(students_data, original)
+            if score_schedule(students_data, sequential) < score_schedule(students_data, schedule_data):
+                stats.count("sequential_fallbacks")
+                schedule_data.clear()
+                schedule_data.update(sequential)
+    return schedule_data
+
+
+def _solve_components(students_data, schedule_data, max_workers):
+    """
+    Solves the components of `solve_exam_schedule_parallel` and merges them into `schedule_data`.
+
+    Returns:
+        tuple: (subjects still unplaced, copy of the plan from before the merge or
+        None if every component fitted its share)
+    """
+    components = find_subject_components(students_data)
+    slot_groups = build_slot_groups(schedule_data)
+    allocation_index = SlotIndex(slot_groups)
+
+    # Components with a fixed subject pick first, starting on the fixed day.
+    fixed_days = [
+        next((FIXED_SUBJECTS[subject] for subject in component if subject in FIXED_SUBJECTS), None)
+        for component in components
+    ]
+    allocation_order = sorted(range(len(components)), key=lambda i: fixed_days[i] is None)
+
+    shares = [[] for _ in components]
+    for i in allocation_order:
+        demand = sum(len(students_data[subject]) for subject in components[i])
+        share = []
+        # A fixed day missing from the plan is skipped, as in `solve_exam_schedule`
+        if fixed_days[i] in allocation_index.day_ranges:
+            share = allocation_index.free_groups(
+                min(demand, allocation_index.free_per_day.get(fixed_days[i], 0)), day=fixed_days[i]
+            )
+            for slot_group in share:
+                allocation_index.mark_used(slot_group)
+        rest = allocation_index.free_groups(min(demand - len(share), allocation_index.free_total))
+        for slot_group in rest:
+            allocation_index.mark_used(slot_group)
+        shares[i] = share + rest
+
+    jobs = []
+    for component, share in zip(components, shares):
+        sub_schedule = {}
+        for slot_group in share:
+            room_slots = sub_schedule.setdefault(slot_group["day"], {}).setdefault(slot_group["room"], {})
+            for slot_key in slot_group["slots"]:
+                room_slots[slot_key] = dict(schedule_data[slot_group["day"]][slot_group["room"]][slot_key])
+        jobs.append(({subject: students_data[subject] for subject in component}, sub_schedule))
+
+    if max_workers == 1 or len(jobs) == 1:
+        results = [_solve_component(*job) for job in jobs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_solve_component, *zip(*jobs)))
+
+    # The plan before the merge, in case some subjects do not fit
+    original = copy.deepcopy(schedule_data) if any(result[1] for result in results) else None
+
+    # --- Deterministic merge, in component order ---
+    used_groups = set()
+    unplaced_subjects = []
+    student_day_constraints = {}
+    for sub_schedule, component_unplaced, component_used, component_days in results:
+        for day, rooms in sub_schedule.items():
+            for room, slots in rooms.items():
+                for slot_key, details in slots.items():
+                    schedule_data[day][room][slot_key].update(details)
+        used_groups.update(component_used)
+        unplaced_subjects.extend(component_unplaced)
+        student_day_constraints.update(
+            (student, day) for student, day in component_days.items() if day is not None
+        )
+
+    if unplaced_subjects:
+        # Retry the leftovers on every slot group no component used, keeping their
+        # students on the days they already have.
+        for slot_group in slot_groups:
+            slot_group["used"] = (slot_group["day"], slot_group["room"], slot_group["slots"][0]) in used_groups
+        unplaced_subjects = schedule_subjects(
+            {subject: students_data[subject] for subject in unplaced_subjects},
+            schedule_data,
+            slot_groups,
+            student_day_constraints,
+        )
+
+    return unplaced_subjects, original
+
@@ -1,59 +1,320 @@
 import pandas as pd
+import numpy as np
+from openpyxl import load_workbook
+import csv
+import io
 import os
 import re
+import zipfile
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from xml.etree import ElementTree
 import json
 
-def process_excel_to_csv_and_dict(excel_file_path='zeit.xlsx'):
+from exam_core.background_jobs import NO_PROGRESS, PipelineCancelled
+from exam_core.instrumentation import NO_INSTRUMENTATION
+from exam_core.schedule_model import ROOM_FIELDS
+
+# Slot IDs such as DiA11 or MoB21: weekday, room letter, two digits.
+STUDENT_ID_PATTERN = r'(Mo|Di|Mi|Do|Fr|Sa|So)[A-Z]\d{2}'
+
+def process_excel_to_csv_and_dict(excel_file_path='zeit.xlsx', vectorized=True, streaming=False, export_csv=True,
+                                  stats=None, progress=None, parallel=False, max_workers=None):
     """
     Process Excel file with multiple sheets to CSV files and create a unified dictionary.
     
     Args:
         excel_file_path (str): Path to the Excel file
+        vectorized (bool): Parse each sheet column-wise with `extract_date_and_rooms_frame`
+            instead of row by row. Both produce the same dictionary.
+        streaming (bool): Read the workbook sheet by sheet with `iter_excel_days`
+            instead of loading every sheet into a DataFrame first.
+        export_csv (bool): Also write the per-room CSV files to csv_output/.
+            Turn off when the files are not needed (e.g. in the app, which offers
+            `build_csv_zip` as a download instead).
+        stats (Instrumentation, optional): Receives the "excel_read", "sheet_parse"
+            and "csv_write" stage times and the "sheets" counter.
+        progress (optional): Told about every parsed sheet as stage "parse"; parsing
+            stops with PipelineCancelled before reading the next sheet once it is cancelled.
+        parallel (bool): Parse the sheets in a process pool with `parse_sheets_parallel`.
+            Sheets that fail to parse are reported and skipped instead of aborting.
+        max_workers (int, optional): Worker processes for `parallel`. Defaults to the CPU count.
     
     Returns:
         dict: Unified dictionary with date -> room -> student data structure
     """
     
-    # Read all sheets from Excel file
-    excel_data = pd.read_excel(excel_file_path, sheet_name=None, header=None)
+    stats = stats if stats is not None else NO_INSTRUMENTATION
+    progress = progress if progress is not None else NO_PROGRESS
+
+    if parallel:
+        unified_dict, errors = parse_sheets_parallel(
+            excel_file_path, max_workers=max_workers, export_csv=export_csv, stats=stats, progress=progress
+        )
+        for sheet_name, error in errors.items():
+            print(f"!!! Warning: Could not parse sheet {sheet_name}: {error}")
+        return unified_dict
+
+    if streaming:
+        return dict(iter_excel_days(excel_file_path, export_csv=export_csv, stats=stats, progress=progress))
+
+    # Open the workbook and read it one sheet at a time, so a cancelled run stops
+    # before reading the next sheet instead of after loading all of them
+    with stats.stage("excel_read"):
+        workbook = pd.ExcelFile(excel_file_path)
     
     # Main dictionary to store all data
     unified_dict = {}
     
     # Process each sheet
-    for sheet_name, df in excel_data.items():
-        print(f"Processing sheet: {sheet_name}")
-        
-        # Convert DataFrame to list of lists for easier processing
-        data = df.values.tolist()
+    with workbook:
+        sheet_names = workbook.sheet_names
+        for sheet_number, sheet_name in enumerate(sheet_names):
+            if progress.cancelled():
+                raise PipelineCancelled(f"Cancelled before sheet {sheet_name}")
+            print(f"Processing sheet: {sheet_name}")
+            stats.count("sheets")
 
-        #print(data)
-        
-        # Extract date and process rooms
-        date, room_data = extract_date_and_rooms(data)
+            with stats.stage("excel_read"):
+                df = workbook.parse(sheet_name, header=None)
 
-        #print(f"Extracted date: {date}, room data found: {room_data} ")
-        
-        if date:
-            unified_dict[date] = room_data
-            
-            # Create CSV files for each room
-            create_csv_files(date, room_data)
+            with stats.stage("sheet_parse"):
+                if vectorized:
+                    date, room_data = extract_date_and_rooms_frame(df)
+                else:
+                    # Convert DataFrame to list of lists for easier processing
+                    data = df.values.tolist()
+
+                    # Extract date and process rooms
+                    date, room_data = extract_date_and_rooms(data)
+
+            #print(f"Extracted date: {date}, room data found: {room_data} ")
+
+            if date:
+                unified_dict[date] = room_data
+            progress.update("parse", sheet_number + 1, len(sheet_names))
+    
+    # Create CSV files for each room, as a separate stage
+    if export_csv:
+        with stats.stage("csv_write"):
+            export_csv_files(unified_dict)
     
     return unified_dict
 
+def workbook_sheet_names(excel_source):
+    """
+    List the sheet names of a workbook without loading it.
+
+    For .xlsx files only xl/workbook.xml is read, which is much faster than
+    opening the workbook (that parses every shared string and style).
+
+    Args:
+        excel_source (str or bytes): Path to the Excel file, or its contents
+
+    Returns:
+        list: Sheet names in workbook order
+    """
+    source = io.BytesIO(excel_source) if isinstance(excel_source, bytes) else excel_source
+    if not zipfile.is_zipfile(source):
+        # Old .xls files: let pandas find the sheets
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        with pd.ExcelFile(source) as workbook:
+            return workbook.sheet_names
+    with zipfile.ZipFile(source) as archive:
+        root = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+    return [element.get('name') for element in root.iter() if element.tag.rsplit('}', 1)[-1] == 'sheet']
+
+def _parse_sheets(excel_source, sheet_names):
+    """
+    Open the workbook once and parse the given sheets; runs in a worker process.
+
+    Each sheet is read with `pd.ExcelFile.parse` and parsed with
+    `extract_date_and_rooms_frame`, so cell values are converted exactly as in
+    the sequential parser.
+
+    Returns:
+        list: One (date_string, room_dict, error) tuple per sheet, where error is None on success
+    """
+    source = io.BytesIO(excel_source) if isinstance(excel_source, bytes) else excel_source
+    results = []
+    with pd.ExcelFile(source) as workbook:
+        for sheet_name in sheet_names:
+            try:
+                date, room_data = extract_date_and_rooms_frame(workbook.parse(sheet_name, header=None))
+                results.append((date, room_data, None))
+            except Exception as e:
+                results.append((None, None, f"{type(e).__name__}: {e}"))
+    return results
+
+def parse_sheets_parallel(excel_file_path, max_workers=None, export_csv=True, stats=None, progress=None):
+    """
+    Parse the sheets of a workbook in a process pool.
+
+    The sheets are split into one contiguous share per worker. Each worker opens
+    the workbook once and parses only its own sheets, the same way as the
+    sequential parser. Results are merged in sheet order, so the dictionary is
+    the one the sequential parser builds: a later sheet for the same date
+    replaces the earlier one's rooms but keeps its position. With `export_csv`
+    the CSV files are then written from the merged dictionary, so sheets with the
+    same date cannot overwrite each other's files. A sheet that cannot be read or
+    parsed is reported and does not stop the others.
+
+    Args:
+        excel_file_path (str): Path to the Excel file (or a binary file object)
+        max_workers (int, optional): Worker processes. Defaults to the CPU count.
+        export_csv (bool): Also write the per-room CSV files to csv_output/
+        stats (Instrumentation, optional): Receives the "sheet_parse" stage time
+            (the whole parallel run), the "csv_write" stage time and the "sheets"
+            and "sheet_errors" counters
+        progress (optional): Told about finished sheets as stage "parse" whenever a
+            worker's share is done; checked for cancellation at the same points
+
+    Returns:
+        tuple: (unified_dict, errors), where errors maps sheet names to messages
+    """
+    stats = stats if stats is not None else NO_INSTRUMENTATION
+    progress = progress if progress is not None else NO_PROGRESS
+
+    # Workers get the path, or the file's bytes when it was uploaded.
+    excel_source = excel_file_path
+    if hasattr(excel_source, 'read'):
+        if hasattr(excel_source, 'seek'):
+            excel_source.seek(0)
+        excel_source = excel_source.read()
+    sheet_names = workbook_sheet_names(excel_source)
+
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(sheet_names)))
+    share_size = -(-len(sheet_names) // workers)
+    shares = [list(range(start, min(start + share_size, len(sheet_names))))
+              for start in range(0, len(sheet_names), share_size)]
+
+    parsed = {}
+    errors = {}
+    finished = 0
+    with stats.stage("sheet_parse"):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_parse_sheets, excel_source, [sheet_names[i] for i in share]): share
+                for share in shares
+            }
+            for future in as_completed(futures):
+                share = futures[future]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    # The workbook could not be opened, or the worker itself died
+                    results = [(None, None, f"{type(e).__name__}: {e}")] * len(share)
+                for sheet_number, (date, room_data, error) in zip(share, results):
+                    if error:
+                        errors[sheet_names[sheet_number]] = error
+                    elif date:
+                        parsed[sheet_number] = (date, room_data)
+                finished += len(share)
+                progress.update("parse", finished, len(sheet_names))
+                if progress.cancelled():
+                    for pending in futures:
+                        pending.cancel()
+                    raise PipelineCancelled(f"Cancelled after {finished} of {len(sheet_names)} sheets")
+
+    stats.count("sheets", len(sheet_names))
+    stats.count("sheet_errors", len(errors))
+
+    unified_dict = {}
+    for sheet_number in sorted(parsed):
+        date, room_data = parsed[sheet_number]
+        unified_dict[date] = room_data
+
+    if export_csv:
+        with stats.stage("csv_write"):
+            export_csv_files(unified_dict)
+    return unified_dict, errors
+
+def iter_sheet_rows(excel_file_path):
+    """
+    Stream the rows of every sheet with openpyxl's read-only mode.
+
+    Only the sheet being read is held in memory; no DataFrames are built. The
+    rows match what `pd.read_excel` reads: whole numbers stored as floats become
+    ints (1e20 -> 100000000000000000000), and every row is padded with None to
+    the width of the sheet's widest row, so a row without its trailing cells is
+    parsed like the others.
+
+    Args:
+        excel_file_path (str): Path to the Excel file (or a binary file object)
+
+    Yields:
+        tuple: (sheet_name, rows), where each row is a list of cell values
+    """
+    workbook = load_workbook(excel_file_path, read_only=True, data_only=True)
+    try:
+        for worksheet in workbook.worksheets:
+            # The size recorded in the file can be missing or wrong (e.g. in
+            # workbooks written by openpyxl's write-only mode)
+            worksheet.reset_dimensions()
+            rows = []
+            for row in worksheet.iter_rows(values_only=True):
+                row = [_excel_number(value) for value in row]
+                while row and row[-1] is None:
+                    row.pop()
+                rows.append(row)
+            width = max(map(len, rows), default=0)
+            yield worksheet.title, [row + [None] * (width - len(row)) for row in rows]
+    finally:
+        workbook.close()
+
+def _excel_number(value):
+    """Turns a float holding a whole number into an int, as pandas' openpyxl reader does."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def iter_excel_days(excel_file_path, export_csv=True, stats=None, progress=None):
+    """
+    Parse a workbook one sheet at a time, yielding each exam day as soon as it is read.
+
+    Args:
+        excel_file_path (str): Path to the Excel file (or a binary file object)
+        export_csv (bool): Also write each day's per-room CSV files
+        stats (Instrumentation, optional): Receives the "sheet_parse" (reading
+            included, since rows are streamed) and "csv_write" stage times
+        progress (optional): Told about every parsed sheet as stage "parse" (the
+            total is unknown while streaming); checked for cancellation between sheets
+
+    Yields:
+        tuple: (date_string, room_dict) for every sheet with a room header
+    """
+    stats = stats if stats is not None else NO_INSTRUMENTATION
+    progress = progress if progress is not None else NO_PROGRESS
+
+    for sheet_number, (sheet_name, rows) in enumerate(iter_sheet_rows(excel_file_path)):
+        if progress.cancelled():
+            raise PipelineCancelled(f"Cancelled before sheet {sheet_name}")
+        print(f"Processing sheet: {sheet_name}")
+        stats.count("sheets")
+
+        # The rows go straight into the room/student state machine.
+        with stats.stage("sheet_parse"):
+            date, room_data = extract_date_and_rooms(rows)
+
+        if date:
+            if export_csv:
+                # Create CSV files for each room
+                with stats.stage("csv_write"):
+                    create_csv_files(date, room_data)
+            yield date, room_data
+        progress.update("parse", sheet_number + 1)
+
 def extract_date_and_rooms(data):
     """
     Extract date and room data from the sheet data.
     
     Args:
-        data (list): List of rows from the sheet
+        data (iterable): Rows from the sheet (a list, or a row iterator when streaming)
     
     Returns:
         tuple: (date_string, room_dict)
     """
-    
     date = None
     room_dict = {}
     current_room = None
@@ -78,7 +339,7 @@ def extract_date_and_rooms(data):
         
         # Check if it's a data row (has student ID pattern like DiA11, DiB21, etc.)
         #elif row and len(row) > 0 and pd.notna(row[0]) and re.match(r'Di[ABC]\d{2}', str(row[0])):
-        elif row and len(row) > 0 and pd.notna(row[0]) and re.match(r'(Mo|Di|Mi|Do|Fr|Sa|So)[A-Z]\d{2}', str(row[0])):
+        elif row and len(row) > 0 and pd.notna(row[0]) and re.match(STUDENT_ID_PATTERN, str(row[0])):
 
             room_data.append(row)
     
@@ -89,6 +350,79 @@ def extract_date_and_rooms(data):
     
     return date, room_dict
 
+def extract_date_and_rooms_frame(df):
+    """
+    Extract date and room data from a sheet, working column-wise.
+
+    Produces the same result as `extract_date_and_rooms(df.values.tolist())`: the
+    room headers and slot ID rows are found with vectorized string matching on
+    column 0, and the cells are converted to strings (NaN -> "") once per sheet.
+
+    Args:
+        df (pd.DataFrame): The sheet, read with header=None
+    
+    Returns:
+        tuple: (date_string, room_dict)
+    """
+    if df.shape[1] == 0:
+        return None, {}
+
+    first_column = df.iloc[:, 0]
+    present = first_column.notna()
+    labels = first_column.astype(object).where(present, "").astype(str)
+    is_header = labels.str.contains(": Raum", regex=False).to_numpy(dtype=bool)
+    is_data = (~is_header) & (present & labels.str.match(STUDENT_ID_PATTERN)).to_numpy(dtype=bool)
+
+    # One bulk NaN-to-empty and str conversion for every cell the slots use
+    cells = df.iloc[:, :len(ROOM_FIELDS) + 1].astype(object)
+    cells = cells.where(cells.notna(), "").astype(str).to_numpy(dtype=object)
+    if cells.shape[1] < len(ROOM_FIELDS) + 1:
+        padding = np.full((cells.shape[0], len(ROOM_FIELDS) + 1 - cells.shape[1]), "", dtype=object)
+        cells = np.hstack([cells, padding])
+    has_all_columns = df.shape[1] >= 15  # Ensure we have enough columns
+
+    def rooms_from(positions):
+        if not has_all_columns:
+            return {}
+        return {
+            row[0]: dict(zip(ROOM_FIELDS, row[1:]))
+            for row in cells[positions].tolist()
+            if row[0]
+        }
+
+    # Walk the (few) room headers; data rows in between are taken as slices.
+    date = None
+    room_dict = {}
+    current_room = None
+    pending = []
+    header_positions = np.flatnonzero(is_header)
+    data_positions = np.flatnonzero(is_data)
+    data_before = np.searchsorted(data_positions, header_positions)
+    consumed = 0
+
+    for header_position, split in zip(header_positions, data_before):
+        if split > consumed:
+            pending.append(data_positions[consumed:split])
+            consumed = split
+        # Save previous room data if exists
+        if current_room and pending:
+            room_dict[current_room] = rooms_from(np.concatenate(pending))
+            pending = []
+
+        # Extract date and room
+        parts = labels.iat[header_position].split(": Raum ")
+        if len(parts) == 2:
+            date = parts[0]
+            current_room = f"Room {parts[1]}"
+
+    if consumed < len(data_positions):
+        pending.append(data_positions[consumed:])
+    # Don't forget the last room
+    if current_room and pending:
+        room_dict[current_room] = rooms_from(np.concatenate(pending))
+
+    return date, room_dict
+
 def process_room_data(room_data):
     """
     Process room data into dictionary format.
@@ -99,7 +433,6 @@ def process_room_data(room_data):
     Returns:
         dict: Dictionary with student IDs as keys
     """
-    
     room_dict = {}
     
     for row in room_data:
@@ -131,66 +464,97 @@ def process_room_data(room_data):
     
     return room_dict
 
-def create_csv_files(date, room_data):
+# Header row of the per-room CSV files
+CSV_HEADERS = ['Nr.', 'Nachname', 'Vorname', 'Fach', 'Gäste', 'Prüfer*in', 'Protokoll', 'Vorsitz',
+               'Ankunft in Warteraum 1', 'Beginn d. Vorbereitung', 'Ende der Vorbereitung',
+               'Beginn Prüfung', 'Ende Prüfung', 'Beratung von', 'Beratung bis',
+               'Aufsicht Warteraum 1', 'Aufsicht Warteraum 2', 'Aufsicht Vorbereitungsraum',
+               'Fluraufsicht', 'Reserve']
+
+def room_csv_name(date, room_name):
+    """
+    Build the file name of a room's CSV file.
+
+    Args:
+        date (str): Date string
+        room_name (str): Room name such as "Room A"
+
+    Returns:
+        str: File name such as "23.06.2025_RoomA.csv"
+    """
+    room_letter = room_name.split()[-1]  # Get A, B, or C
+    return f"{date}_Room{room_letter}.csv"
+
+def write_room_csv(file, students):
+    """
+    Write one room's students as CSV in a single streaming csv.writer pass.
+
+    Args:
+        file: Text file object opened with newline=''
+        students (dict): Student ID -> student data for one room
+    """
+    writer = csv.writer(file, lineterminator='\n')
+    writer.writerow(CSV_HEADERS)
+    writer.writerows(
+        [student_id] + [student_info[field] for field in ROOM_FIELDS]
+        for student_id, student_info in students.items()
+    )
+
+def create_csv_files(date, room_data, output_dir='csv_output'):
     """
     Create CSV files for each room.
     
     Args:
         date (str): Date string
         room_data (dict): Dictionary containing room data
+        output_dir (str): Directory for the CSV files
     """
     
     # Create directory if it doesn't exist
-    os.makedirs('csv_output', exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
     
     for room_name, students in room_data.items():
-        # Create filename
-        room_letter = room_name.split()[-1]  # Get A, B, or C
-        filename = f"csv_output/{date}_Room{room_letter}.csv"
-        
-        # Prepare data for CSV
-        csv_data = []
-        
-        # Header row
-        headers = ['Nr.', 'Nachname', 'Vorname', 'Fach', 'Gäste', 'Prüfer*in', 'Protokoll', 'Vorsitz',
-                  'Ankunft in Warteraum 1', 'Beginn d. Vorbereitung', 'Ende der Vorbereitung',
-                  'Beginn Prüfung', 'Ende Prüfung', 'Beratung von', 'Beratung bis',
-                  'Aufsicht Warteraum 1', 'Aufsicht Warteraum 2', 'Aufsicht Vorbereitungsraum',
-                  'Fluraufsicht', 'Reserve']
-        
-        csv_data.append(headers)
-        
-        # Add student data
-        for student_id, student_info in students.items():
-            row = [
-                student_id,
-                student_info['Nachname'],
-                student_info['Vorname'],
-                student_info['Fach'],
-                student_info['Gäste'],
-                student_info['Prüfer*in'],
-                student_info['Protokoll'],
-                student_info['Vorsitz'],
-                student_info['Ankunft_in_Warteraum_1'],
-                student_info['Beginn_d_Vorbereitung'],
-                student_info['Ende_der_Vorbereitung'],
-                student_info['Beginn_Prüfung'],
-                student_info['Ende_Prüfung'],
-                student_info['Beratung_von'],
-                student_info['Beratung_bis'],
-                student_info['Aufsicht_Warteraum_1'],
-                student_info['Aufsicht_Warteraum_2'],
-                student_info['Aufsicht_Vorbereitungsraum'],
-                student_info['Fluraufsicht'],
-                student_info['Reserve']
-            ]
-            csv_data.append(row)
-        
-        # Write to CSV
-        df_csv = pd.DataFrame(csv_data)
-        df_csv.to_csv(filename, index=False, header=False)
+        filename = f"{output_dir}/{room_csv_name(date, room_name)}"
+        with open(filename, 'w', encoding='utf-8', newline='') as f:
+            write_room_csv(f, students)
         print(f"Created CSV file: {filename}")
 
+def export_csv_files(unified_dict, output_dir='csv_output', max_workers=4):
+    """
+    Write the per-room CSV files for every day through a thread pool.
+
+    Args:
+        unified_dict (dict): Date -> room -> student data
+        output_dir (str): Directory for the CSV files
+        max_workers (int): Number of writer threads
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(create_csv_files, date, room_data, output_dir)
+            for date, room_data in unified_dict.items()
+        ]
+        for future in futures:
+            future.result()
+
+def build_csv_zip(unified_dict):
+    """
+    Bundle the per-room CSV files into an in-memory ZIP archive, without touching the disk.
+
+    Args:
+        unified_dict (dict): Date -> room -> student data
+
+    Returns:
+        bytes: The ZIP archive
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for date, room_data in unified_dict.items():
+            for room_name, students in room_data.items():
+                text = io.StringIO(newline='')
+                write_room_csv(text, students)
+                archive.writestr(room_csv_name(date, room_name), text.getvalue().encode('utf-8'))
+    return buffer.getvalue()
+
 
 
 # # Main execution
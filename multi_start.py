@@ -0,0 +1,154 @@
+import contextlib
+import copy
+import io
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from exam_core.solver import score_schedule, solve_exam_schedule
+
+# Inputs shared by every run in a worker process, set once by `_init_worker`.
+_worker_students = None
+_worker_schedule = None
+
+
+def shuffled_students_data(students_data, seed):
+    """
+    Returns the students data with its subjects and student groups in a seeded random order.
+
+    Seed 0 keeps the original order, so run 0 is always the plain greedy schedule.
+
+    Args:
+        students_data (dict): A dictionary mapping subjects to lists of student groups.
+        seed (int): Seed for the ordering.
+
+    Returns:
+        dict: A reordered copy of students_data.
+    """
+    if seed == 0:
+        return dict(students_data)
+    rng = random.Random(seed)
+    subjects = list(students_data.keys())
+    rng.shuffle(subjects)
+    return {subject: rng.sample(students_data[subject], len(students_data[subject])) for subject in subjects}
+
+
+def run_ordering(students_data, schedule_data, seed):
+    """
+    Solves one seeded ordering with the greedy scheduler.
+
+    Args:
+        students_data (dict): A dictionary mapping subjects to lists of student groups.
+        schedule_data (dict): A dictionary representing the available exam schedule (not modified).
+        seed (int): Seed for the ordering.
+
+    Returns:
+        tuple: (score, schedule) for this ordering.
+    """
+    ordered_students = shuffled_students_data(students_data, seed)
+    # Each run would repeat the solver's warnings; only the score matters here.
+    with contextlib.redirect_stdout(io.StringIO()):
+        schedule = solve_exam_schedule(ordered_students, copy.deepcopy(schedule_data))
+    return score_schedule(students_data, schedule), schedule
+
+
+def _init_worker(students_data, schedule_data):
+    global _worker_students, _worker_schedule
+    _worker_students = students_data
+    _worker_schedule = schedule_data
+
+
+def _score_ordering(seed):
+    """Scores one ordering in a worker process; the schedule itself is rebuilt by the caller."""
+    score, _ = run_ordering(_worker_students, _worker_schedule, seed)
+    return score
+
+
+def ordering_seeds(seed, iterations):
+    """
+    Returns the ordering seed of every run: 0 for run 0, then `seed + 1`, `seed + 2`, ...
+
+    Seed 0 is only used once, so a negative base seed does not repeat run 0.
+    """
+    run_seeds = [0]
+    run_seed = seed
+    while len(run_seeds) < iterations:
+        run_seed += 1
+        if run_seed != 0:
+            run_seeds.append(run_seed)
+    return run_seeds
+
+
+def solve_exam_schedule_multistart(students_data, schedule_data, iterations=32, time_limit=None,
+                                   seed=0, max_workers=None):
+    """
+    Assigns students to exam slots by trying many randomized subject orderings.
+
+    Run i uses ordering seed `seed + i` (run 0 always uses the original order,
+    seed 0, so a base seed that would reach 0 again skips it), and each schedule
+    is scored by `score_schedule`: unplaced exams, then days used, then
+    per-student day spread. The best score wins, ties going to the lower run
+    number, so a run limited by `iterations` alone is reproducible regardless of
+    the worker count. With `time_limit`, runs still going at the deadline are
+    cancelled and ignored; only the winner is solved once more afterwards to
+    rebuild its schedule.
+
+    Args:
+        students_data (dict): A dictionary mapping subjects to lists of student groups.
+        schedule_data (dict): A dictionary representing the available exam schedule.
+        iterations (int): Maximum number of orderings to try.
+        time_limit (float, optional): Stop after this many seconds.
+        seed (int): Base seed for the orderings.
+        max_workers (int, optional): Number of worker processes. Defaults to the CPU count.
+
+    Returns:
+        dict: The schedule_data dictionary populated with the best assignments found.
+    """
+    deadline = time.monotonic() + time_limit if time_limit is not None else None
+    run_seeds = ordering_seeds(seed, iterations)
+    results = []
+
+    if max_workers == 1:
+        for run, run_seed in enumerate(run_seeds):
+            if run and deadline is not None and time.monotonic() > deadline:
+                break
+            score, _ = run_ordering(students_data, schedule_data, run_seed)
+            results.append((score, run))
+    else:
+        max_workers = max_workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                       initargs=(students_data, schedule_data))
+        try:
+            pending = {}
+            next_run = 0
+            while next_run < len(run_seeds) or pending:
+                # Keep every worker busy until the iteration or time limit is reached.
+                while (next_run < len(run_seeds) and len(pending) < 2 * max_workers
+                       and (next_run == 0 or deadline is None or time.monotonic() <= deadline)):
+                    pending[executor.submit(_score_ordering, run_seeds[next_run])] = next_run
+                    next_run += 1
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results.append((future.result(), pending.pop(future)))
+                if deadline is not None and time.monotonic() > deadline:
+                    # Runs still going at the deadline are not waited for.
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    if results:
+        best_score, best_run = min(results)
+        print(f"Multi-start: {len(results)} orderings tried, best is run {best_run} "
+              f"({best_score[0]} unplaced exams, {best_score[1]} days, spread {best_score[2]})")
+    else:
+        # Not even the plain greedy run finished in time; it is used as is.
+        best_run = 0
+        print("Multi-start: no ordering finished within the time limit, using the original order")
+
+    # Rebuild the winning schedule here rather than shipping every schedule back from the workers.
+    _, best_schedule = run_ordering(students_data, schedule_data, run_seeds[best_run])
+    schedule_data.clear()
+    schedule_data.update(best_schedule)
+    return schedule_data
@@ -0,0 +1,289 @@
+from collections import Counter
+
+from exam_core.instrumentation import NO_INSTRUMENTATION
+from exam_core.solver import FIXED_SUBJECTS, build_conflict_graph
+
+STRATEGIES = ('first_fit', 'best_fit')
+
+
+class CapacityError(ValueError):
+    """Raised when the schedule cannot possibly hold every exam; `problems` lists the reasons."""
+
+    def __init__(self, problems):
+        self.problems = problems
+        super().__init__("The exams cannot fit into the schedule:\n- " + "\n- ".join(problems))
+
+
+class RoomBin:
+    """
+    Free slots of one room on one day.
+
+    A student group of size k needs k consecutive free slots in one room, so the
+    bin tracks its free runs; placing a group takes slots from the start of a run,
+    and whatever is left stays available for smaller groups.
+    """
+
+    __slots__ = ('day', 'room', 'slot_keys', 'free', 'longest_run')
+
+    def __init__(self, day, room, slot_keys, free):
+        self.day = day
+        self.room = room
+        self.slot_keys = slot_keys
+        self.free = free
+        self.longest_run = 0
+        self._update()
+
+    def _update(self):
+        self.longest_run = max((length for _, length in self.runs()), default=0)
+
+    def runs(self):
+        """Returns the free runs as (start index, length) pairs, in slot order."""
+        runs = []
+        start = None
+        for i, is_free in enumerate(self.free + [False]):
+            if is_free and start is None:
+                start = i
+            elif not is_free and start is not None:
+                runs.append((start, i - start))
+                start = None
+        return runs
+
+    def take(self, start, size):
+        """Marks `size` slots from `start` as used."""
+        for i in range(start, start + size):
+            self.free[i] = False
+        self._update()
+
+    def release(self, start, size):
+        """Returns slots taken with `take` to the free runs."""
+        for i in range(start, start + size):
+            self.free[i] = True
+        self._update()
+
+
+def build_room_bins(schedule_data):
+    """
+    Creates one bin per day and room, covering every slot without a subject.
+
+    Unlike `build_slot_groups`, no slots are dropped when a room's count is not a
+    multiple of 3.
+
+    Returns:
+        dict: Day -> list of RoomBin, with days and rooms in the solver's sorted order.
+    """
+    bins = {}
+    for day in sorted(schedule_data.keys()):
+        bins[day] = []
+        for room in sorted(schedule_data[day].keys()):
+            slot_keys = sorted(schedule_data[day][room].keys())
+            free = [not schedule_data[day][room][slot_key].get("Fach") for slot_key in slot_keys]
+            bins[day].append(RoomBin(day, room, slot_keys, free))
+    return bins
+
+
+def check_capacity(students_data, bins, fixed_subjects=FIXED_SUBJECTS):
+    """
+    Fast lower-bound checks that every exam can be placed.
+
+    Checks the total number of free slots, that the largest group fits in some
+    room's longest free run, and, per fixed day, the slots and runs needed by the
+    subjects fixed to it. Fixed days that are not in the schedule are ignored.
+
+    Args:
+        students_data (dict): A dictionary mapping subjects to lists of student groups.
+        bins (dict): Day -> list of RoomBin, from `build_room_bins`.
+        fixed_subjects (dict): Subject -> the day it must be examined on.
+
+    Raises:
+        CapacityError: If any check fails, listing every failed check.
+    """
+    problems = []
+    free_per_day = {day: sum(sum(room_bin.free) for room_bin in room_bins) for day, room_bins in bins.items()}
+    longest_per_day = {day: max((room_bin.longest_run for room_bin in room_bins), default=0)
+                       for day, room_bins in bins.items()}
+
+    needed = sum(len(group) for groups in students_data.values() for group in groups)
+    available = sum(free_per_day.values())
+    if needed > available:
+        problems.append(f"{needed} exams need a slot but only {available} slots are free ({needed - available} short)")
+
+    longest_run = max(longest_per_day.values(), default=0)
+    for subject, groups in students_data.items():
+        for group in groups:
+            if len(group) > longest_run:
+                problems.append(
+                    f"{subject} has a group of {len(group)} students, but no room has more than "
+                    f"{longest_run} consecutive free slots"
+                )
+
+    fixed_demand = Counter()
+    for subject, day in fixed_subjects.items():
+        if subject not in students_data:
+            continue
+        if day not in bins:
+            # As in the greedy solver, a fixed day missing from the plan leaves the subject unfixed
+            continue
+        fixed_demand[day] += sum(len(group) for group in students_data[subject])
+        largest_group = max((len(group) for group in students_data[subject]), default=0)
+        if largest_group > longest_per_day[day]:
+            problems.append(
+                f"{subject} has a group of {largest_group} students, but no room on {day} has more than "
+                f"{longest_per_day[day]} consecutive free slots"
+            )
+    for day, demand in fixed_demand.items():
+        if demand > free_per_day[day]:
+            problems.append(
+                f"The subjects fixed to {day} need {demand} slots but only {free_per_day[day]} are free that day"
+            )
+
+    if problems:
+        raise CapacityError(problems)
+
+
+def _choose_run(room_bins, size, strategy):
+    """
+    Picks a free run for a group of `size` students among a day's rooms.
+
+    first_fit takes the earliest run that is long enough; best_fit takes the run
+    that leaves the fewest slots over (earliest on ties).
+
+    Returns:
+        tuple: (RoomBin, start index), or None if no room has a long enough run.
+    """
+    best = None
+    for room_bin in room_bins:
+        if room_bin.longest_run < size:
+            continue
+        for start, length in room_bin.runs():
+            if length < size:
+                continue
+            if strategy == 'first_fit':
+                return room_bin, start
+            if best is None or length - size < best[0]:
+                best = (length - size, room_bin, start)
+                if best[0] == 0:
+                    return room_bin, start
+    return best[1:] if best else None
+
+
+def solve_exam_schedule_packed(students_data, schedule_data, strategy='first_fit', stats=None,
+                               fixed_subjects=FIXED_SUBJECTS):
+    """
+    Assigns students to exam slots by packing subjects into day and room bins.
+
+    Subjects are placed in decreasing order of difficulty: fixed subjects first,
+    then by number of exams, number of groups and number of conflicting subjects.
+    Each subject goes to a single day where all of its groups fit, preferring the
+    days its students already have exams on. Each group takes consecutive free
+    slots in one room, so groups of any size are supported, and slots that do not
+    form a full 3-slot block are used too. A subject that fits no single day is
+    split across days. Fixed subjects are only placed on their day, unless that
+    day is not in the schedule.
+
+    Args:
+        students_data (dict): A dictionary mapping subjects to lists of student groups.
+        schedule_data (dict): A dictionary representing the available exam schedule.
+        strategy (str): "first_fit" (earliest room and slots that fit) or "best_fit"
+            (the free run, and among non-preferred days the day, left fullest).
+        stats (Instrumentation, optional): Receives the "solve" stage time and solver counters.
+        fixed_subjects (dict): Subject -> the day it must be examined on.
+
+    Returns:
+        dict: The schedule_data dictionary populated with student assignments.
+
+    Raises:
+        CapacityError: If the capacity lower bound shows the exams cannot all fit.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}; use one of {', '.join(STRATEGIES)}")
+    stats = stats if stats is not None else NO_INSTRUMENTATION
+
+    with stats.stage("solve"):
+        bins = build_room_bins(schedule_data)
+        check_capacity(students_data, bins, fixed_subjects)
+        # A subject whose fixed day is not in the plan is placed like any other, as in the greedy solver
+        fixed_subjects = {subject: day for subject, day in fixed_subjects.items() if day in bins}
+        days = list(bins)
+        day_position = {day: i for i, day in enumerate(days)}
+        free_per_day = {day: sum(sum(room_bin.free) for room_bin in room_bins) for day, room_bins in bins.items()}
+
+        conflict_graph = build_conflict_graph(students_data)
+        subject_order = {subject: i for i, subject in enumerate(students_data)}
+        exams = {subject: sum(len(group) for group in groups) for subject, groups in students_data.items()}
+        order = sorted(
+            students_data,
+            key=lambda subject: (subject not in fixed_subjects, -exams[subject], -len(students_data[subject]),
+                                 -len(conflict_graph[subject]), subject_order[subject]),
+        )
+        student_days = {}
+        unplaced_subjects = []
+
+        def place_groups(groups, candidate_days):
+            """Places each group on the first candidate day with room; returns the placements or None."""
+            placements = []
+            for group in groups:
+                for day in candidate_days:
+                    if free_per_day[day] < len(group):
+                        continue
+                    choice = _choose_run(bins[day], len(group), strategy)
+                    if choice:
+                        room_bin, start = choice
+                        room_bin.take(start, len(group))
+                        free_per_day[day] -= len(group)
+                        placements.append((group, room_bin, start))
+                        break
+                else:
+                    for placed_group, room_bin, start in placements:
+                        room_bin.release(start, len(placed_group))
+                        free_per_day[room_bin.day] += len(placed_group)
+                    return None
+            return placements
+
+        for subject in order:
+            # Largest groups first, so they get the long runs.
+            groups = sorted(students_data[subject], key=len, reverse=True)
+            if subject in fixed_subjects:
+                candidate_days = [fixed_subjects[subject]]
+            else:
+                # Days the subject's students already come in on, most shared first, then the rest.
+                shared = Counter(student_days[student] for group in groups for student in group
+                                 if student in student_days)
+                preferred = sorted(shared, key=lambda day: (-shared[day], day_position[day]))
+                others = [day for day in days if day not in shared]
+                if strategy == 'best_fit':
+                    others.sort(key=free_per_day.get)
+                candidate_days = preferred + others
+
+            placements = None
+            for day in candidate_days:
+                # Skip days that cannot hold the whole subject
+                if free_per_day[day] < exams[subject]:
+                    continue
+                stats.count("days_tried")
+                placements = place_groups(groups, [day])
+                if placements:
+                    break
+            if placements is None and subject not in fixed_subjects:
+                placements = place_groups(groups, candidate_days)
+                if placements:
+                    stats.count("split_subjects")
+
+            if placements is None:
+                print(f"!!! Warning: Could not find enough slots for {subject}")
+                unplaced_subjects.append(subject)
+                continue
+
+            for group, room_bin, start in placements:
+                slot_keys = room_bin.slot_keys[start:start + len(group)]
+                for student_name, slot_key in zip(group, slot_keys):
+                    vorname, nachname = student_name.split(" ", 1)
+                    schedule_data[room_bin.day][room_bin.room][slot_key].update({
+                        "Nachname": nachname,
+                        "Vorname": vorname,
+                        "Fach": subject
+                    })
+                    student_days.setdefault(student_name, room_bin.day)
+
+        stats.count("unplaced_subjects", len(unplaced_subjects))
+        stats.count("unplaced_exams", sum(exams[subject] for subject in unplaced_subjects))
+    return schedule_data
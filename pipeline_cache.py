@@ -0,0 +1,186 @@
+import hashlib
+import hmac
+import os
+import pickle
+import secrets
+import tempfile
+import threading
+from collections import OrderedDict
+
+# Length of the HMAC-SHA256 digest that starts every cache file
+DIGEST_SIZE = 32
+
+
+def content_hash(*blobs):
+    """
+    Hashes uploaded file contents into a cache key.
+
+    Args:
+        *blobs (bytes): File contents; None stands for a missing upload.
+
+    Returns:
+        str: Hex digest identifying this combination of inputs.
+    """
+    digest = hashlib.sha256()
+    for blob in blobs:
+        if blob is None:
+            digest.update(b"\0none")
+        else:
+            digest.update(len(blob).to_bytes(8, "little"))
+            digest.update(blob)
+    return digest.hexdigest()
+
+
+class PipelineCache:
+    """
+    Bounded LRU cache for pipeline results, keyed by content hashes.
+
+    Entries are kept in memory up to `max_bytes`, measured by their pickled
+    size; the least recently used ones are evicted first, and a value larger
+    than the whole budget is not kept at all. With `disk_dir`, entries are also
+    pickled to that directory (bounded by the same size), so they survive restarts.
+
+    Unpickling can run arbitrary code, so the directory must only be writable by
+    the app. Every file starts with an HMAC-SHA256 of its pickle, keyed by
+    `secret` or by a random key stored in the directory on first use; files whose
+    digest does not match (truncated, corrupted or not written by this cache) are
+    deleted instead of loaded. The digest does not protect against someone who
+    can also read the key.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, disk_dir=None, secret=None):
+        """
+        Args:
+            max_bytes (int): Budget for the entries in memory, and separately on disk.
+            disk_dir (str, optional): Directory for persisted entries.
+            secret (bytes, optional): Key for the file digests. Defaults to a key kept in `disk_dir`.
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._secret = secret
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            if self._secret is None:
+                self._secret = self._load_secret()
+
+    def _load_secret(self):
+        """Reads the directory's digest key, creating it (readable by the owner only) on first use."""
+        path = os.path.join(self.disk_dir, ".cache_key")
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            with open(path, "rb") as f:
+                return f.read()
+        key = secrets.token_bytes(32)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        return key
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def _digest(self, payload):
+        return hmac.new(self._secret, payload, hashlib.sha256).digest()
+
+    def get(self, key, default=None):
+        """Returns the cached value for `key`, or `default`."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        if self.disk_dir and os.path.exists(self._disk_path(key)):
+            try:
+                with open(self._disk_path(key), "rb") as f:
+                    data = f.read()
+            except OSError:
+                return default
+            digest, payload = data[:DIGEST_SIZE], data[DIGEST_SIZE:]
+            if not hmac.compare_digest(digest, self._digest(payload)):
+                print(f"!!! Warning: Ignoring cache file {self._disk_path(key)}, its digest does not match")
+                self._remove(self._disk_path(key))
+                return default
+            try:
+                value = pickle.loads(payload)
+            except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                return default
+            # Touch the file so disk eviction sees it as recently used.
+            os.utime(self._disk_path(key))
+            self._remember(key, value, len(payload))
+            return value
+        return default
+
+    def put(self, key, value):
+        """Stores `value` under `key`, evicting the least recently used entries."""
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, value, len(payload))
+        if self.disk_dir and len(payload) <= self.max_bytes:
+            # A unique temporary file per write, so sessions storing the same key at
+            # once never publish each other's half-written files
+            with tempfile.NamedTemporaryFile(dir=self.disk_dir, prefix=f"{key}.", suffix=".tmp",
+                                             delete=False) as f:
+                f.write(self._digest(payload))
+                f.write(payload)
+            try:
+                os.replace(f.name, self._disk_path(key))
+            except OSError:
+                self._remove(f.name)
+                raise
+            self._evict_disk()
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the cached value for `key`, computing and storing it on a miss.
+
+        Args:
+            key (str): Cache key, usually from `content_hash`.
+            compute (callable): Called without arguments to produce the value.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def _remember(self, key, value, size):
+        with self._lock:
+            if key in self._entries:
+                del self._entries[key]
+                self._bytes -= self._sizes.pop(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                evicted, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict_disk(self):
+        """Deletes the least recently written or read files beyond `max_bytes`."""
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith(".pkl"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
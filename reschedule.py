@@ -0,0 +1,345 @@
+from exam_core.slot_index import SlotIndex
+from exam_core.solver import build_slot_groups
+
+# "Fach" value that marks a slot group taken out of the plan (e.g. a room lost for a day).
+BLOCKED_SUBJECT = "Gesperrt"
+
+
+class UnplacedStudentsError(ValueError):
+    """
+    Raised when students taken out of their slots cannot be placed again.
+
+    The other changes are still applied; `unplaced` lists the (student, subject)
+    pairs that now have no slot.
+    """
+
+    def __init__(self, unplaced):
+        self.unplaced = unplaced
+        super().__init__(
+            "Could not find slots for: " + ", ".join(f"{student} ({subject})" for student, subject in unplaced)
+        )
+
+
+class Rescheduler:
+    """
+    Applies late changes to a solved schedule, repairing only the affected slot groups.
+
+    The schedule is indexed once: its slot groups (with a SlotIndex over the free
+    ones) and, per subject and per student, the slots they hold. Every change then
+    only reads and updates the slot groups it touches, so a series of changes does
+    not rescan the schedule.
+    """
+
+    def __init__(self, students_data, schedule_data):
+        """
+        Args:
+            students_data (dict): A dictionary mapping subjects to lists of student groups (updated in place).
+            schedule_data (dict): A solved exam schedule (updated in place).
+        """
+        self.students_data = students_data
+        self.schedule_data = schedule_data
+        # (student, subject) pairs that lost their slot and did not fit anywhere else
+        self.unplaced = []
+        # subject / student -> {(day, room, slot_key): None}, used as ordered sets
+        self.slots_of_subject = {}
+        self.slots_of_student = {}
+
+        for day, rooms in schedule_data.items():
+            for room, slots in rooms.items():
+                for slot_key, details in slots.items():
+                    if details.get("Fach"):
+                        self._remember(day, room, slot_key, details)
+
+        slot_groups = build_slot_groups(schedule_data)
+        self.group_of_slot = {}
+        for slot_group in slot_groups:
+            slots = schedule_data[slot_group["day"]][slot_group["room"]]
+            slot_group["used"] = any(slots[slot_key].get("Fach") for slot_key in slot_group["slots"])
+            for slot_key in slot_group["slots"]:
+                self.group_of_slot[(slot_group["day"], slot_group["room"], slot_key)] = slot_group
+        self.slot_index = SlotIndex(slot_groups)
+
+    # --- Bookkeeping ---
+
+    def _details(self, location):
+        day, room, slot_key = location
+        return self.schedule_data[day][room][slot_key]
+
+    def _remember(self, day, room, slot_key, details):
+        if details["Fach"] == BLOCKED_SUBJECT:
+            return
+        location = (day, room, slot_key)
+        self.slots_of_subject.setdefault(details["Fach"], {})[location] = None
+        self.slots_of_student.setdefault(f"{details.get('Vorname')} {details.get('Nachname')}", {})[location] = None
+
+    def _forget(self, location):
+        details = self._details(location)
+        if not details.get("Fach") or details["Fach"] == BLOCKED_SUBJECT:
+            return
+        self.slots_of_subject.get(details["Fach"], {}).pop(location, None)
+        self.slots_of_student.get(f"{details.get('Vorname')} {details.get('Nachname')}", {}).pop(location, None)
+
+    def _write(self, location, student, subject):
+        self._forget(location)
+        vorname, nachname = student.split(" ", 1)
+        details = self._details(location)
+        details.update({"Nachname": nachname, "Vorname": vorname, "Fach": subject})
+        self._remember(*location, details)
+
+    def _clear(self, location):
+        """Empties a slot and frees its slot group once the whole group is empty."""
+        self._forget(location)
+        self._details(location).update({"Nachname": "", "Vorname": "", "Fach": ""})
+        slot_group = self.group_of_slot.get(location)
+        if slot_group is not None and not self._group_subjects(slot_group):
+            self.slot_index.mark_free(slot_group)
+
+    def _group_subjects(self, slot_group):
+        """The subjects (including BLOCKED_SUBJECT) held in a slot group."""
+        slots = self.schedule_data[slot_group["day"]][slot_group["room"]]
+        return {slots[slot_key]["Fach"] for slot_key in slot_group["slots"] if slots[slot_key].get("Fach")}
+
+    def _groups_of(self, subject):
+        """The slot groups holding a subject, in schedule order."""
+        groups = {}
+        for location in self.slots_of_subject.get(subject, {}):
+            slot_group = self.group_of_slot.get(location)
+            if slot_group is not None:
+                groups[slot_group["position"]] = slot_group
+        return [groups[position] for position in sorted(groups)]
+
+    def _place_groups(self, subject, groups, preferred_day):
+        """Places student groups earliest-first, preferring `preferred_day`. Returns False if they do not fit."""
+        slots_found = self.slot_index.next_free_groups(len(groups), preferred_day)
+        if len(slots_found) < len(groups):
+            print(f"!!! Warning: Could not find enough slots for {subject}")
+            self.unplaced.extend((student, subject) for group in groups for student in group)
+            return False
+        for group, slot_group in zip(groups, slots_found):
+            for student, slot_key in zip(group, slot_group["slots"]):
+                self._write((slot_group["day"], slot_group["room"], slot_key), student, subject)
+            self.slot_index.mark_used(slot_group)
+        return True
+
+    # --- Changes ---
+
+    def remove_student(self, student, subject=None):
+        """
+        Withdraws a student from one subject (or from all of them) and frees their slots.
+
+        The other exams keep their slots; a slot group is only freed once it is empty.
+
+        Args:
+            student (str): The student's name as "Vorname Nachname".
+            subject (str, optional): Only withdraw from this subject.
+        """
+        for location in list(self.slots_of_student.get(student, {})):
+            if subject is None or self._details(location)["Fach"] == subject:
+                self._clear(location)
+
+        for name, groups in self.students_data.items():
+            if subject is None or name == subject:
+                self.students_data[name] = [
+                    [member for member in group if member != student] for group in groups
+                ]
+                self.students_data[name] = [group for group in self.students_data[name] if group]
+
+    def add_student(self, student, subject):
+        """
+        Adds a late student to a subject without moving anyone else.
+
+        The student takes a free slot in one of the subject's slot groups if there
+        is one, and joins the student group placed there. Otherwise a new slot group
+        is opened, preferring the subject's day, for a new student group.
+
+        Args:
+            student (str): The student's name as "Vorname Nachname".
+            subject (str): The subject to add the student to.
+        """
+        subject_groups = self._groups_of(subject)
+        student_groups = self.students_data.setdefault(subject, [])
+
+        for slot_group in subject_groups:
+            slots = self.schedule_data[slot_group["day"]][slot_group["room"]]
+            free_key = next((key for key in slot_group["slots"] if not slots[key].get("Fach")), None)
+            if free_key is None:
+                continue
+            members = {
+                f"{slots[key]['Vorname']} {slots[key]['Nachname']}"
+                for key in slot_group["slots"] if slots[key].get("Fach") == subject
+            }
+            self._write((slot_group["day"], slot_group["room"], free_key), student, subject)
+            # The student group whose members sit in this slot group
+            group = next((group for group in student_groups if set(group) == members), None)
+            if group is None:
+                group = next((group for group in student_groups if members & set(group)), None)
+            if group is not None:
+                group.append(student)
+            else:
+                student_groups.append([student])
+            return
+
+        preferred_day = subject_groups[0]["day"] if subject_groups else None
+        # The student takes the subject even when no slot is free; they are then reported as unplaced.
+        student_groups.append([student])
+        self._place_groups(subject, [[student]], preferred_day)
+
+    def block_slot_group(self, day, room, slot_key):
+        """
+        Takes the slot group containing `slot_key` out of the plan.
+
+        Students already placed there are moved together to the earliest free slot
+        group, preferring the same day. Nothing else moves.
+
+        Args:
+            day (str): Day of the slot group.
+            room (str): Room of the slot group.
+            slot_key (str): Any slot in the group, e.g. "DiA11".
+
+        Raises:
+            ValueError: If the slot does not exist or is not part of a full slot group.
+        """
+        slot_group = self.group_of_slot.get((day, room, slot_key))
+        if slot_group is None:
+            if slot_key not in self.schedule_data.get(day, {}).get(room, {}):
+                raise ValueError(f"There is no slot {slot_key!r} in {room!r} on {day!r}")
+            raise ValueError(f"Slot {slot_key!r} in {room!r} on {day!r} is not part of a full slot group")
+
+        displaced = {}
+        for key in slot_group["slots"]:
+            location = (day, room, key)
+            details = self._details(location)
+            if details.get("Fach") and details["Fach"] != BLOCKED_SUBJECT:
+                displaced.setdefault(details["Fach"], []).append(f"{details['Vorname']} {details['Nachname']}")
+            self._forget(location)
+            details.update({"Nachname": "", "Vorname": "", "Fach": BLOCKED_SUBJECT})
+        self.slot_index.mark_used(slot_group)
+
+        for subject, group in displaced.items():
+            self._place_groups(subject, [group], day)
+
+    def move_subject(self, subject, day):
+        """
+        Moves all of a subject's exams to another day.
+
+        The subject's groups take the earliest free slot groups on `day`. If that day
+        cannot take all of them, the subject stays where it is.
+
+        Args:
+            subject (str): The subject to move.
+            day (str): The new exam day.
+
+        Raises:
+            ValueError: If `day` is not in the schedule.
+        """
+        if day not in self.schedule_data:
+            raise ValueError(f"There is no day {day!r} in the schedule")
+
+        old_groups = self._groups_of(subject)
+        groups = []
+        for slot_group in old_groups:
+            slots = self.schedule_data[slot_group["day"]][slot_group["room"]]
+            groups.append([
+                f"{slots[key]['Vorname']} {slots[key]['Nachname']}"
+                for key in slot_group["slots"] if slots[key].get("Fach") == subject
+            ])
+        if not groups:
+            # Not placed yet (e.g. it did not fit before): place it from the student list.
+            groups = [list(group) for group in self.students_data.get(subject, []) if group]
+        if not groups:
+            return
+
+        # The subject's own groups on the target day can be reused once they are emptied.
+        reusable = sum(
+            1 for slot_group in old_groups
+            if slot_group["day"] == day and self._group_subjects(slot_group) == {subject}
+        )
+        if self.slot_index.free_per_day.get(day, 0) + reusable < len(groups):
+            print(f"!!! Warning: Could not move {subject} to {day}, not enough free slots")
+            return
+
+        for slot_group in old_groups:
+            for slot_key in slot_group["slots"]:
+                location = (slot_group["day"], slot_group["room"], slot_key)
+                if self._details(location).get("Fach") == subject:
+                    self._clear(location)
+        self._place_groups(subject, groups, day)
+
+    def apply(self, change):
+        """
+        Applies one change dict (see `reschedule`).
+
+        Raises:
+            ValueError: If the action is unknown.
+        """
+        if change.get("action") not in CHANGE_ACTIONS:
+            raise ValueError(f"Unknown change action: {change.get('action')!r}")
+        handler, keys = CHANGE_ACTIONS[change["action"]]
+        handler(self, *(change.get(key) for key in keys))
+
+    def raise_unplaced(self):
+        """Raises UnplacedStudentsError if any student lost their slot for good."""
+        if self.unplaced:
+            raise UnplacedStudentsError(list(self.unplaced))
+
+
+# Change actions accepted by `reschedule`, with the keys each one reads.
+CHANGE_ACTIONS = {
+    "remove_student": (Rescheduler.remove_student, ("student", "subject")),
+    "add_student": (Rescheduler.add_student, ("student", "subject")),
+    "block_slot_group": (Rescheduler.block_slot_group, ("day", "room", "slot")),
+    "move_subject": (Rescheduler.move_subject, ("subject", "day")),
+}
+
+
+def reschedule(students_data, schedule_data, changes):
+    """
+    Applies late changes to a solved schedule, repairing only the affected slot groups.
+
+    The schedule is indexed once for all changes (see `Rescheduler`).
+
+    Args:
+        students_data (dict): A dictionary mapping subjects to lists of student groups (updated in place).
+        schedule_data (dict): A solved exam schedule (updated in place).
+        changes (list): Change dicts, each with an "action" from `CHANGE_ACTIONS`, e.g.
+            {"action": "remove_student", "student": "Anna Muster", "subject": "Mathe"},
+            {"action": "add_student", "student": "Ben Beispiel", "subject": "Mathe"},
+            {"action": "block_slot_group", "day": "24.06.2025", "room": "Room A", "slot": "DiA11"},
+            {"action": "move_subject", "subject": "Mathe", "day": "25.06.2025"}.
+
+    Returns:
+        dict: The updated schedule_data dictionary.
+
+    Raises:
+        ValueError: If a change is invalid (unknown action, day or slot).
+        UnplacedStudentsError: If students lost their slots and could not be placed again,
+            after every change has been applied.
+    """
+    rescheduler = Rescheduler(students_data, schedule_data)
+    for change in changes:
+        rescheduler.apply(change)
+    rescheduler.raise_unplaced()
+    return schedule_data
+
+
+def remove_student(students_data, schedule_data, student, subject=None):
+    """Applies a single `Rescheduler.remove_student` change; returns the updated schedule_data."""
+    return reschedule(students_data, schedule_data,
+                      [{"action": "remove_student", "student": student, "subject": subject}])
+
+
+def add_student(students_data, schedule_data, student, subject):
+    """Applies a single `Rescheduler.add_student` change; returns the updated schedule_data."""
+    return reschedule(students_data, schedule_data,
+                      [{"action": "add_student", "student": student, "subject": subject}])
+
+
+def block_slot_group(students_data, schedule_data, day, room, slot_key):
+    """Applies a single `Rescheduler.block_slot_group` change; returns the updated schedule_data."""
+    return reschedule(students_data, schedule_data,
+                      [{"action": "block_slot_group", "day": day, "room": room, "slot": slot_key}])
+
+
+def move_subject(students_data, schedule_data, subject, day):
+    """Applies a single `Rescheduler.move_subject` change; returns the updated schedule_data."""
+    return reschedule(students_data, schedule_data, [{"action": "move_subject", "subject": subject, "day": day}])
@@ -0,0 +1,507 @@
+"""
+Local store of parsed time plans and solved schedules as compact binary snapshots.
+
+Snapshots are addressed by a key, usually `content_hash` of the inputs that
+produced them, so re-running a known workbook loads its plan instead of parsing
+the Excel file again. Each snapshot is one file: a short JSON header line and a
+zlib-compressed body, encoded with msgpack when it is installed and pickle
+otherwise. A snapshot can be stored as a delta against an earlier one (for
+example a solved schedule against its plan, or a plan variant against the
+previous variant) and is rebuilt from its chain of bases on load.
+
+Disk use is bounded by `max_bytes`: after every write, the least recently used
+snapshots that no other snapshot depends on are deleted, until the store fits
+or only the snapshot just written and its bases are left. Files are written
+atomically, and writing and evicting hold an exclusive lock on the directory's
+lock file, so several processes (e.g. `batch_run.py` workers) can share one
+directory without one evicting a base that another is storing a delta against.
+Readers take no lock; a snapshot evicted while it is being read just counts as
+missing.
+
+Unpickling can run arbitrary code, so every file carries an HMAC-SHA256 of its
+header and body, keyed by `secret` or by a random key stored in the directory
+on first use (as in `pipeline_cache.PipelineCache`). Snapshots whose digest does
+not match (corrupted, or not written by a store with the same key) are deleted
+instead of decoded.
+
+Example:
+    python scenario_store.py .scenario_store list
+    python scenario_store.py .scenario_store diff 3fa2 91c0
+"""
+import argparse
+import hashlib
+import heapq
+import hmac
+import json
+import os
+import pickle
+import secrets
+import tempfile
+import zlib
+from contextlib import contextmanager
+
+from pipeline_cache import content_hash
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; pickle is always available
+    msgpack = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+SNAPSHOT_SUFFIX = '.snap'
+
+# File in the store directory that writers lock
+LOCK_FILE = '.lock'
+
+# File in the store directory holding the digest key
+KEY_FILE = '.store_key'
+
+# Length of the HMAC-SHA256 digest between a snapshot's header and body
+DIGEST_SIZE = 32
+
+# Use the latest snapshot of the same kind as the base of a new one
+LATEST = 'latest'
+
+# Longest chain of deltas before a full snapshot is stored again
+MAX_DELTA_CHAIN = 8
+
+# A delta is only kept if it is at most this fraction of the full snapshot's size
+DELTA_RATIO = 0.5
+
+# date -> room -> slot -> fields: diffs compare whole slots
+SCHEDULE_DEPTH = 3
+
+
+def _encode(value):
+    """Encodes a value with msgpack if installed, else pickle; returns (codec, compressed bytes)."""
+    if msgpack is not None:
+        return 'msgpack', zlib.compress(msgpack.packb(value, use_bin_type=True))
+    return 'pickle', zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _decode(codec, payload):
+    if codec == 'msgpack':
+        if msgpack is None:
+            raise ValueError("The snapshot was written with msgpack, which is not installed")
+        return msgpack.unpackb(zlib.decompress(payload), raw=False, strict_map_key=False)
+    if codec == 'pickle':
+        return pickle.loads(zlib.decompress(payload))
+    raise ValueError(f"Unknown snapshot codec {codec!r}")
+
+
+def diff_nested(old, new, depth=SCHEDULE_DEPTH):
+    """
+    Compares two nested dicts down to `depth` levels.
+
+    Args:
+        old (dict): The earlier version.
+        new (dict): The later version.
+        depth (int): Levels to descend; values below it are compared whole.
+
+    Returns:
+        dict: "set", a list of [path, value] pairs that are new or changed in `new`,
+        "delete", a list of paths only in `old`, and "order", a list of [path, keys]
+        pairs for the dicts whose key order the other changes would not reproduce.
+        Paths are lists of keys.
+    """
+    changes = {'set': [], 'delete': [], 'order': []}
+
+    def walk(old_value, new_value, path):
+        if len(path) < depth and isinstance(old_value, dict) and isinstance(new_value, dict):
+            for key, value in new_value.items():
+                if key not in old_value:
+                    changes['set'].append([path + [key], value])
+                else:
+                    walk(old_value[key], value, path + [key])
+            changes['delete'].extend(path + [key] for key in old_value if key not in new_value)
+            # Setting a new key appends it, so list the keys when that gives another order
+            kept = [key for key in old_value if key in new_value]
+            if kept + [key for key in new_value if key not in old_value] != list(new_value):
+                changes['order'].append([path, list(new_value)])
+        elif not _same(old_value, new_value):
+            changes['set'].append([path, new_value])
+
+    walk(old, new, [])
+    return changes
+
+
+def _same(a, b):
+    """Compares like ==, but dicts only count as equal with their keys in the same order."""
+    if isinstance(a, dict) and isinstance(b, dict):
+        return list(a) == list(b) and all(_same(a[key], b[key]) for key in a)
+    return a == b
+
+
+def apply_delta(value, delta):
+    """Applies a `diff_nested` delta to `value` in place and returns the result."""
+    def find(path):
+        target = value
+        for key in path:
+            target = target[key]
+        return target
+
+    for path in delta['delete']:
+        del find(path[:-1])[path[-1]]
+    for path, new_value in delta['set']:
+        if not path:
+            return new_value
+        find(path[:-1])[path[-1]] = new_value
+    # Deltas written before key orders were recorded have no "order"
+    for path, keys in delta.get('order', []):
+        target = find(path)
+        items = [(key, target[key]) for key in keys]
+        target.clear()
+        target.update(items)
+    return value
+
+
+class ScenarioStore:
+    """
+    Content-addressed snapshots of plans and schedules in one directory, bounded in size.
+    """
+
+    def __init__(self, directory='.scenario_store', max_bytes=256 * 1024 * 1024, secret=None):
+        """
+        Args:
+            directory (str): Where the snapshot files live.
+            max_bytes (int): Disk budget; older snapshots are evicted beyond it.
+            secret (bytes, optional): Key for the snapshot digests. Defaults to a key kept in `directory`.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # key -> ((inode, size), header). A snapshot file is never rewritten in
+        # place, so a header stays valid as long as the file keeps its inode and size.
+        self._headers = {}
+        os.makedirs(directory, exist_ok=True)
+        self._secret = secret if secret is not None else self._load_secret()
+
+    def _load_secret(self):
+        """Reads the directory's digest key, creating it (readable by the owner only) on first use."""
+        path = os.path.join(self.directory, KEY_FILE)
+        if not os.path.exists(path):
+            # Linked into place whole, so processes opening a new store at once
+            # never read a half-written key
+            with tempfile.NamedTemporaryFile(dir=self.directory, prefix=f"{KEY_FILE}.", suffix=".tmp",
+                                             delete=False) as f:
+                f.write(secrets.token_bytes(32))
+            os.chmod(f.name, 0o600)
+            try:
+                os.link(f.name, path)
+            except FileExistsError:
+                pass
+            finally:
+                os.remove(f.name)
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def _digest(self, header_line, payload):
+        return hmac.new(self._secret, header_line + payload, hashlib.sha256).digest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}{SNAPSHOT_SUFFIX}")
+
+    @contextmanager
+    def _locked(self):
+        """Holds the store's exclusive lock, shared with other processes using the same directory."""
+        with open(os.path.join(self.directory, LOCK_FILE), 'a+b') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _header(self, key, identity):
+        """Returns the header of the snapshot file with `identity` (inode, size), reading it on a cache miss."""
+        cached = self._headers.get(key)
+        if cached is not None and cached[0] == identity:
+            return cached[1]
+        try:
+            with open(self._path(key), 'rb') as f:
+                header = json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+        self._headers[key] = (identity, header)
+        return header
+
+    def _read_header(self, key):
+        """Returns the header dict of a snapshot, or None if it is missing or unreadable."""
+        try:
+            stat = os.stat(self._path(key))
+        except OSError:
+            return None
+        return self._header(key, (stat.st_ino, stat.st_size))
+
+    def _entries(self):
+        """
+        Scans the directory once.
+
+        Returns:
+            dict: key -> (mtime, size, header) of every readable snapshot.
+        """
+        entries = {}
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(SNAPSHOT_SUFFIX):
+                    continue
+                key = entry.name[:-len(SNAPSHOT_SUFFIX)]
+                try:
+                    stat = entry.stat()
+                    identity = (entry.inode(), stat.st_size)
+                except OSError:
+                    continue
+                header = self._header(key, identity)
+                if header is not None:
+                    entries[key] = (stat.st_mtime, stat.st_size, header)
+        # Forget the headers of snapshots that are gone
+        for key in self._headers.keys() - entries.keys():
+            del self._headers[key]
+        return entries
+
+    def _read(self, key):
+        """Returns the header and payload of a snapshot; raises ValueError if its digest does not match."""
+        with open(self._path(key), 'rb') as f:
+            header_line = f.readline()
+            digest = f.read(DIGEST_SIZE)
+            payload = f.read()
+        if not hmac.compare_digest(digest, self._digest(header_line, payload)):
+            print(f"!!! Warning: Ignoring snapshot {self._path(key)}, its digest does not match")
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            raise ValueError(f"Snapshot {key} has no valid digest")
+        return json.loads(header_line), payload
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def keys(self, kind=None):
+        """Lists stored keys (optionally of one kind), most recently used first."""
+        entries = [
+            (mtime, key) for key, (mtime, _, header) in self._entries().items()
+            if kind is None or header['kind'] == kind
+        ]
+        return [key for _, key in sorted(entries, reverse=True)]
+
+    def info(self, key):
+        """
+        Returns:
+            dict: The snapshot's "kind", "base", "depth", "codec" and "bytes", or None if it is missing.
+        """
+        header = self._read_header(key)
+        if header is None:
+            return None
+        return dict(header, bytes=os.path.getsize(self._path(key)))
+
+    def resolve(self, prefix):
+        """Returns the one stored key that starts with `prefix`, as with abbreviated git hashes."""
+        matches = [key for key in self.keys() if key.startswith(prefix)]
+        if len(matches) != 1:
+            raise KeyError(f"{len(matches)} snapshots match {prefix!r}")
+        return matches[0]
+
+    def get(self, key, default=None):
+        """
+        Loads a snapshot, rebuilding it from its bases if it is a delta.
+
+        Returns `default` if the snapshot, or one of its bases, is missing, fails
+        its digest check or cannot be decoded. Reading marks the whole chain as recently used.
+        """
+        chain = []
+        current = key
+        try:
+            while current is not None:
+                header, payload = self._read(current)
+                chain.append((current, header, payload))
+                current = header.get('base')
+            value = _decode(chain[-1][1]['codec'], chain[-1][2])
+            for _, header, payload in reversed(chain[:-1]):
+                value = apply_delta(value, _decode(header['codec'], payload))
+        except (OSError, ValueError, KeyError, pickle.UnpicklingError, zlib.error):
+            return default
+        for chain_key, _, _ in chain:
+            try:
+                os.utime(self._path(chain_key))
+            except OSError:
+                pass
+        return value
+
+    def put(self, key, value, kind='plan', base=LATEST):
+        """
+        Stores `value` under `key`, as a delta against `base` when that is much smaller.
+
+        Args:
+            key (str): Snapshot key, usually from `content_hash`.
+            value (dict): The plan or schedule to store.
+            kind (str): Free-form label, e.g. "plan" or "schedule", used by `LATEST` and `keys`.
+            base (str, optional): Key of the snapshot to store a delta against;
+                `LATEST` picks the most recently used snapshot of the same kind,
+                None always stores a full snapshot.
+        """
+        with self._locked():
+            if key in self:
+                os.utime(self._path(key))
+                return
+            self._write(key, value, kind, base)
+            self._evict(keep=key)
+
+    def _write(self, key, value, kind, base):
+        """Writes the snapshot file for `put`; the caller holds the lock."""
+        codec, payload = _encode(value)
+        header = {'kind': kind, 'base': None, 'depth': 0, 'codec': codec}
+
+        if base == LATEST:
+            base = next((candidate for candidate in self.keys(kind) if candidate != key), None)
+        base_header = self._read_header(base) if base is not None else None
+        if base_header is not None and base_header['depth'] < MAX_DELTA_CHAIN:
+            base_value = self.get(base)
+            if base_value is not None:
+                delta_codec, delta_payload = _encode(diff_nested(base_value, value))
+                if len(delta_payload) <= len(payload) * DELTA_RATIO:
+                    codec, payload = delta_codec, delta_payload
+                    header = {'kind': kind, 'base': base, 'depth': base_header['depth'] + 1, 'codec': codec}
+
+        header_line = json.dumps(header).encode('utf-8') + b'\n'
+        temporary_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(temporary_path, 'wb') as f:
+            f.write(header_line)
+            f.write(self._digest(header_line, payload))
+            f.write(payload)
+        os.replace(temporary_path, self._path(key))
+
+    def get_or_compute(self, key, compute, kind='plan', base=LATEST):
+        """Returns the snapshot for `key`, computing and storing it on a miss."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value, kind=kind, base=base)
+        return value
+
+    def compare(self, key_a, key_b, depth=SCHEDULE_DEPTH):
+        """
+        Lists the differences between two stored snapshots.
+
+        Returns:
+            dict: "changed", "added" and "removed" paths (date, room, slot for schedules) from a to b.
+        """
+        a = self.get(key_a)
+        b = self.get(key_b)
+        if a is None or b is None:
+            raise KeyError(f"Snapshot {key_a if a is None else key_b} is not in the store")
+        delta = diff_nested(a, b, depth)
+
+        def exists(value, path):
+            for key in path:
+                if not isinstance(value, dict) or key not in value:
+                    return False
+                value = value[key]
+            return True
+
+        changed = [path for path, _ in delta['set'] if exists(a, path)]
+        added = [path for path, _ in delta['set'] if not exists(a, path)]
+        return {'changed': changed, 'added': added, 'removed': delta['delete']}
+
+    def disk_usage(self):
+        """Returns the total size of the snapshot files in bytes."""
+        total = 0
+        for name in os.listdir(self.directory):
+            if name.endswith(SNAPSHOT_SUFFIX):
+                try:
+                    total += os.path.getsize(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+        return total
+
+    def evict(self):
+        """
+        Deletes least recently used snapshots until the store fits in `max_bytes`.
+
+        Snapshots that are the base of another snapshot are kept until that one
+        is gone, after which they can be evicted in the same pass. Loading a delta
+        touches its bases, so bases are never older than the deltas in use.
+        """
+        with self._locked():
+            self._evict()
+
+    def _evict(self, keep=None):
+        """Evicts for `evict` and `put`; the caller holds the lock. `keep` is never evicted."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries.values())
+        if total <= self.max_bytes:
+            return
+
+        dependents = {}
+        for _, _, header in entries.values():
+            if header['base'] in entries:
+                dependents[header['base']] = dependents.get(header['base'], 0) + 1
+
+        # Snapshots no other one depends on, oldest first; among equally old ones,
+        # the deepest deltas first. Evicting a delta can free its base for eviction.
+        candidates = [
+            (mtime, -header['depth'], key) for key, (mtime, _, header) in entries.items()
+            if key != keep and not dependents.get(key)
+        ]
+        heapq.heapify(candidates)
+        while candidates and total > self.max_bytes:
+            _, _, key = heapq.heappop(candidates)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                continue
+            _, size, header = entries.pop(key)
+            total -= size
+            base = header['base']
+            if base in entries:
+                dependents[base] -= 1
+                if not dependents[base] and base != keep:
+                    mtime, _, base_header = entries[base]
+                    heapq.heappush(candidates, (mtime, -base_header['depth'], base))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Inspect a scenario snapshot store.")
+    parser.add_argument('directory', help="Store directory")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('list', help="List snapshots, most recently used first")
+    diff_parser = subparsers.add_parser('diff', help="Show the slots that differ between two snapshots")
+    diff_parser.add_argument('a', help="Key (or unique key prefix) of the first snapshot")
+    diff_parser.add_argument('b', help="Key (or unique key prefix) of the second snapshot")
+    put_parser = subparsers.add_parser('put', help="Store a plan or schedule JSON file")
+    put_parser.add_argument('file', help="JSON file, such as zeit.json or final_schedule.json")
+    put_parser.add_argument('--kind', default='plan', help="Snapshot kind (default plan)")
+    args = parser.parse_args()
+
+    store = ScenarioStore(args.directory)
+    if args.command == 'list':
+        for key in store.keys():
+            info = store.info(key)
+            base = f"delta of {info['base'][:12]}" if info['base'] else "full"
+            print(f"{key[:12]}  {info['kind']:<10} {info['bytes']:>10} bytes  {info['codec']:<8} {base}")
+        print(f"Total: {store.disk_usage()} bytes")
+    elif args.command == 'diff':
+        differences = store.compare(store.resolve(args.a), store.resolve(args.b))
+        for label in ('changed', 'added', 'removed'):
+            print(f"{label}: {len(differences[label])}")
+            for path in differences[label][:20]:
+                print(f"    {' / '.join(str(key) for key in path)}")
+            if len(differences[label]) > 20:
+                print(f"    ... and {len(differences[label]) - 20} more")
+    else:
+        with open(args.file, 'rb') as f:
+            contents = f.read()
+        key = content_hash(contents)
+        store.put(key, json.loads(contents), kind=args.kind)
+        print(f"Stored '{args.file}' as {key[:12]} ({store.info(key)['bytes']} bytes)")
@@ -0,0 +1,77 @@
+"""
+Seeded random plans and student lists in the parsed `date -> room -> slot -> dict` layout.
+"""
+import datetime
+import random
+
+from benchmarks.generate_inputs import WEEKDAYS, exam_days
+from exam_core.schedule_model import ROOM_FIELDS
+
+
+def make_plan(days=3, rooms=2, slots=9, start=datetime.date(2025, 6, 23), teachers=8, seed=0):
+    """
+    Builds a parsed time plan.
+
+    Args:
+        days (int): Number of exam days.
+        rooms (int): Rooms per day.
+        slots (int): Slots per room; need not be a multiple of 3.
+        start (datetime.date): First day. The default plan contains the fixed day 24.06.2025.
+        teachers (int): Size of the examiner pool.
+        seed (int): Random seed.
+
+    Returns:
+        dict: Date -> room -> slot ID -> slot fields.
+    """
+    rng = random.Random(seed)
+    plan = {}
+    for day in exam_days(days, start):
+        rooms_of_day = {}
+        for room in range(rooms):
+            letter = chr(ord('A') + room)
+            room_slots = {}
+            for slot in range(slots):
+                begin = 8 * 60 + slot * 30
+                details = dict.fromkeys(ROOM_FIELDS, "")
+                details.update({
+                    'Prüfer*in': f"T{rng.randrange(teachers)}",
+                    'Vorsitz': f"V{rng.randrange(max(1, teachers // 2))}",
+                    'Beginn_Prüfung': f"{begin // 60:02d}:{begin % 60:02d}:00",
+                    'Ende_Prüfung': f"{(begin + 20) // 60:02d}:{(begin + 20) % 60:02d}:00",
+                })
+                room_slots[f"{WEEKDAYS[day.weekday()]}{letter}{10 + slot}"] = details
+            rooms_of_day[f"Room {letter}"] = room_slots
+        plan[day.strftime('%d.%m.%Y')] = rooms_of_day
+    return plan
+
+
+def make_students(subjects=8, students=30, seed=0):
+    """
+    Builds a subject -> student groups mapping with groups of 1 to 3 students.
+
+    The first two subjects are the solver's fixed subjects, Informatik and Philosophie.
+    """
+    rng = random.Random(seed)
+    names = ['Informatik', 'Philosophie'] + [f"Fach {i}" for i in range(subjects - 2)]
+    pupils = [f"Vorname{i} Nachname{i}" for i in range(students)]
+    return {
+        name: [rng.sample(pupils, rng.randint(1, 3)) for _ in range(rng.randint(1, 3))]
+        for name in names
+    }
+
+
+def random_case(seed):
+    """
+    A random plan and student list. About half of the plans lack the fixed day
+    24.06.2025, and slot counts are often not a multiple of 3.
+
+    Returns:
+        tuple: (students_data, schedule_data)
+    """
+    rng = random.Random(seed)
+    start = rng.choice([datetime.date(2025, 6, 23), datetime.date(2025, 6, 23), datetime.date(2026, 6, 8),
+                        datetime.date(2025, 6, 25)])
+    plan = make_plan(days=rng.randint(1, 4), rooms=rng.randint(1, 3), slots=rng.randint(1, 10), start=start,
+                     seed=seed)
+    students = make_students(subjects=rng.randint(2, 12), students=rng.randint(5, 40), seed=seed)
+    return students, plan
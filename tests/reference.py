@@ -0,0 +1,264 @@
+"""
+The original greedy solver and sheet parser, kept unchanged as test oracles.
+
+The optimised solver and the vectorized, streaming and parallel parsers must
+produce exactly what these produce. Only CSV writing was left out of the parser.
+"""
+import re
+from collections import defaultdict
+
+import pandas as pd
+
+
+def solve_exam_schedule(students_data, schedule_data):
+    """
+    Assigns students to exam slots based on a set of constraints.
+
+    Args:
+        students_data (dict): A dictionary mapping subjects to lists of student groups.
+        schedule_data (dict): A dictionary representing the available exam schedule.
+
+    Returns:
+        dict: The schedule_data dictionary populated with student assignments.
+    """
+    # 1. --- Pre-processing ---
+
+    # Create a map of student names to their subjects for easy lookup.
+    student_to_subjects = defaultdict(list)
+    for subject, groups in students_data.items():
+        for group in groups:
+            for student_name in group:
+                student_to_subjects[student_name].append(subject)
+
+    # Create a comprehensive, ordered list of all available slot groups.
+    # This respects the "early as possible" rule by sorting by day, room, and time.
+    available_slot_groups = []
+    sorted_days = sorted(schedule_data.keys())
+    for day in sorted_days:
+        sorted_rooms = sorted(schedule_data[day].keys())
+        for room in sorted_rooms:
+            # Sort slots to ensure chronological order (e.g., DiA11, DiA12, ..., DiA21)
+            slots_in_room = sorted(schedule_data[day][room].keys())
+            # A "slot group" is a block of 3 exams.
+            for i in range(0, len(slots_in_room), 3):
+                group_keys = slots_in_room[i:i + 3]
+                if len(group_keys) == 3:
+                    available_slot_groups.append({
+                        "day": day,
+                        "room": room,
+                        "slots": group_keys,
+                        "used": False
+                    })
+
+    # --- Helper function to find and assign a subject ---
+    def find_and_assign(subject, preferred_day=None):
+        """Finds available slots and assigns a subject's groups to them."""
+        nonlocal available_slot_groups
+        groups_to_schedule = students_data[subject]
+        slots_found = []
+
+        # Find enough consecutive, available slot groups for the subject
+        for slot_group in available_slot_groups:
+            # Skip if already used
+            if slot_group["used"]:
+                continue
+            # If a specific day is required, skip slots on other days
+            if preferred_day and slot_group["day"] != preferred_day:
+                continue
+
+            slots_found.append(slot_group)
+            if len(slots_found) == len(groups_to_schedule):
+                break # Found enough slots
+        
+        # If not enough slots were found, reset and try without a day preference
+        # This can happen if a day is full but other days are available.
+        if len(slots_found) < len(groups_to_schedule):
+             slots_found = []
+             for slot_group in available_slot_groups:
+                if not slot_group["used"]:
+                    slots_found.append(slot_group)
+                    if len(slots_found) == len(groups_to_schedule):
+                        break
+
+
+        if len(slots_found) < len(groups_to_schedule):
+            print(f"!!! Warning: Could not find enough slots for {subject}")
+            return None
+
+        # Assign the groups to the found slots
+        assigned_day = slots_found[0]["day"]
+        for i, group_data in enumerate(groups_to_schedule):
+            current_slot_info = slots_found[i]
+            slot_keys = current_slot_info["slots"]
+            for j, student_name in enumerate(group_data):
+                slot_key = slot_keys[j]
+                vorname, nachname = student_name.split(" ", 1)
+                
+                # Update the main schedule dictionary
+                schedule_data[current_slot_info["day"]][current_slot_info["room"]][slot_key].update({
+                    "Nachname": nachname,
+                    "Vorname": vorname,
+                    "Fach": subject
+                })
+            # Mark this slot group as used for the next search
+            current_slot_info["used"] = True
+
+        return assigned_day
+
+    # 2. --- Main Scheduling Logic ---
+    
+    subjects_to_schedule = list(students_data.keys())
+    scheduled_subjects = set()
+    student_day_constraints = {}
+
+    # Start with the fixed subjects
+    fixed_subjects = {"Informatik": "24.06.2025", "Philosophie": "24.06.2025"}
+    for subject, day in fixed_subjects.items():
+        if subject in subjects_to_schedule:
+            assigned_day = find_and_assign(subject, preferred_day=day)
+            scheduled_subjects.add(subject)
+            # Add constraints for all students taking this subject
+            for group in students_data[subject]:
+                for student in group:
+                    student_day_constraints[student] = assigned_day
+
+    # Iteratively schedule remaining subjects based on propagating constraints
+    while len(scheduled_subjects) < len(subjects_to_schedule):
+        subject_scheduled_this_iteration = False
+        # First pass: try to schedule subjects that are now constrained
+        for subject in subjects_to_schedule:
+            if subject in scheduled_subjects:
+                continue
+
+            constrained_day = None
+            for group in students_data[subject]:
+                for student in group:
+                    if student in student_day_constraints:
+                        constrained_day = student_day_constraints[student]
+                        break
+                if constrained_day:
+                    break
+            
+            if constrained_day:
+                assigned_day = find_and_assign(subject, preferred_day=constrained_day)
+                scheduled_subjects.add(subject)
+                # Propagate constraints to other students in this subject
+                for group in students_data[subject]:
+                    for student in group:
+                        student_day_constraints[student] = assigned_day
+                subject_scheduled_this_iteration = True
+                break # Restart the while loop to re-evaluate constraints
+
+        # Second pass: if no subjects were scheduled due to constraints, schedule the next available one
+        if not subject_scheduled_this_iteration:
+            for subject in subjects_to_schedule:
+                if subject not in scheduled_subjects:
+                    assigned_day = find_and_assign(subject)
+                    scheduled_subjects.add(subject)
+                    # Add constraints for all students taking this subject
+                    for group in students_data[subject]:
+                        for student in group:
+                            student_day_constraints[student] = assigned_day
+                    break # Break to restart the while loop
+
+    return schedule_data
+
+
+def process_excel_to_dict(excel_file_path):
+    """The original `first_main.process_excel_to_csv_and_dict`, without the CSV files."""
+    excel_data = pd.read_excel(excel_file_path, sheet_name=None, header=None)
+    unified_dict = {}
+    for sheet_name, df in excel_data.items():
+        date, room_data = extract_date_and_rooms(df.values.tolist())
+        if date:
+            unified_dict[date] = room_data
+    return unified_dict
+
+
+def extract_date_and_rooms(data):
+    """
+    Extract date and room data from the sheet data.
+    
+    Args:
+        data (list): List of rows from the sheet
+    
+    Returns:
+        tuple: (date_string, room_dict)
+    """
+    
+    date = None
+    room_dict = {}
+    current_room = None
+    room_data = []
+    
+    for row in data:
+        # Convert row to string to check for date and room headers
+        row_str = str(row[0]) if row and len(row) > 0 and pd.notna(row[0]) else ""
+        
+        # Check for date header (e.g., "23.06.2023: Raum A")
+        if ": Raum" in row_str:
+            # Save previous room data if exists
+            if current_room and room_data:
+                room_dict[current_room] = process_room_data(room_data)
+                room_data = []
+            
+            # Extract date and room
+            parts = row_str.split(": Raum ")
+            if len(parts) == 2:
+                date = parts[0]
+                current_room = f"Room {parts[1]}"
+        
+        # Check if it's a data row (has student ID pattern like DiA11, DiB21, etc.)
+        #elif row and len(row) > 0 and pd.notna(row[0]) and re.match(r'Di[ABC]\d{2}', str(row[0])):
+        elif row and len(row) > 0 and pd.notna(row[0]) and re.match(r'(Mo|Di|Mi|Do|Fr|Sa|So)[A-Z]\d{2}', str(row[0])):
+
+            room_data.append(row)
+    
+    #print(room_data)
+    # Don't forget the last room
+    if current_room and room_data:
+        room_dict[current_room] = process_room_data(room_data)
+    
+    return date, room_dict
+
+def process_room_data(room_data):
+    """
+    Process room data into dictionary format.
+    
+    Args:
+        room_data (list): List of rows for a specific room
+    
+    Returns:
+        dict: Dictionary with student IDs as keys
+    """
+    
+    room_dict = {}
+    
+    for row in room_data:
+        if len(row) >= 15:  # Ensure we have enough columns
+            student_id = str(row[0]) if pd.notna(row[0]) else ""
+            
+            if student_id:  # Only process rows with student IDs
+                room_dict[student_id] = {
+                    'Nachname': str(row[1]) if pd.notna(row[1]) else "",
+                    'Vorname': str(row[2]) if pd.notna(row[2]) else "",
+                    'Fach': str(row[3]) if pd.notna(row[3]) else "",
+                    'Gäste': str(row[4]) if pd.notna(row[4]) else "",
+                    'Prüfer*in': str(row[5]) if pd.notna(row[5]) else "",
+                    'Protokoll': str(row[6]) if pd.notna(row[6]) else "",
+                    'Vorsitz': str(row[7]) if pd.notna(row[7]) else "",
+                    'Ankunft_in_Warteraum_1': str(row[8]) if pd.notna(row[8]) else "",
+                    'Beginn_d_Vorbereitung': str(row[9]) if pd.notna(row[9]) else "",
+                    'Ende_der_Vorbereitung': str(row[10]) if pd.notna(row[10]) else "",
+                    'Beginn_Prüfung': str(row[11]) if pd.notna(row[11]) else "",
+                    'Ende_Prüfung': str(row[12]) if pd.notna(row[12]) else "",
+                    'Beratung_von': str(row[13]) if pd.notna(row[13]) else "",
+                    'Beratung_bis': str(row[14]) if pd.notna(row[14]) else "",
+                    'Aufsicht_Warteraum_1': str(row[15]) if len(row) > 15 and pd.notna(row[15]) else "",
+                    'Aufsicht_Warteraum_2': str(row[16]) if len(row) > 16 and pd.notna(row[16]) else "",
+                    'Aufsicht_Vorbereitungsraum': str(row[17]) if len(row) > 17 and pd.notna(row[17]) else "",
+                    'Fluraufsicht': str(row[18]) if len(row) > 18 and pd.notna(row[18]) else "",
+                    'Reserve': str(row[19]) if len(row) > 19 and pd.notna(row[19]) else ""
+                }
+    
+    return room_dict
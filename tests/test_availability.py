@@ -0,0 +1,62 @@
+import copy
+
+from exam_core.availability import AvailabilityIndex
+from exam_core.solver import solve_exam_schedule
+from plans import make_plan, random_case
+from verify_schedule import verify_schedule
+
+
+def test_rejections_are_remembered_per_exam_count():
+    availability = AvailabilityIndex()
+    availability.book("T1", "24.06.2025", 480, 540, "Room A")
+    availability.add_groups({"group": [[("T2", "24.06.2025", "Room B", 480, 500)],
+                                       [("T1", "24.06.2025", "Room B", 510, 530)]]})
+
+    assert availability.group_fits("group", 1)
+    assert not availability.group_fits("group", 2)
+    assert availability.group_fits("group", 1)
+    assert not availability.ruled_out("group")
+
+
+def test_booked_groups_clash_across_rooms_only():
+    availability = AvailabilityIndex()
+    availability.add_groups({
+        "chosen": [[("T1", "24.06.2025", "Room A", 480, 500)], [("T1", "24.06.2025", "Room A", 500, 540)]],
+        "same room": [[("T1", "24.06.2025", "Room A", 500, 520)]],
+        "other room": [[("T1", "24.06.2025", "Room B", 510, 520)]],
+        "other day": [[("T1", "25.06.2025", "Room B", 510, 520)]],
+        "touching": [[("T1", "24.06.2025", "Room C", 540, 560)]],
+    })
+
+    # The other room only clashes with the second slot of "chosen"
+    assert availability.group_fits("other room", 1, {"chosen": 1})
+    assert not availability.group_fits("other room", 1, {"chosen": 2})
+    assert availability.group_fits("same room", 1, {"chosen": 2})
+    # A clash with pending groups is not remembered: they are dropped after the search
+    assert availability.group_fits("other room", 1)
+
+    availability.book_group("chosen", 2)
+    for key in ("same room", "other day", "touching"):
+        assert availability.group_fits(key, 1)
+    assert not availability.group_fits("other room", 1)
+    assert availability.ruled_out("other room")
+
+
+def test_checked_schedules_have_no_people_clashes():
+    for seed in range(60):
+        students, plan = random_case(seed)
+        solved = solve_exam_schedule(students, copy.deepcopy(plan), check_people=True)
+        assert verify_schedule(students, solved)['violations']['people_double_bookings'] == [], seed
+
+
+def test_unavailable_people_are_not_booked():
+    plan = make_plan(days=2, rooms=2, slots=6, teachers=3, seed=1)
+    students = {'Fach 1': [['Anna Muster'], ['Ben Beispiel']], 'Fach 2': [['Cem Demir']]}
+    first_day = next(iter(plan))
+    unavailability = {f"T{i}": [{"day": first_day}] for i in range(3)}
+
+    solved = solve_exam_schedule(students, copy.deepcopy(plan), unavailability=unavailability)
+
+    booked_days = {day for day, rooms in solved.items() for slots in rooms.values()
+                   for details in slots.values() if details['Fach']}
+    assert booked_days and first_day not in booked_days
@@ -0,0 +1,95 @@
+import time
+
+import pytest
+
+from app_pipeline import run_pipeline
+from benchmarks.generate_inputs import make_students, write_workbook
+from exam_core.background_jobs import CANCELLED, DONE, FAILED, JobRunner, PipelineCancelled
+from first_main import process_excel_to_csv_and_dict
+
+
+def count_to(job, total):
+    """A pipeline that reports progress and stops when cancelled."""
+    for done in range(total):
+        if job.cancelled():
+            raise PipelineCancelled(f"Cancelled at {done}")
+        job.update("count", done + 1, total)
+        time.sleep(0.01)
+    return total
+
+
+def fail(job):
+    raise RuntimeError("broken input")
+
+
+def wait_for(job, seconds=60):
+    deadline = time.monotonic() + seconds
+    while not job.done() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert job.done()
+
+
+@pytest.fixture(scope="module")
+def runner():
+    runner = JobRunner(max_workers=2)
+    yield runner
+    runner.shutdown()
+
+
+def test_job_runs_in_a_worker_process(runner):
+    job = runner.submit(count_to, 5)
+    finished = []
+    job.add_done_callback(finished.append)
+    wait_for(job)
+
+    assert job.status == DONE
+    assert job.result == 5
+    assert job.progress() == {"count": (5, 5)}
+    assert finished == [job]
+
+
+def test_failed_and_cancelled_jobs(runner):
+    failed = runner.submit(fail)
+    cancelled = runner.submit(count_to, 10000)
+    while cancelled.started is None:
+        time.sleep(0.01)
+    cancelled.cancel()
+    wait_for(failed)
+    wait_for(cancelled)
+
+    assert failed.status == FAILED and "broken input" in failed.error
+    assert cancelled.status == CANCELLED and cancelled.error.startswith("Cancelled at")
+
+
+def test_pipeline_job_returns_every_stage(runner, tmp_path):
+    path = tmp_path / "zeit.xlsx"
+    write_workbook(str(path), days=2, rooms=2, slots=6)
+    job = runner.submit(run_pipeline, path.read_bytes(), "key", make_students(subjects=4, students=10), True,
+                        None, False)
+    wait_for(job)
+
+    assert job.status == DONE, job.error
+    assert set(job.result) == {"first_step", "second_step", "processed_df", "verification", "people", "run_stats"}
+    assert job.result["people"] is not None
+    assert job.placed_exams()
+
+
+class CancelAfterFirstSheet:
+    def __init__(self):
+        self.updates = []
+
+    def update(self, stage, done, total=None):
+        self.updates.append((stage, done, total))
+
+    def cancelled(self):
+        return bool(self.updates)
+
+
+def test_parsing_stops_at_the_next_sheet(tmp_path):
+    path = tmp_path / "zeit.xlsx"
+    write_workbook(str(path), days=3, rooms=1, slots=3)
+    progress = CancelAfterFirstSheet()
+
+    with pytest.raises(PipelineCancelled):
+        process_excel_to_csv_and_dict(str(path), export_csv=False, progress=progress)
+    assert progress.updates == [("parse", 1, 3)]
@@ -0,0 +1,117 @@
+import copy
+import csv
+import io
+import json
+import os
+import zipfile
+
+import pytest
+
+from batch_run import find_scenarios, run_batch, run_scenario
+from benchmarks.generate_inputs import make_students, write_workbook
+from exam_core.solver import score_schedule, solve_exam_schedule
+from first_main import build_csv_zip, process_excel_to_csv_and_dict
+from third_convert_to_csv import iter_csv_chunks
+from verify_schedule import verify_schedule
+
+
+def test_duplicate_manifest_names_are_rejected(tmp_path):
+    manifest = tmp_path / 'manifest.json'
+    manifest.write_text(json.dumps([
+        {'name': 'a', 'workbook': 'one.xlsx', 'students': 'student.json'},
+        {'workbook': 'dir/a.xlsx', 'students': 'student.json'},
+    ]), encoding='utf-8')
+
+    with pytest.raises(ValueError, match="duplicates: a"):
+        find_scenarios(str(manifest))
+
+
+def test_failed_scenario_writes_error_and_log(tmp_path):
+    scenario = {'name': 'broken', 'workbook': str(tmp_path / 'missing.xlsx'),
+                'students': str(tmp_path / 'missing.json')}
+
+    row = run_scenario(scenario, str(tmp_path / 'out'))
+
+    assert row['status'] == 'failed'
+    assert 'FileNotFoundError' in row['error']
+    scenario_dir = tmp_path / 'out' / 'broken'
+    assert os.path.exists(scenario_dir / 'error.txt')
+    assert os.path.exists(scenario_dir / 'log.txt')
+
+
+@pytest.fixture
+def scenario_dir(tmp_path):
+    source = tmp_path / 'scenarios'
+    source.mkdir()
+    for name, days in (('small', 2), ('large', 3)):
+        write_workbook(str(source / f'{name}.xlsx'), days=days, rooms=2, slots=6, seed=days)
+    (source / 'student.json').write_text(json.dumps(make_students(subjects=5, students=12)), encoding='utf-8')
+    return source
+
+
+def zip_members(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def check_outputs(scenario, scenario_dir):
+    """Compares a scenario's output files with a fresh run of the pipeline."""
+    with open(scenario['students'], encoding='utf-8') as f:
+        students = json.load(f)
+    plan = process_excel_to_csv_and_dict(scenario['workbook'], export_csv=False)
+    expected = solve_exam_schedule(students, copy.deepcopy(plan))
+
+    with open(scenario_dir / 'final_schedule.json', encoding='utf-8') as f:
+        assert json.load(f) == expected
+    with open(scenario_dir / 'schedule.csv', encoding='utf-8-sig', newline='') as f:
+        assert f.read() == ''.join(iter_csv_chunks(expected))
+    with open(scenario_dir / 'verification.json', encoding='utf-8') as f:
+        assert json.load(f) == json.loads(json.dumps(verify_schedule(students, expected)))
+    csv_files = {path.name: path.read_bytes() for path in (scenario_dir / 'csv_output').iterdir()}
+    assert csv_files == zip_members(build_csv_zip(expected))
+    return students, expected
+
+
+def test_batch_writes_every_scenario(scenario_dir, tmp_path):
+    scenarios = find_scenarios(str(scenario_dir))
+    output = tmp_path / 'out'
+
+    rows = run_batch(scenarios, str(output), workers=2, store_dir=str(tmp_path / 'store'))
+
+    assert [row['scenario'] for row in rows] == ['large', 'small']
+    for scenario, row in zip(scenarios, rows):
+        assert row['status'] == 'ok', row.get('error')
+        students, schedule = check_outputs(scenario, output / scenario['name'])
+        assert row['scheduled_exams'] == row['total_exams'] - score_schedule(students, schedule)[0]
+        with open(output / scenario['name'] / 'run_stats.json', encoding='utf-8') as f:
+            assert 'solve' in json.load(f)['stages']
+    with open(output / 'summary.csv', encoding='utf-8', newline='') as f:
+        summary = list(csv.DictReader(f))
+    assert [line['scenario'] for line in summary] == ['large', 'small']
+    assert all(line['status'] == 'ok' for line in summary)
+
+
+def test_second_run_loads_from_the_store(scenario_dir, tmp_path):
+    scenario = find_scenarios(str(scenario_dir))[0]
+    store = str(tmp_path / 'store')
+    first = run_scenario(scenario, str(tmp_path / 'first'), store_dir=store)
+    second = run_scenario(scenario, str(tmp_path / 'second'), store_dir=store)
+
+    assert first['status'] == second['status'] == 'ok'
+    with open(tmp_path / 'second' / scenario['name'] / 'run_stats.json', encoding='utf-8') as f:
+        assert json.load(f)['counters']['snapshot_hits'] == 2
+    check_outputs(scenario, tmp_path / 'second' / scenario['name'])
+
+
+def test_parallel_solver_scenario(scenario_dir, tmp_path):
+    scenario = next(s for s in find_scenarios(str(scenario_dir)) if s['name'] == 'large')
+    row = run_scenario(scenario, str(tmp_path / 'out'), solver='parallel')
+    assert row['status'] == 'ok'
+
+    with open(scenario['students'], encoding='utf-8') as f:
+        students = json.load(f)
+    with open(tmp_path / 'out' / 'large' / 'final_schedule.json', encoding='utf-8') as f:
+        schedule = json.load(f)
+    plan = process_excel_to_csv_and_dict(scenario['workbook'], export_csv=False)
+    expected = solve_exam_schedule(students, copy.deepcopy(plan))
+    assert score_schedule(students, schedule)[0] <= score_schedule(students, expected)[0]
@@ -0,0 +1,66 @@
+import copy
+
+import pandas as pd
+import pytest
+
+from exam_core.solver import solve_exam_schedule
+from plans import make_plan, make_students
+from third_convert_to_csv import (CATEGORICAL_COLUMNS, convert_to_columns, convert_to_csv, iter_csv_chunks,
+                                  write_arrow, write_csv_chunks, write_parquet)
+
+
+@pytest.fixture(scope="module")
+def schedule():
+    schedule = solve_exam_schedule(make_students(subjects=6, students=20), make_plan(days=3, rooms=2, slots=9))
+    # A field only some slots have, which the other rows leave empty
+    day = next(iter(schedule))
+    room = next(iter(schedule[day]))
+    next(iter(schedule[day][room].values()))["Notiz"] = "Raum, 1. Stock"
+    return schedule
+
+
+def test_columnar_matches_row_wise(schedule):
+    expected = convert_to_csv(copy.deepcopy(schedule))
+    pd.testing.assert_frame_equal(convert_to_columns(schedule, categorical=False), expected)
+    pd.testing.assert_frame_equal(convert_to_csv(schedule, columnar=True).astype(object), expected.astype(object))
+
+
+def test_categorical_columns(schedule):
+    df = convert_to_columns(schedule, categorical=True)
+    for column in CATEGORICAL_COLUMNS:
+        assert isinstance(df[column].dtype, pd.CategoricalDtype)
+    expected = convert_to_csv(schedule)
+    pd.testing.assert_frame_equal(df.astype({column: expected[column].dtype for column in CATEGORICAL_COLUMNS}),
+                                  expected)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 10000])
+def test_csv_chunks_match_to_csv(schedule, chunk_size, tmp_path):
+    expected = convert_to_csv(schedule).to_csv(index=False, lineterminator="\n")
+    chunks = list(iter_csv_chunks(schedule, chunk_size=chunk_size))
+    assert "".join(chunks) == expected
+
+    path = tmp_path / "schedule.csv"
+    write_csv_chunks(schedule, str(path), chunk_size=chunk_size)
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        assert f.read() == expected
+
+
+def test_parquet_round_trip(schedule, tmp_path):
+    pytest.importorskip("pyarrow")
+    df = convert_to_columns(schedule)
+    path = tmp_path / "schedule.parquet"
+    write_parquet(df, str(path))
+    pd.testing.assert_frame_equal(pd.read_parquet(path), df)
+
+
+def test_arrow_round_trip(schedule, tmp_path):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+
+    df = convert_to_columns(schedule)
+    path = tmp_path / "schedule.arrow"
+    write_arrow(df, str(path))
+    with pyarrow.OSFile(str(path), "rb") as source:
+        table = pyarrow.ipc.open_file(source).read_all()
+    pd.testing.assert_frame_equal(table.to_pandas(), df)
@@ -0,0 +1,59 @@
+import io
+import zipfile
+
+import pandas as pd
+import pytest
+
+from benchmarks.generate_inputs import HEADERS, write_workbook
+from exam_core.schedule_model import ROOM_FIELDS
+from first_main import build_csv_zip, create_csv_files, export_csv_files, process_excel_to_csv_and_dict
+
+
+@pytest.fixture(scope="module")
+def plan(tmp_path_factory):
+    path = tmp_path_factory.mktemp("workbooks") / "zeit.xlsx"
+    write_workbook(str(path), days=3, rooms=3, slots=6, seed=5)
+    return process_excel_to_csv_and_dict(str(path), export_csv=False)
+
+
+def read_files(directory):
+    return {path.name: path.read_bytes() for path in sorted(directory.iterdir())}
+
+
+def test_room_csv_matches_the_original_writer(plan, tmp_path):
+    date, room_data = next(iter(plan.items()))
+    create_csv_files(date, room_data, str(tmp_path))
+
+    for room_name, students in room_data.items():
+        # The original wrote each room through a DataFrame without header or index
+        rows = [HEADERS] + [[student_id] + [info[field] for field in ROOM_FIELDS]
+                            for student_id, info in students.items()]
+        expected = pd.DataFrame(rows).to_csv(index=False, header=False).encode('utf-8')
+        assert (tmp_path / f"{date}_Room{room_name.split()[-1]}.csv").read_bytes() == expected
+
+
+def test_thread_pool_export_matches_create_csv_files(plan, tmp_path):
+    for date, room_data in plan.items():
+        create_csv_files(date, room_data, str(tmp_path / "sequential"))
+    export_csv_files(plan, str(tmp_path / "threaded"), max_workers=3)
+
+    expected = read_files(tmp_path / "sequential")
+    assert len(expected) == 9
+    assert read_files(tmp_path / "threaded") == expected
+
+
+def test_csv_zip_holds_the_same_files(plan, tmp_path):
+    export_csv_files(plan, str(tmp_path))
+
+    with zipfile.ZipFile(io.BytesIO(build_csv_zip(plan))) as archive:
+        members = {name: archive.read(name) for name in archive.namelist()}
+    assert members == read_files(tmp_path)
+
+
+def test_no_csv_files_without_export(tmp_path, monkeypatch):
+    path = tmp_path / "zeit.xlsx"
+    write_workbook(str(path), days=2, rooms=2, slots=3)
+    monkeypatch.chdir(tmp_path)
+    for options in ({}, {"vectorized": False}, {"streaming": True}, {"parallel": True, "max_workers": 2}):
+        process_excel_to_csv_and_dict(str(path), export_csv=False, **options)
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == ["zeit.xlsx"]
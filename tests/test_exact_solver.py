@@ -0,0 +1,43 @@
+import copy
+
+import pytest
+
+from exact_solver import solve_exam_schedule_exact
+from exam_core.solver import FIXED_SUBJECTS, score_schedule, solve_exam_schedule
+from plans import make_plan, random_case
+
+
+def test_day_without_a_full_slot_group():
+    plan = make_plan(days=1, rooms=1, slots=1)
+    students = {'Mathematik': [['Anna Muster']]}
+    schedule = solve_exam_schedule_exact(students, copy.deepcopy(plan), time_budget=1.0)
+    assert schedule == plan
+
+
+def test_subject_without_groups():
+    plan = make_plan(days=2, rooms=1, slots=6)
+    students = {'Mathematik': [['Anna Muster']], 'Kunst': []}
+    schedule = solve_exam_schedule_exact(students, copy.deepcopy(plan), time_budget=1.0)
+    assert score_schedule(students, schedule)[0] == 0
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_never_worse_than_greedy(seed):
+    students, plan = random_case(seed)
+    greedy = solve_exam_schedule(copy.deepcopy(students), copy.deepcopy(plan))
+    exact = solve_exam_schedule_exact(students, copy.deepcopy(plan), time_budget=0.2)
+    assert score_schedule(students, exact) <= score_schedule(students, greedy)
+
+
+@pytest.mark.parametrize("seed", range(80))
+def test_fixed_subjects_stay_on_their_day(seed):
+    students, plan = random_case(seed)
+    greedy = solve_exam_schedule(copy.deepcopy(students), copy.deepcopy(plan))
+    exact = solve_exam_schedule_exact(students, copy.deepcopy(plan), time_budget=0.2)
+    if exact == greedy or '24.06.2025' not in plan:
+        return
+    for day, rooms in exact.items():
+        for slots in rooms.values():
+            for details in slots.values():
+                if details.get('Fach') in FIXED_SUBJECTS:
+                    assert day == FIXED_SUBJECTS[details['Fach']]
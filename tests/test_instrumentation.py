@@ -0,0 +1,76 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.generate_inputs import make_students, write_workbook
+from exam_core.instrumentation import Instrumentation
+from exam_core.solver import solve_exam_schedule
+from first_main import process_excel_to_csv_and_dict
+from third_convert_to_csv import convert_to_csv
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_pipeline_records_stages_and_counters(tmp_path, monkeypatch):
+    path = tmp_path / "zeit.xlsx"
+    write_workbook(str(path), days=3, rooms=2, slots=6)
+    monkeypatch.chdir(tmp_path)
+    stats = Instrumentation()
+
+    plan = process_excel_to_csv_and_dict(str(path), stats=stats)
+    solve_exam_schedule(make_students(subjects=6, students=15), plan, stats=stats, check_people=True)
+    convert_to_csv(plan, stats=stats)
+
+    report = json.loads(json.dumps(stats.to_dict()))
+    assert set(report['stages']) == {'excel_read', 'sheet_parse', 'csv_write', 'solve', 'flatten'}
+    for stage in report['stages'].values():
+        assert stage['seconds'] >= 0
+        assert stage['calls'] >= 1
+    assert report['stages']['sheet_parse']['calls'] == 3
+
+    counters = report['counters']
+    assert counters['sheets'] == 3
+    assert counters['placement_rounds'] >= 1
+    for name in ('slot_groups_scanned', 'fallback_searches', 'unplaced_subjects', 'unplaced_exams',
+                 'constraint_propagations', 'availability_rejections'):
+        assert counters.get(name, 0) >= 0
+    assert counters['slot_groups_scanned'] > 0
+    assert 'profiles' not in report
+
+
+def test_profiled_stages_are_reported():
+    stats = Instrumentation(profile=True, profile_limit=3)
+    with stats.stage('solve'):
+        sorted(range(1000), key=lambda value: -value)
+    report = stats.to_dict()
+    assert report['stages']['solve']['calls'] == 1
+    assert 'function calls' in report['profiles']['solve']
+
+
+# The parallel solver's workers keep their own counters, so it only reports the fallback
+@pytest.mark.parametrize("options, counters", [([], {'placement_rounds'}), (["--workers", "2"], set())])
+def test_second_assign_writes_stats_json(tmp_path, options, counters):
+    write_workbook(str(tmp_path / "zeit.xlsx"), days=2, rooms=2, slots=6)
+    plan = process_excel_to_csv_and_dict(str(tmp_path / "zeit.xlsx"), export_csv=False)
+    with open(tmp_path / "zeit.json", "w", encoding="utf-8") as f:
+        json.dump(plan, f)
+    with open(tmp_path / "student.json", "w", encoding="utf-8") as f:
+        json.dump(make_students(subjects=4, students=10), f)
+
+    subprocess.run([sys.executable, os.path.join(REPO_DIR, "second_assign.py"), "--stats", "stats.json"] + options,
+                   cwd=tmp_path, check=True, capture_output=True)
+
+    with open(tmp_path / "stats.json", encoding="utf-8") as f:
+        report = json.load(f)
+    assert {'json_read', 'solve', 'verify'} <= set(report['stages'])
+    assert counters <= set(report['counters'])
+
+
+def test_second_assign_rejects_workers_with_the_examiner_check(tmp_path):
+    result = subprocess.run([sys.executable, os.path.join(REPO_DIR, "second_assign.py"), "--workers", "2",
+                             "--check-people"], cwd=tmp_path, capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "--workers cannot be combined" in result.stderr
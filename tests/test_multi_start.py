@@ -0,0 +1,38 @@
+import copy
+import time
+
+from exam_core.solver import score_schedule, solve_exam_schedule
+from multi_start import ordering_seeds, solve_exam_schedule_multistart
+from plans import make_plan, make_students
+
+
+def test_ordering_seeds_are_unique():
+    assert ordering_seeds(0, 4) == [0, 1, 2, 3]
+    assert ordering_seeds(5, 3) == [0, 6, 7]
+    seeds = ordering_seeds(-3, 6)
+    assert seeds == [0, -2, -1, 1, 2, 3]
+    assert len(set(seeds)) == len(seeds)
+
+
+def test_never_worse_than_greedy():
+    students = make_students(subjects=10, students=30, seed=4)
+    plan = make_plan(days=3, rooms=2, slots=6, seed=4)
+    greedy = solve_exam_schedule(copy.deepcopy(students), copy.deepcopy(plan))
+    best = solve_exam_schedule_multistart(students, copy.deepcopy(plan), iterations=8, max_workers=1)
+    assert score_schedule(students, best) <= score_schedule(students, greedy)
+
+
+def test_time_limit_does_not_wait_for_unfinished_runs():
+    students = make_students(subjects=12, students=300, seed=1)
+    plan = make_plan(days=10, rooms=6, slots=30, seed=1)
+    start = time.perf_counter()
+    solve_exam_schedule(copy.deepcopy(students), copy.deepcopy(plan))
+    solve_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    schedule = solve_exam_schedule_multistart(students, copy.deepcopy(plan), iterations=1000, time_limit=0.5,
+                                              max_workers=2)
+    elapsed = time.perf_counter() - start
+    # The time limit, the final rebuild and process start-up, but not the runs still pending
+    assert elapsed < 0.5 + 4 * solve_seconds + 2.0
+    assert score_schedule(students, schedule)[0] == 0
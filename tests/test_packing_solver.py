@@ -0,0 +1,52 @@
+import copy
+import datetime
+
+import pytest
+
+from exam_core.solver import score_schedule
+from packing_solver import STRATEGIES, CapacityError, build_room_bins, check_capacity, solve_exam_schedule_packed
+from plans import make_plan, make_students, random_case
+from verify_schedule import verify_schedule
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_fixed_day_missing_from_plan(strategy):
+    # The plan starts on 25.06.2025, so the fixed subjects' day is not in it
+    plan = make_plan(days=2, rooms=2, slots=9, start=datetime.date(2025, 6, 25))
+    students = make_students(subjects=4, students=12)
+    check_capacity(students, build_room_bins(plan))
+
+    schedule = solve_exam_schedule_packed(students, copy.deepcopy(plan), strategy=strategy)
+    assert score_schedule(students, schedule)[0] == 0
+
+
+def test_fixed_subjects_stay_on_their_day():
+    plan = make_plan(days=3, rooms=2, slots=9)
+    students = make_students(subjects=5, students=15)
+    schedule = solve_exam_schedule_packed(students, copy.deepcopy(plan))
+    for day, rooms in schedule.items():
+        for slots in rooms.values():
+            for details in slots.values():
+                if details.get("Fach") in ("Informatik", "Philosophie"):
+                    assert day == "24.06.2025"
+
+
+def test_capacity_error_lists_every_problem():
+    plan = make_plan(days=1, rooms=1, slots=2)
+    students = {'Mathematik': [['A One', 'B Two', 'C Three']], 'Kunst': [['D Four']]}
+    with pytest.raises(CapacityError) as error:
+        solve_exam_schedule_packed(students, copy.deepcopy(plan))
+    assert len(error.value.problems) == 2
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_placed_exams_pass_verification(seed):
+    students, plan = random_case(seed)
+    try:
+        schedule = solve_exam_schedule_packed(students, copy.deepcopy(plan))
+    except CapacityError:
+        return
+    violations = verify_schedule(students, schedule, check_people=False)['violations']
+    assert not violations['unknown_exams']
+    assert not violations['duplicate_exams']
+    assert not violations['fixed_day_violations']
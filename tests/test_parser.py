@@ -0,0 +1,95 @@
+import datetime
+
+import pytest
+from openpyxl import Workbook
+
+import reference
+from benchmarks.generate_inputs import HEADERS, write_workbook
+from first_main import parse_sheets_parallel, process_excel_to_csv_and_dict
+
+
+@pytest.fixture(scope="module")
+def workbook(tmp_path_factory):
+    path = tmp_path_factory.mktemp("workbooks") / "zeit.xlsx"
+    write_workbook(str(path), days=4, rooms=3, slots=8, seed=3)
+    return str(path)
+
+
+@pytest.mark.parametrize("options", [
+    {"vectorized": True},
+    {"vectorized": False},
+    {"streaming": True},
+    {"parallel": True, "max_workers": 2},
+], ids=["vectorized", "row-wise", "streaming", "parallel"])
+def test_parsers_match_original(workbook, options):
+    expected = reference.process_excel_to_dict(workbook)
+    actual = process_excel_to_csv_and_dict(workbook, export_csv=False, **options)
+    assert actual == expected
+    assert list(actual) == list(expected)
+
+
+@pytest.fixture(scope="module")
+def unsorted_workbook(tmp_path_factory):
+    """Sheets out of date order, a repeated date, numeric cells and a row without its trailing cells."""
+    path = tmp_path_factory.mktemp("workbooks") / "unsorted.xlsx"
+    workbook = Workbook(write_only=True)
+    for sheet_name, date, guests in [("Mi", "25.06.2025", 2), ("Di", "24.06.2025", 1.5), ("Mi neu", "25.06.2025", 0)]:
+        worksheet = workbook.create_sheet(sheet_name)
+        worksheet.append([f"{date}: Raum A"])
+        worksheet.append(HEADERS)
+        for slot in range(2):
+            worksheet.append([f"DiA{10 + slot}", None, None, None, guests, 1234, 56.0, "Vorsitz",
+                              datetime.time(8, 0), datetime.time(8, 10), datetime.time(8, 20),
+                              datetime.time(8, 30 + slot), datetime.time(8, 50), 7, 1e20])
+        worksheet.append(["DiA12", None, None, None, None, 1234])
+    workbook.save(path)
+    return str(path)
+
+
+@pytest.mark.parametrize("options", [
+    {"vectorized": True},
+    {"vectorized": False},
+    {"streaming": True},
+], ids=["vectorized", "row-wise", "streaming"])
+def test_parsers_match_original_on_write_only_workbook(unsorted_workbook, options):
+    expected = reference.process_excel_to_dict(unsorted_workbook)
+    actual = process_excel_to_csv_and_dict(unsorted_workbook, export_csv=False, **options)
+    assert actual == expected
+    room = actual["24.06.2025"]["Room A"]
+    # The short row is padded, and whole numbers stored as floats are written without ".0"
+    assert room["DiA12"]["Prüfer*in"] == "1234"
+    assert room["DiA10"]["Protokoll"] == "56"
+    assert room["DiA10"]["Beratung_bis"] == "100000000000000000000"
+    assert room["DiA10"]["Gäste"] == "1.5"
+
+
+def test_parallel_matches_sequential_on_unsorted_sheets(unsorted_workbook):
+    expected = process_excel_to_csv_and_dict(unsorted_workbook, export_csv=False)
+    actual = process_excel_to_csv_and_dict(unsorted_workbook, export_csv=False, parallel=True, max_workers=2)
+    assert actual == expected
+    assert list(actual) == ["25.06.2025", "24.06.2025"]
+
+
+def test_parallel_reads_file_objects_from_the_start(unsorted_workbook):
+    with open(unsorted_workbook, "rb") as f:
+        f.read()
+        unified_dict, errors = parse_sheets_parallel(f, max_workers=2, export_csv=False)
+    assert not errors
+    assert unified_dict == process_excel_to_csv_and_dict(unsorted_workbook, export_csv=False)
+
+
+def read_csv_output(directory):
+    output = directory / "csv_output"
+    return {path.name: path.read_bytes() for path in sorted(output.iterdir())}
+
+
+def test_parallel_csv_export_matches_sequential(unsorted_workbook, tmp_path, monkeypatch):
+    (tmp_path / "sequential").mkdir()
+    (tmp_path / "parallel").mkdir()
+    monkeypatch.chdir(tmp_path / "sequential")
+    process_excel_to_csv_and_dict(unsorted_workbook)
+    monkeypatch.chdir(tmp_path / "parallel")
+    process_excel_to_csv_and_dict(unsorted_workbook, parallel=True, max_workers=3)
+
+    # Both sheets of 25.06.2025 write the same file names; the last sheet's rooms win
+    assert read_csv_output(tmp_path / "parallel") == read_csv_output(tmp_path / "sequential")
@@ -0,0 +1,55 @@
+import os
+import threading
+
+from pipeline_cache import PipelineCache
+
+
+def test_memory_is_bounded_by_bytes():
+    cache = PipelineCache(max_bytes=2500)
+    for i in range(5):
+        cache.put(f"key{i}", b"x" * 1000)
+    assert cache.get("key0") is None
+    assert cache.get("key2") is None
+    assert cache.get("key4") == b"x" * 1000
+    assert cache.get("key3") == b"x" * 1000
+
+    cache.put("huge", b"x" * 5000)
+    assert cache.get("huge") is None
+    assert cache.get("key4") == b"x" * 1000
+
+
+def test_disk_entries_survive_a_restart(tmp_path):
+    PipelineCache(disk_dir=str(tmp_path)).put("plan", {"23.06.2025": {}})
+    assert PipelineCache(disk_dir=str(tmp_path)).get("plan") == {"23.06.2025": {}}
+
+
+def test_tampered_disk_entries_are_not_loaded(tmp_path):
+    PipelineCache(disk_dir=str(tmp_path)).put("plan", {"23.06.2025": {}})
+    path = os.path.join(str(tmp_path), "plan.pkl")
+    with open(path, "r+b") as f:
+        f.seek(-2, os.SEEK_END)
+        f.write(b"!!")
+
+    assert PipelineCache(disk_dir=str(tmp_path)).get("plan", "missing") == "missing"
+    assert not os.path.exists(path)
+
+
+def test_disk_is_bounded_by_bytes(tmp_path):
+    cache = PipelineCache(max_bytes=2500, disk_dir=str(tmp_path))
+    for i in range(5):
+        cache.put(f"key{i}", b"x" * 1000)
+    sizes = [entry.stat().st_size for entry in os.scandir(str(tmp_path)) if entry.name.endswith(".pkl")]
+    assert sum(sizes) <= 2500
+
+
+def test_concurrent_writes_of_one_key(tmp_path):
+    caches = [PipelineCache(disk_dir=str(tmp_path)) for _ in range(8)]
+    values = [bytes([i]) * 200000 for i in range(8)]
+    threads = [threading.Thread(target=cache.put, args=("plan", value)) for cache, value in zip(caches, values)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert PipelineCache(disk_dir=str(tmp_path)).get("plan") in values
+    assert not [name for name in os.listdir(str(tmp_path)) if name.endswith(".tmp")]
@@ -0,0 +1,129 @@
+import copy
+import random
+from collections import Counter
+
+import pytest
+
+from exam_core.solver import solve_exam_schedule
+from plans import make_plan, make_students, random_case
+from reschedule import (BLOCKED_SUBJECT, Rescheduler, UnplacedStudentsError, add_student, block_slot_group,
+                        move_subject, reschedule)
+
+
+def solved_case(seed):
+    students, plan = random_case(seed)
+    return students, solve_exam_schedule(students, plan)
+
+
+def exams_of(schedule):
+    return Counter((f"{details['Vorname']} {details['Nachname']}", details['Fach'])
+                   for rooms in schedule.values() for slots in rooms.values() for details in slots.values()
+                   if details['Fach'] and details['Fach'] != BLOCKED_SUBJECT)
+
+
+def required_exams(students):
+    return Counter((student, subject) for subject, groups in students.items() for group in groups for student in group)
+
+
+def index_state(rescheduler):
+    used = {(group['day'], group['room'], group['slots'][0]): group['used']
+            for group in rescheduler.slot_index.slot_groups}
+    subjects = {subject: set(slots) for subject, slots in rescheduler.slots_of_subject.items() if slots}
+    students = {student: set(slots) for student, slots in rescheduler.slots_of_student.items() if slots}
+    return used, subjects, students, dict(rescheduler.slot_index.free_per_day)
+
+
+def random_changes(students, schedule, rng, count=6):
+    subjects = list(students)
+    slots = [(day, room, slot_key) for day, rooms in schedule.items() for room, room_slots in rooms.items()
+             for slot_key in room_slots]
+    changes = []
+    for i in range(count):
+        action = rng.choice(['remove_student', 'add_student', 'block_slot_group', 'move_subject'])
+        if action == 'remove_student':
+            subject = rng.choice(subjects)
+            members = [student for group in students[subject] for student in group]
+            if members:
+                changes.append({'action': action, 'student': rng.choice(members), 'subject': subject})
+        elif action == 'add_student':
+            changes.append({'action': action, 'student': f"Spät {i}", 'subject': rng.choice(subjects)})
+        elif action == 'block_slot_group':
+            day, room, slot_key = rng.choice(slots)
+            changes.append({'action': action, 'day': day, 'room': room, 'slot': slot_key})
+        else:
+            changes.append({'action': action, 'subject': rng.choice(subjects), 'day': rng.choice(list(schedule))})
+    return changes
+
+
+@pytest.mark.parametrize("seed", range(80))
+def test_index_stays_in_sync_across_changes(seed):
+    students, schedule = solved_case(seed)
+    missing_before = required_exams(students) - exams_of(schedule)
+    rescheduler = Rescheduler(students, schedule)
+    for change in random_changes(students, schedule, random.Random(seed)):
+        try:
+            rescheduler.apply(change)
+        except ValueError:
+            # Slots outside a full slot group cannot be blocked
+            continue
+    assert index_state(rescheduler) == index_state(Rescheduler(copy.deepcopy(students), copy.deepcopy(schedule)))
+
+    # No exam appears twice, and every exam that lost its slot is reported
+    assert not exams_of(schedule) - required_exams(students)
+    missing = required_exams(students) - exams_of(schedule) - Counter(rescheduler.unplaced)
+    assert not missing - missing_before
+
+
+def test_unknown_slot_is_reported():
+    students, schedule = solved_case(0)
+    day = next(iter(schedule))
+    room = next(iter(schedule[day]))
+    with pytest.raises(ValueError, match="no slot 'XX99'"):
+        block_slot_group(students, schedule, day, room, 'XX99')
+    with pytest.raises(ValueError, match="no day"):
+        move_subject(students, schedule, next(iter(students)), '01.01.1999')
+
+
+def test_displaced_students_that_do_not_fit_are_reported():
+    plan = make_plan(days=1, rooms=1, slots=3)
+    students = {'Mathematik': [['Anna Muster', 'Ben Beispiel']]}
+    schedule = solve_exam_schedule(students, plan)
+    day = next(iter(schedule))
+    with pytest.raises(UnplacedStudentsError) as error:
+        block_slot_group(students, schedule, day, 'Room A', next(iter(schedule[day]['Room A'])))
+    assert error.value.unplaced == [('Anna Muster', 'Mathematik'), ('Ben Beispiel', 'Mathematik')]
+
+
+def test_move_subject_sharing_a_slot_group():
+    plan = make_plan(days=2, rooms=1, slots=3)
+    first_day, second_day = plan
+    slots = list(plan[first_day]['Room A'].values())
+    slots[0].update({'Vorname': 'Anna', 'Nachname': 'Muster', 'Fach': 'Mathematik'})
+    slots[1].update({'Vorname': 'Ben', 'Nachname': 'Beispiel', 'Fach': 'Kunst'})
+    students = {'Mathematik': [['Anna Muster']], 'Kunst': [['Ben Beispiel']]}
+    move_subject(students, plan, 'Mathematik', first_day)
+    move_subject(students, plan, 'Mathematik', second_day)
+    assert exams_of(plan) == required_exams(students)
+    assert any(details['Fach'] == 'Mathematik' for details in plan[second_day]['Room A'].values())
+
+
+def test_added_student_joins_the_group_in_their_slot_group():
+    plan = make_plan(days=2, rooms=2, slots=6)
+    students = {'Mathematik': [['Anna Muster'], ['Ben Beispiel', 'Cem Test']]}
+    schedule = solve_exam_schedule(students, plan)
+    add_student(students, schedule, 'Dora Spät', 'Mathematik')
+    slots = schedule[next(iter(schedule))]['Room A']
+    first_group = [f"{details['Vorname']} {details['Nachname']}" for details in list(slots.values())[:3]
+                   if details['Fach']]
+    assert first_group == ['Anna Muster', 'Dora Spät']
+    assert students['Mathematik'] == [['Anna Muster', 'Dora Spät'], ['Ben Beispiel', 'Cem Test']]
+
+
+def test_reschedule_applies_changes_in_order():
+    students = make_students(subjects=5, students=15, seed=2)
+    schedule = solve_exam_schedule(students, make_plan(days=3, rooms=2, slots=9, seed=2))
+    reschedule(students, schedule, [
+        {'action': 'add_student', 'student': 'Dora Spät', 'subject': 'Fach 0'},
+        {'action': 'remove_student', 'student': 'Dora Spät'},
+    ])
+    assert exams_of(schedule) == required_exams(students)
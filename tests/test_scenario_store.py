@@ -0,0 +1,172 @@
+import copy
+import json
+import pickle
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import scenario_store
+from plans import make_plan
+from scenario_store import ScenarioStore, apply_delta, diff_nested
+
+
+def variant(plan, number):
+    """A copy of `plan` with one examiner changed."""
+    plan = copy.deepcopy(plan)
+    day = sorted(plan)[number % len(plan)]
+    room = sorted(plan[day])[0]
+    slot = sorted(plan[day][room])[number % len(plan[day][room])]
+    plan[day][room][slot]['Prüfer*in'] = f"Neu {number}"
+    return plan
+
+
+def assert_same_order(a, b):
+    assert list(a) == list(b)
+    for key, value in a.items():
+        if isinstance(value, dict):
+            assert_same_order(value, b[key])
+
+
+def test_delta_keeps_key_order():
+    old = make_plan(days=3, rooms=2, slots=6)
+    new = copy.deepcopy(old)
+    first_day, second_day = list(new)[:2]
+    # A new room at the front, rooms of one day swapped and a slot's fields reordered
+    new[first_day] = {'Room 0': copy.deepcopy(new[first_day]['Room A']), **new[first_day]}
+    new[second_day] = dict(reversed(list(new[second_day].items())))
+    room_slots = new[second_day]['Room A']
+    slot_id = next(iter(room_slots))
+    room_slots[slot_id] = dict(reversed(list(room_slots[slot_id].items())))
+
+    rebuilt = apply_delta(copy.deepcopy(old), diff_nested(old, new))
+    assert rebuilt == new
+    assert_same_order(rebuilt, new)
+
+
+def test_store_round_trips_deltas_in_order(tmp_path):
+    store = ScenarioStore(str(tmp_path))
+    plan = make_plan(days=3, rooms=2, slots=9)
+    reordered = dict(reversed(list(variant(plan, 1).items())))
+    store.put('a', plan)
+    store.put('b', reordered)
+    assert store.info('b')['base'] == 'a'
+    assert_same_order(store.get('b'), reordered)
+    assert store.get('b') == reordered
+
+
+def test_eviction_keeps_bases(tmp_path):
+    plan = make_plan(days=3, rooms=2, slots=9)
+    store = ScenarioStore(str(tmp_path))
+    for number in range(4):
+        store.put(f"v{number}", variant(plan, number))
+    store.max_bytes = store.info('v0')['bytes'] + 1
+    store.evict()
+    for key in store.keys():
+        assert store.get(key) is not None
+
+
+def test_eviction_fits_the_budget_and_keeps_the_latest_put(tmp_path):
+    plan = make_plan(days=3, rooms=2, slots=9)
+    store = ScenarioStore(str(tmp_path))
+    for number in range(6):
+        store.put(f"v{number}", variant(plan, number))
+    # A full snapshot and a chain of deltas against it: the old deltas go first,
+    # then their base once no delta is left to depend on it
+    assert store.info('v5')['base'] is not None
+    store.max_bytes = store.disk_usage() * 3 // 10
+    store.put('latest', variant(plan, 6), base=None)
+
+    assert store.disk_usage() <= store.max_bytes
+    assert store.get('latest') == variant(plan, 6)
+    for key in store.keys():
+        base = store.info(key)['base']
+        assert base is None or base in store
+        assert store.get(key) is not None
+
+    # A snapshot larger than the whole budget is kept until the next put
+    store.max_bytes = 1
+    store.put('huge', plan, base=None)
+    assert store.keys() == ['huge']
+
+
+def test_keys_reads_each_header_once(tmp_path, monkeypatch):
+    store = ScenarioStore(str(tmp_path))
+    plan = make_plan(days=2, rooms=1, slots=3)
+    store.put('a', plan)
+    store.put('b', variant(plan, 1), kind='schedule')
+
+    opened = []
+    real_open = open
+
+    def counting_open(path, *args, **kwargs):
+        opened.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(scenario_store, 'open', counting_open, raising=False)
+    assert store.keys('schedule') == ['b']
+    assert sorted(store.keys()) == ['a', 'b']
+    assert not opened
+
+    # A snapshot stored again under the same key by another process is read anew
+    other = ScenarioStore(str(tmp_path))
+    (tmp_path / 'b.snap').unlink()
+    other.put('b', variant(plan, 2), kind='plan', base=None)
+    assert sorted(store.keys('plan')) == ['a', 'b']
+
+
+def _put_variants(directory, first, count, max_bytes):
+    store = ScenarioStore(directory, max_bytes=max_bytes)
+    plan = make_plan(days=3, rooms=2, slots=9)
+    for number in range(first, first + count):
+        store.put(f"v{number}", variant(plan, number))
+    return True
+
+
+def test_processes_sharing_a_store_keep_every_base(tmp_path):
+    plan = make_plan(days=3, rooms=2, slots=9)
+    store = ScenarioStore(str(tmp_path))
+    store.put('full', plan)
+    max_bytes = store.info('full')['bytes'] * 2
+    with ProcessPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(_put_variants, str(tmp_path), first * 10, 10, max_bytes) for first in range(3)]
+        assert all(future.result() for future in futures)
+    for key in store.keys():
+        base = store.info(key)['base']
+        assert base is None or base in store
+        assert store.get(key) is not None
+
+
+class Exploit:
+    def __reduce__(self):
+        return (print, ("unpickled",))
+
+
+def test_unsigned_snapshots_are_not_unpickled(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(scenario_store, 'msgpack', None)
+    store = ScenarioStore(str(tmp_path))
+    store.put('a', make_plan(days=1, rooms=1, slots=3))
+    # A snapshot in the old, unsigned layout, and one signed with another key
+    header = json.dumps({'kind': 'plan', 'base': None, 'depth': 0, 'codec': 'pickle'}).encode('utf-8') + b'\n'
+    (tmp_path / 'b.snap').write_bytes(header + zlib.compress(pickle.dumps(Exploit())))
+    ScenarioStore(str(tmp_path / 'other'), secret=b'other key').put('c', Exploit())
+    (tmp_path / 'other' / 'c.snap').rename(tmp_path / 'c.snap')
+
+    assert store.get('b') is None
+    assert store.get('c') is None
+    assert 'unpickled' not in capsys.readouterr().out
+    assert sorted(store.keys()) == ['a']
+    assert store.get('a') == make_plan(days=1, rooms=1, slots=3)
+    assert ScenarioStore(str(tmp_path)).get('a') == make_plan(days=1, rooms=1, slots=3)
+
+
+def test_msgpack_snapshots_round_trip(tmp_path):
+    pytest.importorskip("msgpack")
+    store = ScenarioStore(str(tmp_path))
+    plan = make_plan(days=3, rooms=2, slots=9)
+    store.put('a', plan)
+    store.put('b', variant(plan, 1))
+    assert store.info('a')['codec'] == 'msgpack'
+    assert store.info('b')['base'] == 'a'
+    assert store.get('a') == plan
+    assert store.get('b') == variant(plan, 1)
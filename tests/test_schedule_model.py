@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from benchmarks.generate_inputs import write_workbook
+from exam_core import Schedule, save_json, solve_exam_schedule
+from exam_core.schedule_model import parse_minutes
+from first_main import process_excel_to_csv_and_dict
+from plans import make_plan, make_students
+from verify_schedule import PeopleIntervals, verify_schedule
+
+
+def assert_same_order(a, b):
+    assert list(a) == list(b)
+    for key, value in a.items():
+        if isinstance(value, dict):
+            assert_same_order(value, b[key])
+
+
+@pytest.fixture(scope="module")
+def plan(tmp_path_factory):
+    path = tmp_path_factory.mktemp("workbooks") / "zeit.xlsx"
+    write_workbook(str(path), days=3, rooms=2, slots=6, seed=3)
+    return process_excel_to_csv_and_dict(str(path), export_csv=False)
+
+
+def test_parsed_plan_round_trips(plan):
+    model = Schedule.from_dict(plan)
+
+    assert len(model) == sum(len(slots) for rooms in plan.values() for slots in rooms.values())
+    assert model.to_dict() == plan
+    assert_same_order(model.to_dict(), plan)
+    slot = next(iter(model))
+    details = plan[slot.day][slot.room][slot.slot_id]
+    assert model.get(slot.day, slot.room, slot.slot_id) is slot
+    # Times are held as minutes and written back in the plan's format
+    assert slot.beginn_pruefung == parse_minutes(details['Beginn_Prüfung'])
+
+
+def test_final_schedule_json_round_trips(tmp_path):
+    schedule = solve_exam_schedule(make_students(subjects=5, students=15), make_plan(days=2, rooms=2, slots=9))
+    save_json(schedule, str(tmp_path / "final_schedule.json"))
+
+    model = Schedule.from_json(str(tmp_path / "final_schedule.json"))
+    model.to_json(str(tmp_path / "again.json"))
+
+    assert (tmp_path / "again.json").read_bytes() == (tmp_path / "final_schedule.json").read_bytes()
+
+
+def test_values_that_are_not_text_round_trip():
+    schedule = {
+        '24.06.2025': {
+            'Room A': {
+                'MoA10': {
+                    # Out of column order, with numbers, None, a missing field and an extra one
+                    'Fach': 'Mathematik', 'Nachname': 12345, 'Vorname': None, 'Gäste': 2.5, 'Prüfer*in': True,
+                    'Beginn_Prüfung': 0.375, 'Ende_Prüfung': '8:30', 'Beratung_bis': None,
+                    'Ankunft_in_Warteraum_1': '', 'Beginn_d_Vorbereitung': '07:30:00', 'Notiz': ['Raum', 1],
+                },
+                'MoA11': {},
+            },
+        },
+    }
+    text = json.dumps(schedule)
+
+    model = Schedule.from_dict(json.loads(text))
+
+    assert json.dumps(model.to_dict()) == text
+    slot = model.get('24.06.2025', 'Room A', 'MoA10')
+    assert slot.minutes('Beginn_Prüfung') is None
+    assert slot.minutes('Ende_Prüfung') == 8 * 60 + 30
+    assert slot.minutes('Beginn_d_Vorbereitung') == 7 * 60 + 30
+    assert model.times('Beginn_d_Vorbereitung') == [7 * 60 + 30, None]
+    assert model.column('Nachname') == [12345, None]
+
+
+def test_people_intervals_from_a_schedule_model():
+    students = make_students(subjects=5, students=15)
+    plan = make_plan(days=2, rooms=2, slots=9)
+    schedule = solve_exam_schedule(students, json.loads(json.dumps(plan)))
+
+    report = verify_schedule(students, schedule, people=PeopleIntervals(Schedule.from_dict(plan)))
+
+    assert report == verify_schedule(students, schedule)
@@ -0,0 +1,64 @@
+import copy
+import datetime
+from collections import Counter
+
+import pytest
+
+import reference
+from exam_core.solver import (find_subject_components, score_schedule, solve_exam_schedule,
+                              solve_exam_schedule_parallel)
+from plans import make_plan, make_students, random_case
+
+
+def solve_both(students, plan):
+    expected = reference.solve_exam_schedule(copy.deepcopy(students), copy.deepcopy(plan))
+    actual = solve_exam_schedule(copy.deepcopy(students), copy.deepcopy(plan))
+    return expected, actual
+
+
+@pytest.mark.parametrize("seed", range(150))
+def test_greedy_matches_original_solver(seed):
+    expected, actual = solve_both(*random_case(seed))
+    assert actual == expected
+
+
+def test_greedy_matches_original_without_fixed_day():
+    plan = make_plan(days=1, rooms=2, slots=6, start=datetime.date(2026, 6, 10))
+    assert list(plan) == ['10.06.2026']
+    expected, actual = solve_both(make_students(subjects=5, students=12), plan)
+    assert actual == expected
+    assert any(details['Fach'] == 'Informatik' for slots in actual['10.06.2026'].values()
+               for details in slots.values())
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_parallel_solver_without_fixed_day(max_workers):
+    students = make_students(subjects=5, students=12)
+    plan = make_plan(days=1, rooms=2, slots=9, start=datetime.date(2026, 6, 10))
+    assert len(find_subject_components(students)) == 1
+
+    expected = solve_exam_schedule(copy.deepcopy(students), copy.deepcopy(plan))
+    actual = solve_exam_schedule_parallel(copy.deepcopy(students), copy.deepcopy(plan), max_workers=max_workers)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_parallel_solver_places_each_exam_once(seed):
+    students, plan = random_case(seed)
+    expected = solve_exam_schedule(copy.deepcopy(students), copy.deepcopy(plan))
+    schedule = solve_exam_schedule_parallel(students, plan, max_workers=1)
+    required = Counter((student, subject) for subject, groups in students.items()
+                       for group in groups for student in group)
+    placed = Counter((f"{details['Vorname']} {details['Nachname']}", details['Fach'])
+                     for rooms in schedule.values() for slots in rooms.values() for details in slots.values()
+                     if details['Fach'])
+    assert not placed - required
+    assert score_schedule(students, schedule)[0] <= score_schedule(students, expected)[0]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_parallel_solver_is_deterministic(seed):
+    students, plan = random_case(seed)
+    one = solve_exam_schedule_parallel(students, copy.deepcopy(plan), max_workers=1)
+    several = solve_exam_schedule_parallel(students, copy.deepcopy(plan), max_workers=2)
+    assert several == one
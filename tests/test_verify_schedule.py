@@ -0,0 +1,81 @@
+import copy
+import datetime
+
+from exam_core.solver import solve_exam_schedule
+from plans import make_plan, make_students, random_case
+from reschedule import block_slot_group
+from verify_schedule import PeopleIntervals, verify_schedule
+
+
+def two_room_plan(second_examiner):
+    """One day, two rooms with one slot each; the slots overlap in time."""
+    plan = make_plan(days=1, rooms=2, slots=1)
+    day = next(iter(plan))
+    (room_a, slots_a), (room_b, slots_b) = plan[day].items()
+    for slots, examiner in ((slots_a, 'T1'), (slots_b, second_examiner)):
+        for details in slots.values():
+            details.update({'Prüfer*in': examiner, 'Protokoll': '', 'Vorsitz': '',
+                            'Vorname': 'Anna', 'Nachname': examiner, 'Fach': 'Fach 1'})
+    return plan, day, room_a, room_b
+
+
+def test_blocked_slots_are_not_unknown_exams():
+    students = make_students(subjects=4, students=10)
+    schedule = solve_exam_schedule(students, make_plan(days=2, rooms=2, slots=6))
+    day = next(iter(schedule))
+    room = next(iter(schedule[day]))
+    slot_key = next(iter(schedule[day][room]))
+    block_slot_group(students, schedule, day, room, slot_key)
+
+    report = verify_schedule(students, schedule)
+
+    assert report['violations']['unknown_exams'] == []
+
+
+def test_people_in_two_rooms_at_once_are_reported():
+    students = {'Fach 1': [['Anna T1', 'Anna T2']]}
+    plan, day, room_a, room_b = two_room_plan('T1')
+
+    clashes = verify_schedule(students, plan)['violations']['people_double_bookings']
+
+    assert [(c['person'], c['day'], c['other_room'], c['room']) for c in clashes] == [('T1', day, room_a, room_b)]
+    plan, *_ = two_room_plan('T2')
+    assert verify_schedule(students, plan)['violations']['people_double_bookings'] == []
+
+
+def test_reused_people_intervals_give_the_same_report():
+    for seed in range(40):
+        students, plan = random_case(seed)
+        people = PeopleIntervals(plan)
+        schedule = solve_exam_schedule(students, copy.deepcopy(plan))
+        assert verify_schedule(students, schedule, people=people) == verify_schedule(students, schedule), seed
+
+
+def test_people_intervals_of_another_plan_are_not_used():
+    students, plan = random_case(2)
+    schedule = solve_exam_schedule(students, copy.deepcopy(plan))
+    other = PeopleIntervals(make_plan(days=1, rooms=1, slots=3, seed=5))
+
+    assert verify_schedule(students, schedule, people=other) == verify_schedule(students, schedule)
+
+
+def test_fixed_day_missing_from_plan_is_not_enforced():
+    students = make_students(subjects=5, students=12)
+    schedule = solve_exam_schedule(students, make_plan(days=2, rooms=2, slots=9, start=datetime.date(2026, 6, 8)))
+    assert '24.06.2025' not in schedule
+
+    report = verify_schedule(students, schedule, check_people=False)
+
+    assert report['violations']['fixed_day_violations'] == []
+
+
+def test_fixed_day_in_plan_is_enforced():
+    students = make_students(subjects=3, students=6)
+    schedule = solve_exam_schedule(students, make_plan(days=2, rooms=2, slots=9))
+    assert any(details['Fach'] == 'Informatik' for slots in schedule['24.06.2025'].values()
+               for details in slots.values())
+
+    report = verify_schedule(students, schedule, fixed_subjects={'Informatik': '23.06.2025'}, check_people=False)
+
+    violations = report['violations']['fixed_day_violations']
+    assert violations and all(violation['day'] == '24.06.2025' for violation in violations)
@@ -1,29 +1,157 @@
+import csv
 import json
+
+import numpy as np
 import pandas as pd
 
+from exam_core.instrumentation import NO_INSTRUMENTATION
+
+# Columns stored as categoricals in the columnar path: few distinct values, many rows.
+CATEGORICAL_COLUMNS = ["Date", "Room", "Fach"]
+
 
-def convert_to_csv(raw_data):
+def convert_to_csv(raw_data, stats=None, columnar=False):
     # Load the JSON file
     # with open(final_json, "r", encoding="utf-8") as f:
     #     raw_data = json.load(f)
 
-    # Flatten the nested structure
-    rows = []
+    stats = stats if stats is not None else NO_INSTRUMENTATION
+
+    with stats.stage("flatten"):
+        if columnar:
+            return convert_to_columns(raw_data)
+
+        # Flatten the nested structure
+        rows = []
+
+        for date, rooms in raw_data.items():
+            for room, slots in rooms.items():
+                for slot_id, exam in slots.items():
+                    row = {
+                        "Date": date,
+                        "Room": room,
+                        "Slot": slot_id,
+                        **exam  # unpack the inner exam dictionary
+                    }
+                    rows.append(row)
+
+        # Convert to DataFrame
+        df = pd.DataFrame(rows)
+
+    return df
+
+    #df.to_csv("exams_optimised_gemini.csv", index=False, encoding="utf-8-sig")
+
+
+def _exam_columns(raw_data):
+    """Returns the exam field names in order of first appearance, like the row-wise DataFrame."""
+    columns = {}
+    for rooms in raw_data.values():
+        for slots in rooms.values():
+            for exam in slots.values():
+                columns.update(dict.fromkeys(exam))
+    return list(columns)
+
+
+def convert_to_columns(raw_data, categorical=True):
+    """
+    Flattens the nested schedule column by column instead of building a dict per slot.
 
+    Gives the same table as `convert_to_csv`, except that Date, Room and Fach
+    are categoricals (when `categorical` is set), which keeps large multi-year
+    schedules small.
+
+    Args:
+        raw_data (dict): The date -> room -> slot -> exam schedule.
+        categorical (bool): Store the CATEGORICAL_COLUMNS as pandas categoricals.
+
+    Returns:
+        pd.DataFrame: One row per slot.
+    """
+    dates, rooms_column, slot_ids, exams = [], [], [], []
     for date, rooms in raw_data.items():
         for room, slots in rooms.items():
-            for slot_id, exam in slots.items():
-                row = {
-                    "Date": date,
-                    "Room": room,
-                    "Slot": slot_id,
-                    **exam  # unpack the inner exam dictionary
-                }
-                rows.append(row)
+            dates.extend([date] * len(slots))
+            rooms_column.extend([room] * len(slots))
+            slot_ids.extend(slots.keys())
+            exams.extend(slots.values())
 
-    # Convert to DataFrame
-    df = pd.DataFrame(rows)
+    columns = {"Date": dates, "Room": rooms_column, "Slot": slot_ids}
+    for field in _exam_columns(raw_data):
+        columns[field] = [exam.get(field, np.nan) for exam in exams]
 
+    df = pd.DataFrame(columns)
+    if categorical:
+        for column in CATEGORICAL_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].astype("category")
     return df
 
-    #df.to_csv("exams_optimised_gemini.csv", index=False, encoding="utf-8-sig")
\ No newline at end of file
+
+def iter_csv_chunks(raw_data, chunk_size=10000):
+    """
+    Streams the flattened schedule as CSV text, straight from the nested dicts.
+
+    Args:
+        raw_data (dict): The date -> room -> slot -> exam schedule.
+        chunk_size (int): Rows per yielded chunk.
+
+    Yields:
+        str: CSV text; the first chunk starts with the header row.
+    """
+    fields = _exam_columns(raw_data)
+
+    class _Buffer:
+        def __init__(self):
+            self.parts = []
+
+        def write(self, text):
+            self.parts.append(text)
+
+    buffer = _Buffer()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["Date", "Room", "Slot"] + fields)
+    rows_in_chunk = 0
+    for date, rooms in raw_data.items():
+        for room, slots in rooms.items():
+            for slot_id, exam in slots.items():
+                writer.writerow([date, room, slot_id] + [exam.get(field, "") for field in fields])
+                rows_in_chunk += 1
+                if rows_in_chunk >= chunk_size:
+                    yield "".join(buffer.parts)
+                    buffer.parts = []
+                    rows_in_chunk = 0
+    if buffer.parts:
+        yield "".join(buffer.parts)
+
+
+def write_csv_chunks(raw_data, path, chunk_size=10000, encoding="utf-8-sig"):
+    """Writes the flattened schedule to a CSV file chunk by chunk (see `iter_csv_chunks`)."""
+    with open(path, "w", encoding=encoding, newline="") as f:
+        for chunk in iter_csv_chunks(raw_data, chunk_size):
+            f.write(chunk)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Parquet and Arrow export need pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def write_parquet(df, path):
+    """Writes a flattened schedule (from `convert_to_columns`) as Parquet. Needs pyarrow."""
+    _require_pyarrow()
+    df.to_parquet(path, index=False)
+
+
+def write_arrow(df, path):
+    """Writes a flattened schedule (from `convert_to_columns`) as an Arrow IPC file. Needs pyarrow."""
+    pyarrow = _require_pyarrow()
+    import pyarrow.ipc
+
+    table = pyarrow.Table.from_pandas(df, preserve_index=False)
+    with pyarrow.OSFile(path, "wb") as sink:
+        with pyarrow.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
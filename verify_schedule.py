@@ -0,0 +1,372 @@
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from exam_core.availability import ROLE_SPANS
+from exam_core.schedule_model import TIME_FIELDS, Schedule, parse_minutes
+from exam_core.solver import FIXED_SUBJECTS
+from reschedule import BLOCKED_SUBJECT
+
+# Where a student's exam starts, in order of preference; it ends with Ende_Prüfung.
+STUDENT_START_FIELDS = ['Ankunft_in_Warteraum_1', 'Beginn_d_Vorbereitung', 'Beginn_Prüfung']
+
+# Larger than any minute of a day; offsets the running maximum of each person's day (see PeopleIntervals).
+DAY_MINUTES = 24 * 60
+
+VIOLATION_KINDS = ['unplaced_exams', 'duplicate_exams', 'unknown_exams', 'student_double_bookings',
+                   'people_double_bookings', 'fixed_day_violations', 'split_subjects']
+
+
+def _minutes(values):
+    """Converts a Series of time strings to minutes after midnight (NaN where there is no time)."""
+    # A plan has few distinct times, so parse each one once and gather the results.
+    codes, uniques = pd.factorize(values.astype(str))
+    parsed = np.array([parse_minutes(text) for text in uniques] + [None], dtype=float)
+    return pd.Series(parsed[codes], index=values.index)
+
+
+def is_exam(details):
+    """Returns True if a slot holds an exam (not free and not blocked)."""
+    return bool(details.get('Fach')) and details['Fach'] != BLOCKED_SUBJECT
+
+
+def exams_frame(schedule_data):
+    """
+    Flattens the exams of a schedule into one DataFrame.
+
+    Only the columns the student checks need are kept, and times are converted
+    to minutes once for the whole column.
+
+    Args:
+        schedule_data (dict): The solved exam schedule.
+
+    Returns:
+        pd.DataFrame: One row per slot with an exam; blocked slots are left out.
+    """
+    fields = ['Vorname', 'Nachname', 'Fach', 'Ende_Prüfung'] + STUDENT_START_FIELDS
+
+    columns = {'Date': [], 'Room': [], 'Slot': []}
+    columns.update({field: [] for field in fields})
+    for date, rooms in schedule_data.items():
+        for room, slots in rooms.items():
+            for slot_id, details in slots.items():
+                if not is_exam(details):
+                    continue
+                columns['Date'].append(date)
+                columns['Room'].append(room)
+                columns['Slot'].append(slot_id)
+                for field in fields:
+                    columns[field].append(details.get(field) or '')
+
+    df = pd.DataFrame(columns, dtype=object)
+    df['Student'] = df['Vorname'].astype(str) + ' ' + df['Nachname'].astype(str)
+    for field in TIME_FIELDS.intersection(fields):
+        df[field] = _minutes(df[field])
+    return df
+
+
+def find_overlaps(intervals, keys):
+    """
+    Finds intervals that overlap an earlier one with the same keys, by sorting.
+
+    After sorting by keys and start, an interval overlaps an earlier one exactly
+    when it starts before the largest end seen so far in its group. The row that
+    holds that largest end is reported as the other side of the clash.
+
+    Args:
+        intervals (pd.DataFrame): Rows with "start" and "end" columns (minutes, half-open).
+        keys (list): Columns that must match for two intervals to clash.
+
+    Returns:
+        tuple: (clashing rows, the rows they clash with), aligned by position.
+    """
+    df = intervals.sort_values(keys + ['start', 'end'], kind='mergesort').reset_index(drop=True)
+    if df.empty:
+        return df, df
+    groups = _group_ids(*(pd.factorize(df[key])[0] for key in keys))
+    clashing, others = _sorted_overlaps(df['start'].to_numpy(), df['end'].to_numpy(), groups)
+    return df[clashing].reset_index(drop=True), df.iloc[others].reset_index(drop=True)
+
+
+def _sorted_overlaps(start, end, groups):
+    """
+    The sweep behind `find_overlaps`, on arrays already sorted by group, start and end.
+
+    Returns:
+        tuple: (mask of the clashing intervals, positions of the intervals they clash with)
+    """
+    running_end = _running_max(end, groups)
+    # Position of the interval holding the running maximum. The first interval of a group
+    # always holds it, so the carried position never leaks into the next group.
+    holder = np.maximum.accumulate(np.where(end == running_end, np.arange(len(end)), -1))
+    clashing = np.zeros(len(end), dtype=bool)
+    clashing[1:] = (groups[1:] == groups[:-1]) & (start[1:] < running_end[:-1])
+    return clashing, holder[np.flatnonzero(clashing) - 1]
+
+
+def _group_ids(*keys):
+    """Numbers the runs of equal keys in sorted arrays 0, 1, 2, ..."""
+    changed = np.zeros(len(keys[0]), dtype=bool)
+    for key in keys:
+        changed[1:] |= key[1:] != key[:-1]
+    return np.cumsum(changed)
+
+
+def _running_max(values, groups):
+    """Running maximum of `values` within each run of `groups` (values must lie in [0, DAY_MINUTES))."""
+    offset = groups * DAY_MINUTES
+    return np.maximum.accumulate(values + offset) - offset
+
+
+def _student_intervals(df):
+    # The first start field that holds a time
+    start = pd.Series(np.nan, index=df.index)
+    for field in reversed(STUDENT_START_FIELDS):
+        start = df[field].where(df[field].notna(), start)
+    intervals = df[['Student', 'Date', 'Room', 'Slot']].assign(start=start, end=df['Ende_Prüfung'])
+    return intervals[(intervals['start'] < intervals['end'])]
+
+
+class PeopleIntervals:
+    """
+    When each examiner and supervisor would be busy in every slot of a plan, as arrays.
+
+    The plan's people and times do not change when subjects are placed, so the
+    intervals are read from the plan's `Schedule` columns and sorted once per plan
+    (by person, day, room and start) and every verification of a schedule solved
+    from that plan only selects the rows of its booked slots. All further work is vectorized over those arrays.
+    """
+
+    def __init__(self, schedule_data):
+        """
+        Args:
+            schedule_data (dict or Schedule): A plan, or any schedule solved from it.
+        """
+        model = schedule_data if isinstance(schedule_data, Schedule) else Schedule.from_dict(schedule_data)
+        self.slot_keys = [(slot.day, slot.room, slot.slot_id) for slot in model]
+        self.positions = {key: position for position, key in enumerate(self.slot_keys)}
+
+        # Each time the roles read, as minutes per slot (NaN where there is none)
+        times = {
+            field: np.array(model.times(field), dtype=float)
+            for field in {field for span in ROLE_SPANS.values() for field in span if field}
+        }
+
+        # Rows in role-major order, as the roles are listed in ROLE_SPANS
+        names, slots, starts, ends = [], [], [], []
+        for role, (start_field, end_field, fallback_end_field) in ROLE_SPANS.items():
+            people = model.column(role)
+            start, end = times[start_field], times[end_field]
+            if fallback_end_field:
+                end = np.where(np.isnan(end), times[fallback_end_field], end)
+            has_person = np.array([bool(name) for name in people], dtype=bool)
+            positions = np.flatnonzero(has_person & (start < end))
+            names.extend(str(people[position]) for position in positions)
+            slots.append(positions)
+            starts.append(start[positions])
+            ends.append(end[positions])
+
+        self.people, person = np.unique(np.array(names, dtype=object), return_inverse=True)
+        self.days, day = np.unique(np.array([key[0] for key in self.slot_keys], dtype=object), return_inverse=True)
+        self.rooms, room = np.unique(np.array([key[1] for key in self.slot_keys], dtype=object), return_inverse=True)
+        slot = np.concatenate(slots).astype(np.int64)
+        start = np.concatenate(starts).astype(np.int64)
+        end = np.concatenate(ends).astype(np.int64)
+        slot_day, slot_room = day.astype(np.int64), room.astype(np.int64)
+
+        order = np.lexsort((np.arange(len(slot)), start, slot_room[slot], slot_day[slot], person))
+        self.person = person[order].astype(np.int64)
+        self.slot = slot[order]
+        self.day = slot_day[self.slot]
+        self.room = slot_room[self.slot]
+        self.start = start[order]
+        self.end = end[order]
+
+    def booked_slots(self, schedule_data):
+        """
+        Marks the slots of the plan that hold an exam in `schedule_data`.
+
+        Returns:
+            np.ndarray: One flag per slot, or None if `schedule_data` has slots the plan does not.
+        """
+        booked = np.zeros(len(self.slot_keys), dtype=bool)
+        for date, rooms in schedule_data.items():
+            for room, slots in rooms.items():
+                for slot_id, details in slots.items():
+                    if is_exam(details):
+                        position = self.positions.get((date, room, slot_id))
+                        if position is None:
+                            return None
+                        booked[position] = True
+        return booked
+
+    def clashes(self, schedule_data):
+        """
+        Finds people booked into two rooms at once in a schedule solved from this plan.
+
+        Overlaps within a room are part of the plan, so each person's bookings are
+        merged into blocks per room first; any overlap left is between different rooms.
+
+        Args:
+            schedule_data (dict): The solved exam schedule.
+
+        Returns:
+            list: "person", "day", "room", "slot", "other_room" and "other_slot" records.
+        """
+        booked = self.booked_slots(schedule_data)
+        if booked is None:
+            return PeopleIntervals(schedule_data).clashes(schedule_data)
+        rows = booked[self.slot]
+        person, day, room = self.person[rows], self.day[rows], self.room[rows]
+        slot, start, end = self.slot[rows], self.start[rows], self.end[rows]
+        if not len(person):
+            return []
+
+        # Blocks of overlapping bookings per person, day and room
+        same_room = _group_ids(person, day, room)
+        previous_end = np.empty(len(start))
+        previous_end[1:] = _running_max(end, same_room)[:-1]
+        new_block = np.ones(len(start), dtype=bool)
+        new_block[1:] = (same_room[1:] != same_room[:-1]) | (start[1:] >= previous_end[1:])
+        first = np.flatnonzero(new_block)
+        block_end = np.maximum.reduceat(end, first)
+        person, day, room, slot, start = person[first], day[first], room[first], slot[first], start[first]
+
+        # Then find the blocks that overlap another one of the same person and day
+        order = np.lexsort((np.arange(len(first)), block_end, start, day, person))
+        person, day, room, slot = person[order], day[order], room[order], slot[order]
+        clashing, others = _sorted_overlaps(start[order], block_end[order], _group_ids(person, day))
+
+        records = []
+        for i, other in zip(np.flatnonzero(clashing), others):
+            records.append({
+                'person': self.people[person[i]], 'day': self.days[day[i]], 'room': self.rooms[room[i]],
+                'slot': self.slot_keys[slot[i]][2], 'other_room': self.rooms[room[other]],
+                'other_slot': self.slot_keys[slot[other]][2],
+            })
+        return records
+
+
+def _clash_records(clashing, others, name_column):
+    return [
+        {
+            name_column.lower(): row[name_column], 'day': row['Date'], 'room': row['Room'], 'slot': row['Slot'],
+            'other_room': other['Room'], 'other_slot': other['Slot'],
+        }
+        for row, other in zip(clashing.to_dict('records'), others.to_dict('records'))
+    ]
+
+
+def verify_schedule(students_data, schedule_data, fixed_subjects=FIXED_SUBJECTS, check_people=True, people=None):
+    """
+    Checks a solved schedule against the scheduling rules.
+
+    Args:
+        students_data (dict): A dictionary mapping subjects to lists of student groups.
+        schedule_data (dict): The solved exam schedule.
+        fixed_subjects (dict): Subject -> the day it must be examined on. Days that are
+            not in `schedule_data` are ignored.
+        check_people (bool): Also look for examiners and supervisors booked into two rooms at once.
+        people (PeopleIntervals, optional): The intervals of the plan `schedule_data` was solved
+            from, to reuse across verifications. Built from `schedule_data` when not given.
+
+    Returns:
+        dict: "ok", "total_exams", "scheduled_exams" and "violations", which maps each of
+        VIOLATION_KINDS to a list of records describing the violations found.
+    """
+    df = exams_frame(schedule_data)
+    violations = {kind: [] for kind in VIOLATION_KINDS}
+
+    required = pd.DataFrame(
+        [(student, subject) for subject, groups in students_data.items() for group in groups for student in group],
+        columns=['Student', 'Fach'], dtype=object,
+    )
+    known = df['Fach'].isin(students_data.keys())
+    violations['unknown_exams'] = [
+        {'student': row['Student'], 'subject': row['Fach'], 'day': row['Date'], 'room': row['Room'], 'slot': row['Slot']}
+        for row in df[~known].to_dict('records')
+    ]
+    exams = df[known]
+
+    # Every required exam exactly once
+    counts = pd.merge(
+        required.value_counts().rename('required').reset_index(),
+        exams[['Student', 'Fach']].value_counts().rename('scheduled').reset_index(),
+        on=['Student', 'Fach'], how='outer',
+    ).fillna(0)
+    for row in counts[counts['scheduled'] < counts['required']].to_dict('records'):
+        violations['unplaced_exams'].append(
+            {'student': row['Student'], 'subject': row['Fach'], 'missing': int(row['required'] - row['scheduled'])}
+        )
+    for row in counts[counts['scheduled'] > counts['required']].to_dict('records'):
+        violations['duplicate_exams'].append(
+            {'student': row['Student'], 'subject': row['Fach'], 'extra': int(row['scheduled'] - row['required'])}
+        )
+
+    # Fixed subjects on their day; as in the solver, a fixed day missing from the plan is not enforced
+    fixed_subjects = {subject: day for subject, day in fixed_subjects.items() if day in schedule_data}
+    required_day = exams['Fach'].map(fixed_subjects)
+    wrong_day = exams[required_day.notna() & (exams['Date'] != required_day)]
+    violations['fixed_day_violations'] = [
+        {'subject': row['Fach'], 'day': row['Date'], 'room': row['Room'], 'slot': row['Slot'],
+         'required_day': fixed_subjects[row['Fach']]}
+        for row in wrong_day.to_dict('records')
+    ]
+
+    # Each subject on a single day
+    days_per_subject = exams.groupby('Fach')['Date'].unique()
+    violations['split_subjects'] = [
+        {'subject': subject, 'days': sorted(days)}
+        for subject, days in days_per_subject.items() if len(days) > 1
+    ]
+
+    # No student or person in two places at once
+    violations['student_double_bookings'] = _clash_records(
+        *find_overlaps(_student_intervals(df), ['Student', 'Date']), 'Student'
+    )
+    if check_people:
+        people = people if people is not None else PeopleIntervals(schedule_data)
+        violations['people_double_bookings'] = people.clashes(schedule_data)
+
+    return {
+        'ok': not any(violations.values()),
+        'total_exams': len(required),
+        'scheduled_exams': len(required) - sum(v['missing'] for v in violations['unplaced_exams']),
+        'violations': violations,
+    }
+
+
+def print_report(report):
+    """Prints a short summary of a `verify_schedule` report."""
+    print(f"\nTotal exams to schedule: {report['total_exams']}")
+    print(f"Total exams scheduled: {report['scheduled_exams']}")
+    for kind, records in report['violations'].items():
+        if records:
+            print(f"!!! {kind}: {len(records)}")
+            for record in records[:10]:
+                print(f"    {record}")
+            if len(records) > 10:
+                print(f"    ... and {len(records) - 10} more")
+    if report['ok']:
+        print("All checks passed.")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Check a solved schedule against the scheduling rules.")
+    parser.add_argument('schedule', nargs='?', default='final_schedule.json', help="Solved schedule JSON")
+    parser.add_argument('--students', default='student.json', help="Student JSON (default student.json)")
+    parser.add_argument('--report', help="Also write the full report to this JSON file")
+    args = parser.parse_args()
+
+    with open(args.students, 'r', encoding='utf-8') as f:
+        students = json.load(f)
+    with open(args.schedule, 'r', encoding='utf-8') as f:
+        schedule = json.load(f)
+
+    report = verify_schedule(students, schedule)
+    print_report(report)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)